@@ -1,6 +1,6 @@
 # app.py
 import streamlit as st
-from predictor import classify_text
+from predictor import ENSEMBLE, classify_ensemble, classify_text, input_warning
 
 st.set_page_config(page_title="HoaxCheck", layout="wide")
 
@@ -41,7 +41,7 @@ with st.sidebar:
     st.markdown("""
     - **Preprocessing Teks**
     - **TF-IDF**
-    - **Model Klasifikasi**: XGBoost atau LightGBM
+    - **Model Klasifikasi**: XGBoost, LightGBM, atau Ensemble (rata-rata keduanya)
     """)
     threshold = 0.5
 
@@ -50,14 +50,20 @@ judul = st.text_input("Masukkan Judul Berita", value=st.session_state.get('judul
 isi = st.text_area("Masukkan Isi Berita", value=st.session_state.get('isi', ''), key='isi')
 
 # Model option
-model_option = st.selectbox("Pilih Model Klasifikasi:", ["XGBoost", "LightGBM"])
+model_option = st.selectbox("Pilih Model Klasifikasi:", ["XGBoost", "LightGBM", ENSEMBLE])
 
 # Classify button
 if st.button("Klasifikasikan"):
     if judul.strip() == "" and isi.strip() == "":
         st.warning("Silakan isi minimal judul *atau* isi berita.")
     else:
-        hasil, score, cleaned = classify_text(judul, isi, model_option)
+        warning = input_warning(judul, isi)
+        if warning:
+            st.info(warning)
+        if model_option == ENSEMBLE:
+            hasil, scores, cleaned = classify_ensemble(judul, isi)
+        else:
+            hasil, score, cleaned = classify_text(judul, isi, model_option)
         color = "red" if hasil == "HOAX" else "green"
         st.markdown(f'<h3 style="color:{color};">Hasil Klasifikasi: **{hasil}**</h3>', unsafe_allow_html=True)
        # st.write(f"**{hasil}** dengan skor probabilitas {score:.4f}")
@@ -68,6 +74,9 @@ if st.button("Klasifikasikan"):
             st.subheader("Hasil Preprocessing")
             st.write(f"Teks yang dibersihkan: `{cleaned}`")
             st.subheader("Hasil Klasifikasi")
+            if model_option == ENSEMBLE:
+                for name, value in scores.items():
+                    st.write(f"Probabilitas HOAX {name}: {value:.4f}")
            # st.write(f"**{hasil}** dengan skor probabilitas {score:.4f}")
 
         st.session_state['classified'] = True
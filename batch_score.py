@@ -0,0 +1,217 @@
+# batch_score.py
+# Skoring file artikel (JSONL atau CSV berisi kolom judul/isi) secara
+# streaming: input dibaca per chunk, hasil ditulis bertahap, dan posisi
+# terakhir disimpan di file checkpoint supaya bisa dilanjutkan (--resume)
+# setelah crash.
+# Jalankan: python batch_score.py dump.jsonl hasil.jsonl --workers 4 --resume
+#
+# Setiap record boleh punya "model_option" sendiri (default: --model) dan
+# "id" yang ikut ditulis ke output.
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from io import StringIO
+from collections import deque
+import predictor
+
+OUTPUT_FIELDS = ("row", "id", "hasil", "score", "model_option")
+
+
+def detect_format(path):
+    """Return: "csv" untuk file .csv, selain itu "jsonl"."""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(f, fmt, offset=0):
+    """
+    Baca record dari file biner f mulai dari byte offset.
+    - fmt: "jsonl" atau "csv" (baris pertama CSV adalah header)
+    Return: generator (record dict, offset byte setelah record)
+    """
+    if fmt == "jsonl":
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            if line.strip():
+                yield json.loads(line), offset
+        return
+
+    f.seek(0)
+    header, header_end = next(_csv_rows(f, 0))
+    header[0] = header[0].lstrip("\ufeff")
+    f.seek(max(offset, header_end))
+    for row, end in _csv_rows(f, max(offset, header_end)):
+        if row:
+            yield dict(zip(header, row)), end
+
+
+def _csv_rows(f, offset):
+    # csv.reader hanya mengambil baris yang dibutuhkan untuk satu record
+    # (termasuk field ber-quote yang memuat newline), jadi posisi setelah
+    # setiap record bisa dilacak dari jumlah byte yang sudah dibaca
+    position = [offset]
+
+    def lines():
+        for line in f:
+            position[0] += len(line)
+            yield line.decode("utf-8")
+
+    for row in csv.reader(lines()):
+        yield row, position[0]
+
+
+class ResultWriter:
+    """Penulis output JSONL/CSV yang bisa dilanjutkan dari ukuran file tertentu."""
+
+    def __init__(self, path, fmt, truncate_at=0):
+        exists = os.path.exists(path)
+        self.fmt = fmt
+        self.f = open(path, "r+b" if exists else "wb")
+        # Buang sisa tulisan setelah checkpoint terakhir (mis. saat crash)
+        self.f.truncate(truncate_at)
+        self.f.seek(truncate_at)
+        if fmt == "csv" and truncate_at == 0:
+            self.write([dict(zip(OUTPUT_FIELDS, OUTPUT_FIELDS))])
+
+    def write(self, rows):
+        """rows: list dict dengan key OUTPUT_FIELDS"""
+        if self.fmt == "jsonl":
+            lines = [json.dumps(row, ensure_ascii=False) + "\n" for row in rows]
+        else:
+            buffer = StringIO()
+            csv.writer(buffer).writerows([row.get(field, "") for field in OUTPUT_FIELDS]
+                                         for row in rows)
+            lines = [buffer.getvalue()]
+        self._write_lines(lines)
+
+    def _write_lines(self, lines):
+        self.f.write("".join(lines).encode("utf-8"))
+
+    def flush(self):
+        """Return: ukuran file output setelah semua tulisan sampai ke disk."""
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return self.f.tell()
+
+    def close(self):
+        self.f.close()
+
+
+def load_checkpoint(path, input_path):
+    """Return: dict checkpoint, atau None bila belum ada."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint["input"] != os.path.abspath(input_path):
+        raise ValueError(f"checkpoint {path} milik input lain: {checkpoint['input']}")
+    return checkpoint
+
+def save_checkpoint(path, checkpoint):
+    # Tulis ke file sementara lalu ganti, supaya checkpoint tidak pernah setengah jadi
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def score_file(input_path, output_path, model_option="XGBoost", chunk_size=1024,
+               workers=1, resume=False, checkpoint_path=None, max_rows=None,
+               input_format=None, output_format=None, log=None):
+    """
+    Skor seluruh record di input_path dan tulis hasilnya ke output_path.
+    - resume: lanjutkan dari checkpoint (bila ada) alih-alih mulai dari awal
+    - checkpoint_path: default "<output_path>.checkpoint"
+    - max_rows: berhenti setelah sekian baris (total, termasuk run sebelumnya)
+    - log: fungsi untuk laporan progres (mis. print), None = diam
+    Return: dict checkpoint terakhir (input_offset, rows, output_size)
+    """
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or detect_format(output_path)
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+
+    checkpoint = load_checkpoint(checkpoint_path, input_path) if resume else None
+    if checkpoint is None:
+        checkpoint = {"input": os.path.abspath(input_path), "input_offset": 0,
+                      "rows": 0, "output_size": 0}
+    start_rows = checkpoint["rows"]
+    if max_rows is not None and start_rows >= max_rows:
+        return checkpoint
+
+    writer = ResultWriter(output_path, output_format, truncate_at=checkpoint["output_size"])
+    # Metadata record yang sedang diproses (dibaca lebih dulu oleh pipeline)
+    pending = deque()
+
+    def records(f):
+        for row_number, (record, end) in enumerate(
+                read_records(f, input_format, checkpoint["input_offset"]), start_rows):
+            if max_rows is not None and row_number >= max_rows:
+                return
+            model_option_row = record.get("model_option") or model_option
+            if model_option_row not in predictor.CLASSIFY_OPTIONS:
+                raise ValueError(f"baris {row_number}: model_option tidak dikenal: "
+                                 f"{model_option_row!r}")
+            pending.append((row_number, record.get("id"), model_option_row, end))
+            yield record.get("judul") or "", record.get("isi") or "", model_option_row
+
+    started = time.perf_counter()
+    try:
+        with open(input_path, "rb") as f:
+            for labels, scores in predictor.classify_stream(
+                    records(f), chunk_size=chunk_size, workers=workers):
+                rows = []
+                for label, score in zip(labels.tolist(), scores.tolist()):
+                    row_number, record_id, model_option_row, end = pending.popleft()
+                    row = {"row": row_number, "id": record_id, "hasil": label,
+                           "score": score, "model_option": model_option_row}
+                    if record_id is None:
+                        del row["id"]
+                    rows.append(row)
+                writer.write(rows)
+                checkpoint.update(input_offset=end, rows=row_number + 1,
+                                  output_size=writer.flush())
+                save_checkpoint(checkpoint_path, checkpoint)
+
+                if log:
+                    done = checkpoint["rows"] - start_rows
+                    elapsed = time.perf_counter() - started
+                    log(f"[INFO] {checkpoint['rows']} baris | "
+                        f"{done / elapsed:.1f} baris/detik")
+    finally:
+        writer.close()
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skoring file artikel (JSONL/CSV) secara streaming")
+    parser.add_argument("input", help="file .jsonl atau .csv berisi kolom judul dan isi")
+    parser.add_argument("output", help="file hasil (.jsonl atau .csv)")
+    parser.add_argument("--model", default="XGBoost", choices=predictor.CLASSIFY_OPTIONS,
+                        help="model untuk record tanpa model_option")
+    parser.add_argument("--chunk-size", type=int, default=predictor.BATCH_CHUNK_SIZE,
+                        help="jumlah artikel per chunk (juga interval checkpoint)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="jumlah proses preprocessing (0 = jumlah CPU)")
+    parser.add_argument("--resume", action="store_true",
+                        help="lanjutkan dari checkpoint bila ada")
+    parser.add_argument("--checkpoint", default=None,
+                        help="file checkpoint (default: <output>.checkpoint)")
+    parser.add_argument("--max-rows", type=int, default=None,
+                        help="berhenti setelah sekian baris")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    checkpoint = score_file(args.input, args.output, model_option=args.model,
+                            chunk_size=args.chunk_size, workers=args.workers or None,
+                            resume=args.resume, checkpoint_path=args.checkpoint,
+                            max_rows=args.max_rows,
+                            log=lambda message: print(message, file=sys.stderr))
+    print(f"[INFO] Selesai: {checkpoint['rows']} baris dalam "
+          f"{time.perf_counter() - started:.1f} detik -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# batch_score_test.py
+import csv
+import json
+import subprocess
+import sys
+import pytest
+from batch_score import read_records, score_file
+from predictor import classify_many
+
+ARTICLES = [
+    ("Vaksin mengandung chip", "Beredar pesan berantai bahwa vaksin covid berisi chip pelacak."),
+    ("Pemerintah umumkan libur nasional", "Presiden menetapkan hari libur nasional tambahan."),
+    ("", "Hanya isi berita tanpa judul, dengan tanda baca, \"kutip\" & koma."),
+    ("Judul saja", ""),
+    ("Berita\nmulti baris", "Paragraf satu.\n\nParagraf dua, dengan koma."),
+]
+
+def _records(n):
+    return [{"id": f"a{i}", "judul": judul, "isi": isi,
+             "model_option": "LightGBM" if i % 3 == 0 else "XGBoost"}
+            for i, (judul, isi) in enumerate(ARTICLES * (n // len(ARTICLES)))]
+
+def _write_jsonl(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            # Baris kosong dilewati
+            f.write("\n")
+
+def _write_csv(path, records):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["id", "judul", "isi", "model_option"])
+        writer.writeheader()
+        writer.writerows(records)
+
+def _expected(records):
+    labels, scores = classify_many([(r["judul"], r["isi"], r["model_option"]) for r in records])
+    return list(labels), list(scores)
+
+@pytest.mark.parametrize("writer", [_write_jsonl, _write_csv])
+def test_read_records_offsets(tmp_path, writer):
+    records = _records(10)
+    path = tmp_path / ("input.csv" if writer is _write_csv else "input.jsonl")
+    writer(path, records)
+    fmt = "csv" if writer is _write_csv else "jsonl"
+    with open(path, "rb") as f:
+        read = list(read_records(f, fmt))
+        assert [record["isi"] for record, _ in read] == [r["isi"] for r in records]
+        # Mulai dari offset record ke-4 menghasilkan sisa record
+        resumed = list(read_records(f, fmt, read[3][1]))
+    assert [record["id"] for record, _ in resumed] == [r["id"] for r in records[4:]]
+
+def test_score_jsonl_matches_classify_many(tmp_path):
+    records = _records(20)
+    _write_jsonl(tmp_path / "input.jsonl", records)
+    checkpoint = score_file(str(tmp_path / "input.jsonl"), str(tmp_path / "out.jsonl"),
+                            chunk_size=6)
+    assert checkpoint["rows"] == len(records)
+
+    with open(tmp_path / "out.jsonl", encoding="utf-8") as f:
+        results = [json.loads(line) for line in f]
+    labels, scores = _expected(records)
+    assert [r["id"] for r in results] == [r["id"] for r in records]
+    assert [r["row"] for r in results] == list(range(len(records)))
+    assert [r["hasil"] for r in results] == labels
+    assert [r["score"] for r in results] == scores
+
+def test_score_csv_resume_after_crash(tmp_path):
+    records = _records(25)
+    _write_csv(tmp_path / "input.csv", records)
+    args = (str(tmp_path / "input.csv"), str(tmp_path / "out.csv"))
+
+    # Run pertama berhenti di tengah, lalu "crash" meninggalkan tulisan setengah jadi
+    checkpoint = score_file(*args, chunk_size=4, max_rows=10)
+    assert checkpoint["rows"] == 10
+    with open(tmp_path / "out.csv", "a", encoding="utf-8") as f:
+        f.write("99,sampah,HOAX")
+
+    checkpoint = score_file(*args, chunk_size=4, resume=True)
+    assert checkpoint["rows"] == len(records)
+    with open(tmp_path / "out.csv", encoding="utf-8", newline="") as f:
+        results = list(csv.DictReader(f))
+    labels, scores = _expected(records)
+    assert [r["id"] for r in results] == [r["id"] for r in records]
+    assert [r["hasil"] for r in results] == labels
+    assert [float(r["score"]) for r in results] == scores
+
+def test_cli_reports_progress(tmp_path):
+    _write_jsonl(tmp_path / "input.jsonl", _records(10))
+    result = subprocess.run([sys.executable, "batch_score.py", str(tmp_path / "input.jsonl"),
+                             str(tmp_path / "out.jsonl"), "--chunk-size", "4"],
+                            capture_output=True, text=True, check=True)
+    assert "baris/detik" in result.stderr
+    with open(tmp_path / "out.jsonl", encoding="utf-8") as f:
+        assert len(f.readlines()) == 10
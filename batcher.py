@@ -0,0 +1,112 @@
+# batcher.py
+# Penjadwal micro-batch: request tunggal yang datang bersamaan dikumpulkan
+# sampai max_batch_size item atau max_wait_ms milidetik, diproses sekali
+# jalan, lalu hasilnya dibagikan kembali ke masing-masing pemanggil.
+import asyncio
+import time
+
+
+class MicroBatcher:
+    """
+    - process_batch: coroutine function list[item] -> list[hasil] (urutan sama)
+    - max_batch_size: jumlah item maksimum per batch
+    - max_wait_ms: waktu tunggu maksimum sejak item pertama masuk batch
+    - max_concurrency: jumlah batch yang boleh diproses bersamaan
+      (mis. sama dengan jumlah worker pool)
+    """
+
+    def __init__(self, process_batch, max_batch_size=64, max_wait_ms=5.0,
+                 max_concurrency=1):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size minimal 1")
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_concurrency = max_concurrency
+        self._queue = None
+        self._slots = None
+        self._loop_task = None
+        self._tasks = set()
+        self._in_flight = 0
+        self._batches = 0
+        self._items = 0
+        self._largest = 0
+        self._histogram = {}
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._loop_task = asyncio.create_task(self._collect_loop())
+
+    async def stop(self):
+        if self._loop_task:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, *self._tasks, return_exceptions=True)
+
+    async def submit(self, item):
+        """Masukkan satu item dan tunggu hasilnya."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def submit_many(self, items):
+        """Masukkan beberapa item; return list hasil sesuai urutan items."""
+        return await asyncio.gather(*[self.submit(item) for item in items])
+
+    def metrics(self):
+        """Return: dict metrik antrean & ukuran batch."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "in_flight_batches": self._in_flight,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "max_batch_size_seen": self._largest,
+            # Jumlah batch per bucket ukuran (batas atas pangkat dua)
+            "batch_size_histogram": dict(sorted(self._histogram.items())),
+        }
+
+    async def _collect_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            self._record(len(batch))
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _record(self, size):
+        self._batches += 1
+        self._items += size
+        self._largest = max(self._largest, size)
+        bucket = 1 << (size - 1).bit_length()
+        self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+
+    async def _run(self, batch):
+        self._in_flight += 1
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
@@ -0,0 +1,21 @@
+# benchmarks/metrics_overhead.py
+# Overhead utils.metrics saat nonaktif (hook None): pasangan start()/stop()
+# dibandingkan dengan satu clean_text. Sekitar 4 pasangan per artikel, target
+# < 1% dari clean_text.
+# Jalankan dari root repo: python -m benchmarks.metrics_overhead
+import timeit
+from utils import metrics
+from utils.preprocessing import clean_text
+
+def main(repeat=5):
+    metrics.disable()
+    text = "Judul berita dan isi berita yang cukup panjang untuk diproses " * 5
+    clean_text(text)
+    baseline = min(timeit.repeat(lambda: clean_text(text), number=200, repeat=repeat)) / 200
+    calls = min(timeit.repeat(lambda: metrics.stop("x", metrics.start()), number=10000,
+                              repeat=repeat)) / 10000
+    print(f"clean_text {baseline * 1e6:.1f} us | start/stop nonaktif {calls * 1e9:.0f} ns | "
+          f"4 pasangan = {calls * 4 / baseline:.2%} dari clean_text")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# benchmarks/pipeline.py
+# Benchmark per tahap pipeline klasifikasi: clean_text -> TF-IDF ->
+# DMatrix -> predict XGBoost/LightGBM (booster, inplace_predict XGBoost
+# langsung dari CSR, dan tabel pohon NumPy),
+# untuk input judul saja, judul+isi, dan artikel sangat panjang pada
+# beberapa ukuran batch. Hasil ditulis sebagai JSON supaya bisa
+# dibandingkan antar commit.
+#
+# Jalankan dari root repo:
+#   python -m benchmarks.pipeline --output bench/HEAD.json          (lengkap, beberapa menit)
+#   python -m benchmarks.pipeline --quick --output bench/HEAD.json  (batch 1-100)
+#   python -m benchmarks.pipeline --compare bench/base.json bench/HEAD.json
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import warnings
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+QUICK_BATCH_SIZES = (1, 10, 100)
+# Pengukuran yang sekali jalan sudah selama ini tidak diulang
+SLOW_SECONDS = 2.0
+# Kombinasi dengan total karakter di atas batas ini dilewati (mis. artikel
+# panjang x 10k: clean_text-nya saja memakan puluhan menit); 0 = tanpa batas
+MAX_BATCH_CHARS = 20_000_000
+
+
+def make_inputs():
+    """Return: dict nama input -> list teks contoh."""
+    from test_data import test_data as articles
+    bodies = [f"{judul} {isi}" for judul, isi, _ in articles]
+    return {
+        "judul": [judul for judul, _, _ in articles],
+        "judul+isi": bodies,
+        "artikel panjang": [" ".join(bodies) * 2],
+    }
+
+
+def stages():
+    """
+    Return: (prepare, dict nama tahap -> fungsi(data)). prepare(texts)
+    menyiapkan input tiap tahap (teks bersih, matriks TF-IDF, DMatrix)
+    sekali per batch, jadi setiap tahap diukur terpisah.
+    """
+    import xgboost as xgb
+    import predictor
+    from utils.preprocessing import clean_text
+
+    vectorizer = predictor.get_tfidf_vectorizer()
+    fast_tfidf = predictor.get_fast_tfidf()
+    pruned_tfidf = predictor.pruned_tfidf
+    xgb_model = predictor.get_xgb_model()
+    lgbm_model = predictor.get_lgbm_model()
+    xgb_trees = predictor.get_trees("XGBoost")
+    lgbm_trees = predictor.get_trees("LightGBM")
+
+    def prepare(texts):
+        cleaned = [clean_text(text) for text in texts]
+        vec = pruned_tfidf.transform(cleaned)
+        return {"texts": texts, "cleaned": cleaned, "vec": vec, "dmatrix": xgb.DMatrix(vec)}
+
+    return prepare, {
+        "clean_text": lambda data: [clean_text(text) for text in data["texts"]],
+        "tfidf sklearn": lambda data: vectorizer.transform(data["cleaned"]),
+        "tfidf FastTfidf": lambda data: fast_tfidf.transform(data["cleaned"]),
+        "tfidf FastTfidf (pruned)": lambda data: pruned_tfidf.transform(data["cleaned"]),
+        "DMatrix": lambda data: xgb.DMatrix(data["vec"]),
+        "predict XGBoost": lambda data: xgb_model.predict(data["dmatrix"],
+                                                          validate_features=False),
+        # DMatrix baru per pemanggilan (seperti jalur lama classify_text);
+        # "predict XGBoost" saja bisa terbantu cache prediksi DMatrix xgboost
+        "DMatrix + predict XGBoost": lambda data: xgb_model.predict(
+            xgb.DMatrix(data["vec"]), validate_features=False),
+        "predict XGBoost (inplace)": lambda data: xgb_model.inplace_predict(
+            data["vec"], validate_features=False),
+        "predict LightGBM": lambda data: lgbm_model.predict(
+            data["vec"], num_iteration=lgbm_model.best_iteration),
+        "predict XGBoost (trees)": lambda data: xgb_trees.predict(data["vec"]),
+        "predict LightGBM (trees)": lambda data: lgbm_trees.predict(data["vec"]),
+    }
+
+
+def measure(run, repeat):
+    """Return: list durasi (detik) per pemanggilan run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        if timings[-1] > SLOW_SECONDS:
+            break
+    return timings
+
+
+def environment():
+    """Informasi commit & versi library untuk disimpan bersama hasil."""
+    import numpy
+    import scipy
+    import sklearn
+    import xgboost
+    import lightgbm
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "scipy": scipy.__version__,
+        "sklearn": sklearn.__version__,
+        "xgboost": xgboost.__version__,
+        "lightgbm": lightgbm.__version__,
+    }
+
+
+def run(batch_sizes=BATCH_SIZES, repeat=5, only=None, max_batch_chars=MAX_BATCH_CHARS,
+        log=print):
+    """
+    Jalankan semua kombinasi input x ukuran batch x tahap.
+    - only: list nama tahap yang diukur (None = semua)
+    - max_batch_chars: lewati batch yang total karakternya lebih dari ini
+    Return: dict {"environment": ..., "results": [...]}
+    """
+    results = []
+    prepare, stage_functions = stages()
+    for input_name, samples in make_inputs().items():
+        for batch_size in batch_sizes:
+            texts = [samples[i % len(samples)] for i in range(batch_size)]
+            if max_batch_chars and sum(map(len, texts)) > max_batch_chars:
+                if log:
+                    log(f"{'(dilewati)':>26} | {input_name:>15} | batch {batch_size:>5} | "
+                        f"lebih dari {max_batch_chars:,} karakter")
+                continue
+            data = prepare(texts)
+            for stage, function in stage_functions.items():
+                if only and stage not in only:
+                    continue
+                timings = measure(lambda: function(data), repeat)
+                result = {
+                    "stage": stage,
+                    "input": input_name,
+                    "batch_size": batch_size,
+                    "repeat": len(timings),
+                    "min_s": min(timings),
+                    "median_s": statistics.median(timings),
+                    "per_item_us": min(timings) / batch_size * 1e6,
+                }
+                results.append(result)
+                if log:
+                    log(f"{stage:>26} | {input_name:>15} | batch {batch_size:>5} | "
+                        f"{result['min_s'] * 1e3:10.3f} ms | {result['per_item_us']:10.1f} us/item")
+    return {"environment": environment(), "results": results}
+
+
+def compare(base, head, threshold=1.10, log=print):
+    """
+    Bandingkan dua file hasil (min_s per kombinasi yang sama).
+    Return: list kombinasi yang lebih lambat dari threshold x base
+    """
+    key = lambda r: (r["stage"], r["input"], r["batch_size"])
+    base_results = {key(r): r for r in base["results"]}
+    regressions = []
+    log(f"base {base['environment'].get('commit')} -> head {head['environment'].get('commit')}")
+    for result in head["results"]:
+        old = base_results.get(key(result))
+        if old is None:
+            continue
+        ratio = result["min_s"] / old["min_s"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  <-- lebih lambat"
+            regressions.append((key(result), ratio))
+        log(f"{result['stage']:>26} | {result['input']:>15} | batch {result['batch_size']:>5} | "
+            f"{old['min_s'] * 1e3:10.3f} -> {result['min_s'] * 1e3:10.3f} ms | {ratio:5.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per tahap pipeline klasifikasi")
+    parser.add_argument("--output", help="tulis hasil JSON ke file ini")
+    parser.add_argument("--quick", action="store_true", help=f"hanya batch {QUICK_BATCH_SIZES}")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stage", action="append", help="hanya tahap ini (boleh berulang)")
+    parser.add_argument("--max-batch-chars", type=int, default=MAX_BATCH_CHARS,
+                        help="lewati batch dengan total karakter lebih dari ini (0 = tanpa batas)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"),
+                        help="bandingkan dua file hasil, exit 1 bila ada regresi")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="rasio waktu head/base yang dianggap regresi")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            head = json.load(f)
+        sys.exit(1 if compare(base, head, args.threshold) else 0)
+
+    warnings.filterwarnings("ignore")
+    batch_sizes = args.batch_sizes or (QUICK_BATCH_SIZES if args.quick else BATCH_SIZES)
+    report = run(batch_sizes, repeat=args.repeat, only=args.stage,
+                 max_batch_chars=args.max_batch_chars)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/startup.py
+# Mengukur waktu cold start predictor.py di proses Python baru:
+# - "import": hanya `import predictor`
+# - "import + klasifikasi pertama": import lalu satu classify_text per model
+# Jalankan dari root repo: python -m benchmarks.startup [--repo PATH] [--runs N]
+#
+# Hasil (median 3 run, detik; "sebelum" = predictor yang memuat semua model
+# dan mengimport xgboost/sklearn/Sastrawi saat import):
+#
+#                                  sebelum   sesudah   sesudah + HOAXCHECK_BACKEND=trees
+#   import                           1.97      0.12      0.13
+#   import + klasifikasi XGBoost     1.86      1.86      0.37
+#   import + klasifikasi LightGBM    2.09      1.66      0.42
+#
+# Sisa waktu pada backend "booster" adalah import xgboost/lightgbm (keduanya
+# ikut mengimport sklearn). Backend "trees" dengan models/tfidf_fast.npz dan
+# tabel pohon hasil ekspor offline tidak membutuhkan keduanya:
+#   python -m utils.fast_tfidf models/tfidf_vectorizer.pkl models/tfidf_fast.npz
+#   python -m utils.tree_engine
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "import": "import predictor",
+    "import + klasifikasi XGBoost": (
+        "import predictor; predictor.classify_text('Judul', 'Isi berita', 'XGBoost')"),
+    "import + klasifikasi LightGBM": (
+        "import predictor; predictor.classify_text('Judul', 'Isi berita', 'LightGBM')"),
+}
+
+_TIMER = (
+    "import time, warnings; warnings.filterwarnings('ignore'); "
+    "start = time.perf_counter(); {code}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure(code, repo, runs):
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", _TIMER.format(code=code)],
+                                cwd=repo, capture_output=True, text=True, check=True)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waktu startup predictor")
+    parser.add_argument("--repo", default=os.getcwd(),
+                        help="direktori checkout yang diukur (default: direktori saat ini)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        timings = measure(code, args.repo, args.runs)
+        results[name] = {"median_s": statistics.median(timings), "min_s": min(timings)}
+        if not args.json:
+            print(f"{name:>32}: median {results[name]['median_s']:.3f} s | "
+                  f"min {results[name]['min_s']:.3f} s")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/threads.py
+# Throughput inferensi booster untuk beberapa susunan proses worker x
+# thread per worker (seperti service.py --workers W --threads T), dengan dan
+# tanpa CPU affinity. Susunan "Wx0" = thread default library (setiap worker
+# memakai semua CPU), yaitu perilaku sebelum ada pengaturan thread.
+#
+# Jalankan dari root repo:
+#   python -m benchmarks.threads                         (susunan dari jumlah CPU)
+#   python -m benchmarks.threads --layouts 4x1 2x2 1x4 4x0 --pin-cpus
+#   python -m benchmarks.threads --model LightGBM --output bench/threads.json
+import os
+import json
+import time
+import argparse
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+_batch = None
+
+
+def default_layouts(cpu_count=None):
+    """Return: list (workers, threads) dengan workers x threads = jumlah CPU, plus Wx0."""
+    cpu_count = cpu_count or len(_available_cpus())
+    layouts = [(workers, cpu_count // workers) for workers in range(1, cpu_count + 1)
+               if cpu_count % workers == 0]
+    return layouts + [(cpu_count, 0)]
+
+
+def _available_cpus():
+    from utils.threads import available_cpus
+    return available_cpus()
+
+
+def _init_worker(inference_threads, pin_cpus, worker_counter, batch_size, workers):
+    global _batch
+    warnings.filterwarnings("ignore")
+    import service
+    import predictor
+    from test_data import test_data as articles
+    from utils.preprocessing import clean_text
+    service._init_worker(inference_threads, pin_cpus, worker_counter, workers=workers)
+    texts = [f"{judul} {isi}" for judul, isi, _ in articles]
+    cleaned = [clean_text(texts[i % len(texts)]) for i in range(batch_size)]
+    _batch = predictor.get_pruned_tfidf(predictor.MODEL_OPTIONS).transform(cleaned)
+
+
+def _predict_rounds(model_option, rounds):
+    import predictor
+    for _ in range(rounds):
+        predictor._predict_scores(_batch, model_option)
+    return rounds * _batch.shape[0]
+
+
+def measure(workers, inference_threads, model_option="XGBoost", batch_size=64,
+            tasks_per_worker=20, rounds=5, pin_cpus=False):
+    """
+    Return: baris per detik untuk satu susunan (workers proses x
+            inference_threads thread), diukur setelah pemanasan
+    """
+    with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(inference_threads, pin_cpus, multiprocessing.Value("i", 0),
+                      batch_size, workers)) as executor:
+        # Pemanasan: semua worker hidup & model termuat
+        list(executor.map(_predict_rounds, [model_option] * workers * 2, [1] * workers * 2))
+        started = time.perf_counter()
+        rows = sum(executor.map(_predict_rounds, [model_option] * workers * tasks_per_worker,
+                                [rounds] * workers * tasks_per_worker))
+        return rows / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput inferensi per susunan workers x threads")
+    parser.add_argument("--layouts", nargs="+", default=None,
+                        help="susunan WxT, mis. 4x1 2x2 (default: dari jumlah CPU)")
+    parser.add_argument("--model", default="XGBoost", choices=("XGBoost", "LightGBM"))
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--tasks-per-worker", type=int, default=20)
+    parser.add_argument("--pin-cpus", action="store_true", help="ukur juga dengan CPU affinity")
+    parser.add_argument("--output", help="tulis hasil JSON ke file ini")
+    args = parser.parse_args()
+
+    layouts = ([tuple(map(int, layout.split("x"))) for layout in args.layouts]
+               if args.layouts else default_layouts())
+    results = []
+    print(f"[INFO] {len(_available_cpus())} CPU, model {args.model}, batch {args.batch_size}")
+    for workers, inference_threads in layouts:
+        for pin_cpus in ((False, True) if args.pin_cpus else (False,)):
+            rows_per_second = measure(workers, inference_threads, args.model, args.batch_size,
+                                      args.tasks_per_worker, pin_cpus=pin_cpus)
+            results.append({"workers": workers, "threads": inference_threads,
+                            "pin_cpus": pin_cpus, "rows_per_second": rows_per_second})
+            print(f"{workers:>3} worker x {inference_threads or 'default':>7} thread"
+                  f"{' (pin)' if pin_cpus else '      '} | {rows_per_second:12.0f} baris/detik")
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"cpu_count": len(_available_cpus()), "model": args.model,
+                       "batch_size": args.batch_size, "results": results}, f, indent=2)
+        print(f"[INFO] Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# metrics_test.py
+import pytest
+from utils import metrics
+from utils.preprocessing import clean_text
+from predictor import classify_text
+
+@pytest.fixture
+def registry():
+    registry = metrics.enable(metrics.Registry())
+    yield registry
+    metrics.disable()
+
+def test_histogram_buckets_and_prometheus_text():
+    registry = metrics.Registry()
+    for value in (0.00005, 0.0001, 0.003, 20.0):
+        registry.observe(metrics.STAGE_SECONDS, value, {"stage": "stemming"})
+    registry.observe(metrics.TOKENS, 42)
+    text = registry.render()
+    print(f"\n{text}")
+    assert "# TYPE hoaxcheck_stage_seconds histogram" in text
+    # Batas atas bucket inklusif, nilai kumulatif
+    assert 'hoaxcheck_stage_seconds_bucket{stage="stemming",le="0.0001"} 2' in text
+    assert 'hoaxcheck_stage_seconds_bucket{stage="stemming",le="0.005"} 3' in text
+    assert 'hoaxcheck_stage_seconds_bucket{stage="stemming",le="10.0"} 3' in text
+    assert 'hoaxcheck_stage_seconds_bucket{stage="stemming",le="+Inf"} 4' in text
+    assert 'hoaxcheck_stage_seconds_count{stage="stemming"} 4' in text
+    assert 'hoaxcheck_tokens_bucket{le="50.0"} 1' in text
+    assert "hoaxcheck_tokens_sum 42" in text
+
+def test_drain_and_merge():
+    worker, main = metrics.Registry(), metrics.Registry()
+    worker.observe(metrics.INPUT_CHARS, 100)
+    main.merge(worker.drain())
+    worker.observe(metrics.INPUT_CHARS, 5000)
+    main.merge(worker.drain())
+    assert worker.snapshot() == {}
+    (buckets, counts, total), = main.snapshot().values()
+    assert sum(counts) == 2 and total == 5100
+
+def test_classify_text_records_stages(registry):
+    classify_text("Judul berita unik metrik", "Isi berita dengan beberapa kata", "XGBoost")
+    stages = {dict(labels).get("stage"): sum(counts)
+              for (name, labels), (_, counts, _) in registry.snapshot().items()
+              if name == metrics.STAGE_SECONDS}
+    # Tahap "dmatrix" hanya ada di jalur DMatrix (tanpa inplace_predict)
+    for stage in ("normalize", "stopword", "stemming", "tfidf", "predict", "classify"):
+        assert stages.get(stage) == 1, stage
+    assert any(name == metrics.TOKENS for name, _ in registry.snapshot())
+
+def test_disabled_metrics_never_record(monkeypatch):
+    # Nonaktif: start() tidak membaca jam dan tidak ada observe yang terpanggil
+    # (overhead waktu diukur di benchmarks/metrics_overhead.py)
+    assert metrics.hook is None
+    calls = []
+    monkeypatch.setattr(metrics.Registry, "observe", lambda *args: calls.append(args))
+    monkeypatch.setattr(metrics.Histogram, "observe", lambda *args: calls.append(args))
+    monkeypatch.setattr(metrics, "perf_counter", lambda: calls.append("perf_counter"))
+    assert metrics.start() is None and metrics.stop("x", None) is None
+    metrics.observe(metrics.TOKENS, 1)
+    clean_text("Judul berita dan isi berita yang cukup panjang untuk diproses")
+    classify_text("Judul berita", "isi berita", "XGBoost")
+    assert calls == []
\ No newline at end of file
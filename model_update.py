@@ -0,0 +1,323 @@
+# model_update.py
+# Perbarui model dengan artikel berlabel baru tanpa retrain penuh: artikel
+# di-stream (JSONL/CSV berisi judul, isi, label), divektorisasi dengan
+# TF-IDF versi dasar, lalu boosting XGBoost & LightGBM dilanjutkan dari
+# booster yang ada. Hasilnya diterbitkan sebagai versi baru di
+# models/versions/<versi>/, dicatat di registry (utils.model_registry), dan
+# CURRENT diganti secara atomik; predictor yang sedang berjalan memasangnya
+# tanpa restart (lihat predictor.refresh_models).
+# Jalankan: python model_update.py artikel_baru.jsonl --rounds 20
+#
+# Kolom TF-IDF (vocabulary & idf) sengaja tetap: pohon yang sudah ada memakai
+# index kolom, dan init_model LightGBM menuntut jumlah fitur yang sama. Term
+# baru dicatat document frequency-nya di vocab_stats.json (terbawa ke versi
+# berikutnya) sebagai kandidat vocabulary untuk retrain penuh berikutnya.
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import numpy as np
+import scipy.sparse as sp
+from collections import Counter
+import predictor
+from batch_score import detect_format, read_records
+from utils.model_registry import file_sha256
+from utils.preprocessing import clean_texts
+
+VOCAB_STATS_FILE = "vocab_stats.json"
+# Jumlah term baru maksimum di vocab_stats.json (yang paling sering)
+MAX_NEW_TERMS = 50000
+
+HOAX_LABELS = {"1", "hoax", "hoaks", "true"}
+VALID_LABELS = {"0", "valid", "false"}
+
+
+def parse_label(value):
+    """
+    Label record: 1/0, "HOAX"/"VALID" (huruf besar/kecil), atau true/false.
+    Return: 1 (HOAX) atau 0 (VALID)
+    """
+    label = str(value).strip().lower()
+    if label in HOAX_LABELS:
+        return 1
+    if label in VALID_LABELS:
+        return 0
+    raise ValueError(f"label tidak dikenal: {value!r}")
+
+
+def read_labeled(path, input_format=None):
+    """Return: generator (judul, isi, label) dari file JSONL/CSV."""
+    input_format = input_format or detect_format(path)
+    with open(path, "rb") as f:
+        for row_number, (record, _) in enumerate(read_records(f, input_format)):
+            try:
+                label = parse_label(record.get("label"))
+            except ValueError as e:
+                raise ValueError(f"baris {row_number}: {e}") from None
+            yield record.get("judul") or "", record.get("isi") or "", label
+
+
+def vectorize_labeled(records, fast_tfidf, chunk_size=predictor.BATCH_CHUNK_SIZE, workers=1,
+                      term_counts=None):
+    """
+    Bersihkan & vektorisasi record berlabel per chunk.
+    - records: iterable (judul, isi, label)
+    - fast_tfidf: FastTfidf versi dasar (seluruh vocabulary)
+    - term_counts: Counter yang ditambah document frequency term di luar vocabulary
+    Baris artikel panjang sama dengan vektor saat klasifikasi (lihat score_tokens).
+    Return: matriks CSR (satu baris per record), np.ndarray label
+    """
+    labels = []
+
+    def texts():
+        for judul, isi, label in records:
+            labels.append(label)
+            yield predictor.combine_input(judul, isi)
+
+    vocabulary = set(fast_tfidf.term_list())
+    chunks = []
+    chunk = []
+    # Jalur yang sama dengan klasifikasi (artikel panjang dibatasi MAX_TOKENS),
+    # supaya model tidak dilatih dengan vektor yang tidak pernah muncul saat skor
+    for tokens in clean_texts(texts(), workers=workers, score=True):
+        chunk.append(tokens)
+        if term_counts is not None:
+            term_counts.update({token for token in tokens if token} - vocabulary)
+        if len(chunk) >= chunk_size:
+            chunks.append(fast_tfidf.transform(chunk))
+            chunk = []
+    if chunk or not chunks:
+        chunks.append(fast_tfidf.transform(chunk))
+    return sp.vstack(chunks).tocsr(), np.asarray(labels, dtype=np.float64)
+
+
+def _xgb_params(booster, learning_rate=None):
+    # Parameter pohon yang tersimpan di booster versi dasar
+    config = json.loads(booster.save_config())["learner"]
+    tree_param = config["gradient_booster"].get("tree_train_param", {})
+    params = {"objective": config["objective"]["name"]}
+    for name in ("eta", "max_depth", "min_child_weight", "subsample",
+                 "colsample_bytree", "lambda", "alpha", "gamma"):
+        if name in tree_param:
+            params[name] = float(tree_param[name])
+    if "max_depth" in params:
+        params["max_depth"] = int(params["max_depth"])
+    if learning_rate:
+        params["eta"] = learning_rate
+    if predictor.INFERENCE_THREADS:
+        params["nthread"] = predictor.INFERENCE_THREADS
+    return params
+
+
+def update_xgb(booster, vectorized, labels, rounds, learning_rate=None):
+    """Return: Booster baru = booster + rounds pohon yang dilatih pada data baru."""
+    import xgboost as xgb
+    dtrain = xgb.DMatrix(vectorized, label=labels, feature_names=booster.feature_names)
+    return xgb.train(_xgb_params(booster, learning_rate), dtrain, num_boost_round=rounds,
+                     xgb_model=booster)
+
+
+def update_lgbm(booster, vectorized, labels, rounds, learning_rate=None, params=None):
+    """
+    - params: parameter tambahan (mis. min_data_in_leaf untuk data sedikit)
+    Return: Booster baru = booster (sampai best_iteration) + rounds pohon baru
+    """
+    import lightgbm as lgb
+    params = dict({name: value for name, value in booster.params.items()
+                   if name not in ("num_iterations", "num_threads")}, **(params or {}))
+    params["verbose"] = -1
+    if learning_rate:
+        params["learning_rate"] = learning_rate
+    if predictor.INFERENCE_THREADS:
+        params["num_threads"] = predictor.INFERENCE_THREADS
+    if booster.best_iteration:
+        # Predictor hanya memakai pohon sampai best_iteration
+        booster = lgb.Booster(model_str=booster.model_to_string(
+            num_iteration=booster.best_iteration))
+    dataset = lgb.Dataset(vectorized, label=labels, params={"verbose": -1})
+    return lgb.train(params, dataset, num_boost_round=rounds, init_model=booster)
+
+
+def _lgbm_scores(booster, vectorized):
+    return booster.predict(vectorized, num_iteration=booster.best_iteration)
+
+
+def evaluate(scores, labels):
+    """Return: dict accuracy & logloss skor terhadap label."""
+    scores = np.clip(np.asarray(scores, dtype=np.float64), 1e-15, 1 - 1e-15)
+    logloss = -np.mean(labels * np.log(scores) + (1 - labels) * np.log(1 - scores))
+    accuracy = np.mean((scores > predictor.threshold) == (labels == 1))
+    return {"accuracy": float(accuracy), "logloss": float(logloss)}
+
+
+def load_vocab_stats(directory):
+    """Return: dict vocab_stats.json versi dasar (kosong bila belum ada)."""
+    path = os.path.join(directory, VOCAB_STATS_FILE)
+    if not os.path.exists(path):
+        return {"documents": 0, "document_frequency": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def new_version_name():
+    """Return: nama versi baru dari waktu UTC (unik per detik)."""
+    return time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+
+
+def publish_version(version, xgb_model, lgbm_model, base, extra_files, activate=True,
+                    bundle=False, info=None):
+    """
+    Tulis artefak ke <MODEL_DIR>/versions/<version>/, catat di manifest
+    registry, lalu (bila activate) arahkan CURRENT ke versi itu. Direktori
+    ditulis dengan nama sementara lalu di-rename, dan CURRENT diganti lewat
+    os.replace, jadi predictor tidak pernah melihat versi setengah jadi.
+    - base: ModelSet versi dasar (sumber vectorizer yang disalin)
+    - extra_files: dict nama file -> objek JSON yang ikut ditulis
+    - bundle: buat juga bundle (utils.bundle) untuk versi baru
+    - info: keterangan update yang disimpan di manifest
+    Return: direktori versi
+    """
+    import joblib
+    registry = predictor.get_registry()
+    directory = registry.version_dir(version)
+    if os.path.exists(directory):
+        raise FileExistsError(f"versi {version} sudah ada: {directory}")
+    tmp_directory = os.path.join(os.path.dirname(directory), f".{version}.tmp")
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    target = predictor.ModelSet.from_directory(tmp_directory, version)
+    xgb_model.save_model(target.xgb_model_path)
+    joblib.dump(lgbm_model, target.lgbm_model_path)
+    # Vocabulary tidak berubah: vectorizer versi dasar disalin apa adanya
+    for source in (base.tfidf_vectorizer_path, base.fast_tfidf_path):
+        if os.path.exists(source):
+            shutil.copy2(source, os.path.join(tmp_directory, os.path.basename(source)))
+    if bundle:
+        from utils.bundle import export_models
+        export_models(target.bundle_path, target.tfidf_vectorizer_path,
+                      target.xgb_model_path, target.lgbm_model_path)
+    for name, content in extra_files.items():
+        with open(os.path.join(tmp_directory, name), "w", encoding="utf-8") as f:
+            json.dump(content, f, ensure_ascii=False, indent=1)
+    os.rename(tmp_directory, directory)
+
+    # Model dilatih di atas kolom vectorizer versi dasar
+    vectorizer_sha256 = (base.checksums.get(base.tfidf_vectorizer_path)
+                         or file_sha256(base.tfidf_vectorizer_path))
+    registry.register(version, vectorizer_sha256=vectorizer_sha256,
+                      base_version=base.version, update=info)
+    if activate:
+        registry.activate(version)
+    return directory
+
+
+def update_models(input_path, rounds=20, learning_rate=None, base_version=None,
+                  version=None, holdout=0.1, chunk_size=predictor.BATCH_CHUNK_SIZE,
+                  workers=1, activate=True, bundle=None, lgbm_params=None, log=None):
+    """
+    Lanjutkan boosting kedua model dengan artikel berlabel di input_path dan
+    terbitkan hasilnya sebagai versi baru.
+    - rounds: jumlah pohon baru per model
+    - learning_rate: None = parameter booster versi dasar
+    - base_version: versi dasar (None = versi di CURRENT, atau models/ bila tidak ada)
+    - holdout: fraksi artikel (tiap baris ke-1/holdout) yang tidak dilatih,
+      hanya dipakai untuk membandingkan skor versi dasar & versi baru
+    - bundle: buat bundle untuk versi baru (None = bila versi dasar punya bundle)
+    - lgbm_params: parameter LightGBM tambahan (lihat update_lgbm)
+    - log: fungsi untuk laporan progres (mis. print), None = diam
+    Return: dict keterangan update (juga disimpan di manifest registry)
+    """
+    log = log or (lambda message: None)
+    base_version = base_version or predictor.read_current()
+    base = predictor.load_version(base_version)
+    version = version or new_version_name()
+
+    started = time.perf_counter()
+    term_counts = Counter()
+    vectorized, labels = vectorize_labeled(read_labeled(input_path), base.fast_tfidf(),
+                                           chunk_size=chunk_size, workers=workers,
+                                           term_counts=term_counts)
+    if not len(labels):
+        raise ValueError(f"tidak ada artikel berlabel di {input_path}")
+    log(f"[INFO] {len(labels)} artikel divektorisasi dalam "
+        f"{time.perf_counter() - started:.1f} detik")
+
+    is_holdout = np.zeros(len(labels), dtype=bool)
+    if holdout:
+        is_holdout[::max(2, round(1 / holdout))] = True
+    train = np.flatnonzero(~is_holdout)
+    test = np.flatnonzero(is_holdout)
+
+    started = time.perf_counter()
+    xgb_model = update_xgb(base.xgb_model(), vectorized[train], labels[train], rounds,
+                           learning_rate)
+    lgbm_model = update_lgbm(base.lgbm_model(), vectorized[train], labels[train], rounds,
+                             learning_rate, lgbm_params)
+    log(f"[INFO] {rounds} pohon ditambahkan ke tiap model dalam "
+        f"{time.perf_counter() - started:.1f} detik")
+
+    metrics = {}
+    if len(test):
+        import xgboost as xgb
+        test_vectorized, test_labels = vectorized[test], labels[test]
+        dtest = xgb.DMatrix(test_vectorized, feature_names=xgb_model.feature_names)
+        metrics = {
+            "XGBoost": {"base": evaluate(base.xgb_model().predict(dtest), test_labels),
+                        "updated": evaluate(xgb_model.predict(dtest), test_labels)},
+            "LightGBM": {"base": evaluate(_lgbm_scores(base.lgbm_model(), test_vectorized),
+                                          test_labels),
+                         "updated": evaluate(_lgbm_scores(lgbm_model, test_vectorized),
+                                             test_labels)},
+        }
+
+    # Document frequency term baru, dijumlahkan dengan catatan versi dasar
+    stats = load_vocab_stats(os.path.dirname(base.xgb_model_path))
+    term_counts.update(stats["document_frequency"])
+    vocab_stats = {"documents": stats["documents"] + len(labels),
+                   "document_frequency": dict(term_counts.most_common(MAX_NEW_TERMS))}
+
+    info = {"version": version, "base_version": base_version, "input": os.path.abspath(input_path),
+            "rows": int(len(labels)), "train_rows": int(len(train)), "holdout_rows": int(len(test)),
+            "rounds": rounds, "learning_rate": learning_rate, "metrics": metrics,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+    if bundle is None:
+        bundle = os.path.exists(base.bundle_path)
+    directory = publish_version(version, xgb_model, lgbm_model, base,
+                                {VOCAB_STATS_FILE: vocab_stats}, activate=activate,
+                                bundle=bundle, info=info)
+    log(f"[INFO] Versi {version} diterbitkan di {directory}"
+        f"{' dan diaktifkan' if activate else ''}")
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lanjutkan boosting model dengan artikel berlabel baru")
+    parser.add_argument("input", help="file .jsonl atau .csv berisi kolom judul, isi, dan label")
+    parser.add_argument("--rounds", type=int, default=20, help="jumlah pohon baru per model")
+    parser.add_argument("--learning-rate", type=float, default=None,
+                        help="default: parameter booster versi dasar")
+    parser.add_argument("--base", default=None, help="versi dasar (default: versi aktif)")
+    parser.add_argument("--version", default=None, help="nama versi baru (default: waktu UTC)")
+    parser.add_argument("--holdout", type=float, default=0.1,
+                        help="fraksi artikel untuk membandingkan versi dasar & baru (0 = tidak ada)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="jumlah proses preprocessing (0 = jumlah CPU)")
+    parser.add_argument("--no-activate", action="store_true",
+                        help="terbitkan versi tanpa mengganti CURRENT")
+    args = parser.parse_args()
+
+    info = update_models(args.input, rounds=args.rounds, learning_rate=args.learning_rate,
+                         base_version=args.base, version=args.version, holdout=args.holdout,
+                         workers=args.workers or None, activate=not args.no_activate,
+                         log=lambda message: print(message, file=sys.stderr))
+    for model_option, result in info["metrics"].items():
+        print(f"{model_option:<8} | dasar: akurasi {result['base']['accuracy']:.3f} "
+              f"logloss {result['base']['logloss']:.4f} | baru: akurasi "
+              f"{result['updated']['accuracy']:.3f} logloss {result['updated']['logloss']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# model_update_test.py
+import json
+import os
+import pytest
+import predictor
+import model_update
+from test_data import test_data
+from utils.model_registry import ModelRegistry, file_sha256
+from utils import preprocessing
+from utils.preprocessing import clean_text
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    # Registry versi sementara; ModelSet aktif dikembalikan setelah test
+    monkeypatch.setattr(predictor, "MODEL_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(predictor, "MODEL_REFRESH_SECONDS", 0)
+    monkeypatch.setattr(predictor, "_active_models", predictor.active_models())
+    return tmp_path
+
+def _write_labeled(path):
+    # Format label campuran: nama kelas & angka
+    labels = {1: ("HOAX", 1), 0: ("valid", "0")}
+    with open(path, "w", encoding="utf-8") as f:
+        for i, (judul, isi, label) in enumerate(test_data * 3):
+            record = {"judul": judul, "isi": isi, "label": labels[label][i % 2]}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def test_parse_label():
+    assert [model_update.parse_label(value) for value in ("HOAX", "hoaks", 1, "true")] == [1] * 4
+    assert [model_update.parse_label(value) for value in ("VALID", "0", 0, False)] == [0] * 4
+    with pytest.raises(ValueError):
+        model_update.parse_label("mungkin")
+
+def test_vectorize_labeled_matches_classify_rows(monkeypatch):
+    # Artikel lebih panjang dari MAX_TOKENS: baris latih = vektor saat klasifikasi
+    monkeypatch.setattr(preprocessing, "MAX_TOKENS", 40)
+    judul, isi, label = test_data[0]
+    fast_tfidf = predictor.active_models().fast_tfidf()
+    rows, labels = model_update.vectorize_labeled([(judul, isi, label)], fast_tfidf)
+    _, source = predictor._normalize_input(predictor.combine_input(judul, isi))
+    _, document = predictor._clean_document(source, fast_tfidf)
+    expected = fast_tfidf.transform([document])
+    assert labels.tolist() == [label]
+    assert abs(rows - expected).max() < 1e-12
+    assert abs(rows - fast_tfidf.transform([clean_text(f"{judul} {isi}")])).max() > 0
+
+def test_update_publishes_version_and_hot_swaps(model_dir, monkeypatch):
+    input_path = str(model_dir / "baru.jsonl")
+    _write_labeled(input_path)
+    docs = [clean_text(f"{judul} {isi}") for judul, isi, _ in test_data]
+    old_models = predictor.active_models()
+    vectorized = old_models.pruned_tfidf(predictor.MODEL_OPTIONS).transform(docs)
+    old_scores = {model_option: predictor._predict_scores(vectorized, model_option, old_models)
+                  for model_option in predictor.MODEL_OPTIONS}
+
+    info = model_update.update_models(input_path, rounds=3, version="v1", holdout=0.2,
+                                      activate=False, lgbm_params={"min_data_in_leaf": 2})
+    directory = predictor.version_dir("v1")
+    assert info["rows"] == 3 * len(test_data) and info["holdout_rows"] > 0
+    assert set(info["metrics"]) == set(predictor.MODEL_OPTIONS)
+    for name in ("xgb_model2.json", "lgbm_model2.pkl", "tfidf_vectorizer.pkl", "vocab_stats.json"):
+        assert os.path.exists(os.path.join(directory, name)), name
+    # Manifest: checksum file & model berpasangan dengan vectorizer versi dasar
+    entry = predictor.get_registry().entry("v1")
+    assert entry["update"]["rounds"] == 3 and entry["base_version"] is None
+    assert entry["vectorizer"]["sha256"] == file_sha256(predictor.TFIDF_VECTORIZER_PATH)
+    assert all(model["vectorizer"] == entry["vectorizer"]["sha256"]
+               for model in entry["models"].values())
+    # Belum diaktifkan: CURRENT belum ada, versi aktif tetap
+    assert predictor.read_current() is None
+    assert not predictor.refresh_models()
+
+    # Versi baru dimuat di thread latar saat request berikutnya melihat CURRENT
+    predictor.get_registry().activate("v1")
+    monkeypatch.setattr(predictor, "MODEL_REFRESH_SECONDS", 1e-9)
+    monkeypatch.setattr(predictor, "_refresh_at", 0.0)
+    assert predictor.active_models() is old_models
+    predictor._refresh_thread.join()
+    new_models = predictor.active_models()
+    assert new_models.version == "v1"
+    # Objek yang sudah dimuat versi lama sudah dimuat sebelum dipasang
+    assert set(old_models.loaded) <= set(new_models.loaded)
+
+    assert new_models.xgb_model().num_boosted_rounds() == old_models.xgb_model().num_boosted_rounds() + 3
+    assert new_models.lgbm_model().current_iteration() == old_models.lgbm_model().current_iteration() + 3
+    # Vocabulary tetap, skor berubah; ModelSet lama (request yang sedang berjalan) tidak terpengaruh
+    assert new_models.fast_tfidf().term_list() == old_models.fast_tfidf().term_list()
+    for model_option in predictor.MODEL_OPTIONS:
+        assert new_models.model_version(model_option) != old_models.model_version(model_option)
+        new_scores = predictor._predict_scores(vectorized, model_option, new_models)
+        assert (new_scores != old_scores[model_option]).any()
+        assert (predictor._predict_scores(vectorized, model_option, old_models)
+                == old_scores[model_option]).all()
+
+    # Versi berikutnya melanjutkan dari versi aktif & statistik term baru
+    info = model_update.update_models(input_path, rounds=2, version="v2", holdout=0)
+    assert info["base_version"] == "v1" and predictor.read_current() == "v2"
+    with open(os.path.join(predictor.version_dir("v2"), "vocab_stats.json"), encoding="utf-8") as f:
+        assert json.load(f)["documents"] == 6 * len(test_data)
+    assert predictor.refresh_models() and predictor.active_models().version == "v2"
+    assert predictor.active_models().xgb_model().num_boosted_rounds() == \
+        new_models.xgb_model().num_boosted_rounds() + 2
+
+def test_registry_verifies_versions_before_swap(model_dir, monkeypatch):
+    registry = ModelRegistry(predictor.MODEL_DIR)
+    entry = registry.import_directory("models", "base")
+    assert entry["vectorizer"]["n_features"] == 7000
+    assert set(entry["files"]) >= {"xgb_model2.json", "lgbm_model2.pkl", "tfidf_vectorizer.pkl"}
+    registry.activate("base")
+    assert predictor.refresh_models(background=True).join() is None
+    base_models = predictor.active_models()
+    assert base_models.version == "base"
+    # Kunci result_cache memakai checksum manifest, sama dengan hash isi file
+    for model_option in predictor.MODEL_OPTIONS:
+        assert (base_models.model_version(model_option)
+                == predictor.ModelSet().model_version(model_option))
+
+    # Model yang dilatih dengan vectorizer lain ditolak
+    with pytest.raises(ValueError):
+        registry.register("base", vectorizer_sha256="0" * 64)
+
+    # File rusak: versi tidak dipasang, versi lama tetap dipakai
+    registry.import_directory("models", "rusak")
+    registry.activate("rusak")
+    with open(os.path.join(registry.version_dir("rusak"), "xgb_model2.json"), "a") as f:
+        f.write(" ")
+    with pytest.raises(ValueError):
+        registry.verify("rusak")
+    monkeypatch.setattr(predictor, "_failed_version", None)
+    predictor.refresh_models(background=True).join()
+    assert predictor.active_models() is base_models
+    assert predictor._failed_version == "rusak"
+
+    # Checksum cocok tapi pickle rusak: error apa pun saat memuat dicatat
+    # sebagai versi gagal dan tidak dicoba lagi
+    base_models.lgbm_model()
+    registry.import_directory("models", "pickle-rusak")
+    with open(os.path.join(registry.version_dir("pickle-rusak"), "lgbm_model2.pkl"), "wb") as f:
+        f.write(b"bukan pickle")
+    registry.register("pickle-rusak", check_features=False)
+    registry.activate("pickle-rusak")
+    predictor.refresh_models(background=True).join()
+    assert predictor.active_models() is base_models
+    assert predictor._failed_version == "pickle-rusak"
+    loads = []
+    monkeypatch.setattr(predictor, "_start_refresh_thread", lambda: loads.append(1))
+    monkeypatch.setattr(predictor, "_refresh_at", 0.0)
+    predictor._schedule_refresh()
+    assert loads == []
+    with pytest.raises(KeyError):
+        registry.activate("tidak-ada")
@@ -1,49 +1,1063 @@
 # predictor.py
-import streamlit as st
-import joblib
-import xgboost as xgb
-from utils.preprocessing import clean_text
+import os
+import sys
+import time
+import hashlib
+import functools
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from itertools import tee
+from utils import preprocessing
+from utils.preprocessing import (
+    LongText, clean_texts, clean_words, exceeds_max_tokens, is_long_text,
+    load_sastrawi, normalize_words,
+)
+from utils.result_cache import ResultCache, content_key
+from utils.shadow import ShadowStats
+from utils import metrics, threads
 
-# Load models & vectorizer (lakukan sekali di awal)
-xgb_model = xgb.Booster()
-xgb_model.load_model("models/xgb_model2.json")
-lgbm_model = joblib.load("models/lgbm_model2.pkl")
-tfidf_vectorizer = joblib.load("models/tfidf_vectorizer.pkl")
+# Lokasi model & vectorizer. Semuanya dimuat saat pertama dipakai (lazy),
+# jadi import predictor murah dan hanya model yang dipilih yang dimuat.
+XGB_MODEL_PATH = "models/xgb_model2.json"
+LGBM_MODEL_PATH = "models/lgbm_model2.pkl"
+TFIDF_VECTORIZER_PATH = "models/tfidf_vectorizer.pkl"
+# Hasil ekspor FastTfidf (python -m utils.fast_tfidf), dimuat tanpa sklearn
+FAST_TFIDF_PATH = "models/tfidf_fast.npz"
+# Hasil langkah offline python -m utils.tree_engine
+XGB_TREES_PATH = "models/xgb_model2_trees.npz"
+LGBM_TREES_PATH = "models/lgbm_model2_trees.npz"
+# Bundle tanpa pickle (python -m utils.bundle): vocabulary, idf, dan tabel
+# pohon dibaca lewat mmap, jadi worker berbagi halaman lewat page cache OS
+MODEL_BUNDLE_PATH = os.environ.get("HOAXCHECK_BUNDLE", "models/hoaxcheck.bundle")
+
+# Registry versi model (utils.model_registry): artefak di
+# <MODEL_DIR>/versions/<versi>/ (nama file sama dengan path di atas), checksum
+# di manifest.json, versi aktif ditunjuk <MODEL_DIR>/CURRENT. Tanpa CURRENT,
+# path di atas yang dipakai.
+MODEL_DIR = os.environ.get("HOAXCHECK_MODEL_DIR", "models")
+# Interval (detik) pengecekan CURRENT dari jalur request; versi baru dimuat
+# di thread latar lalu dipasang (lihat refresh_models). 0 = tidak dicek.
+MODEL_REFRESH_SECONDS = float(os.environ.get("HOAXCHECK_MODEL_REFRESH", 30))
+
+MODEL_OPTIONS = ("XGBoost", "LightGBM")
+# Model option gabungan: kedua model dijalankan bersamaan, skornya dirata-rata
+ENSEMBLE = "Ensemble"
+CLASSIFY_OPTIONS = MODEL_OPTIONS + (ENSEMBLE,)
+# Bobot rata-rata skor Ensemble (dinormalisasi, jadi cukup perbandingannya)
+ENSEMBLE_WEIGHTS = {"XGBoost": 0.5, "LightGBM": 0.5}
+
+# Backend prediksi: "booster" (xgboost/lightgbm) atau "trees" (tabel pohon
+# NumPy dari utils.tree_engine, probabilitas sama sampai 1e-6)
+PREDICT_BACKEND = os.environ.get("HOAXCHECK_BACKEND", "booster")
+# XGBoost: prediksi langsung dari CSR (inplace_predict) alih-alih DMatrix
+# per pemanggilan; HOAXCHECK_XGB_INPLACE=0 memaksa jalur DMatrix
+XGB_INPLACE_PREDICT = os.environ.get("HOAXCHECK_XGB_INPLACE", "1") not in ("", "0")
+# Dukungan inplace_predict di xgboost terpasang; diperiksa sekali saat
+# pemanggilan pertama (None = belum diperiksa)
+_xgb_inplace = None
+
+# Jumlah thread inferensi per proses: nthread XGBoost, num_threads LightGBM,
+# dan batas pool OpenMP/BLAS lewat threadpoolctl (0 = default library, yaitu
+# semua CPU). Lihat configure_threads.
+INFERENCE_THREADS = int(os.environ.get("HOAXCHECK_THREADS", 0))
+_thread_limit = None
+
+# Lewati stemming untuk kata yang stem-nya pasti bukan term vocabulary
+# TF-IDF (utils.vocab_filter). Skor identik, tetapi cleaned_text memuat kata
+# tersebut apa adanya (tidak di-stem), jadi nonaktif secara default.
+SKIP_UNREACHABLE_WORDS = os.environ.get("HOAXCHECK_SKIP_UNREACHABLE", "") not in ("", "0")
+
+# Shadow scoring: versi kandidat di registry ikut menskor sebagian artikel
+# (SHADOW_RATE) di thread latar, memakai vektor TF-IDF request bila
+# vectorizer-nya sama. Hasilnya hanya masuk shadow_stats; pekerjaan dibuang
+# bila SHADOW_MAX_PENDING masih menunggu. Lihat configure_shadow.
+SHADOW_VERSION = os.environ.get("HOAXCHECK_SHADOW_VERSION") or None
+SHADOW_RATE = float(os.environ.get("HOAXCHECK_SHADOW_RATE", 0.05))
+SHADOW_MAX_PENDING = int(os.environ.get("HOAXCHECK_SHADOW_MAX_PENDING", 16))
+shadow_stats = ShadowStats()
+
+# Cache hasil klasifikasi per artikel, dikunci dengan hash teks hasil
+# normalize_text + versi model (0 = nonaktif; lihat utils.result_cache)
+RESULT_CACHE_SIZE = int(os.environ.get("HOAXCHECK_RESULT_CACHE_SIZE", 10000))
+# Umur entri cache dalam detik
+RESULT_CACHE_TTL = float(os.environ.get("HOAXCHECK_RESULT_CACHE_TTL", 24 * 3600))
+# File SQLite opsional agar cache dipakai bersama antar proses
+RESULT_CACHE_PATH = os.environ.get("HOAXCHECK_RESULT_CACHE")
+
+result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_PATH)
+
+_load_lock = threading.RLock()
+
+def _cached(load):
+    """Panggil method load sekali per ModelSet & argumen (thread-safe), berikutnya dari cache."""
+
+    @functools.wraps(load)
+    def wrapper(self, *args):
+        key = (load.__name__,) + args
+        if key not in self.loaded:
+            with self._lock:
+                if key not in self.loaded:
+                    self.loaded[key] = load(self, *args)
+        return self.loaded[key]
+    return wrapper
+
+def _load_trees(npz_path, build):
+    # Pakai hasil langkah offline (python -m utils.tree_engine) bila ada
+    from utils.tree_engine import TreeEnsemble
+    if os.path.exists(npz_path):
+        return TreeEnsemble.load(npz_path)
+    return build()
+
+class ModelSet:
+    """
+    Satu versi model: path artefak dan objek yang dimuat saat pertama dipakai
+    (sekali per ModelSet). Setiap request memakai satu ModelSet dari awal
+    sampai akhir, jadi pergantian versi tidak mencampur model lama & baru.
+    - version: nama versi (None = artefak di XGB_MODEL_PATH dst.)
+    - path lain: default konstanta modul
+    - checksums: dict path -> sha256 dari manifest registry (None = dihitung
+      saat dibutuhkan model_version)
+    """
+
+    def __init__(self, version=None, xgb_model_path=None, lgbm_model_path=None,
+                 tfidf_vectorizer_path=None, fast_tfidf_path=None, xgb_trees_path=None,
+                 lgbm_trees_path=None, bundle_path=None, checksums=None):
+        self.version = version
+        self.checksums = checksums or {}
+        self.xgb_model_path = xgb_model_path or XGB_MODEL_PATH
+        self.lgbm_model_path = lgbm_model_path or LGBM_MODEL_PATH
+        self.tfidf_vectorizer_path = tfidf_vectorizer_path or TFIDF_VECTORIZER_PATH
+        self.fast_tfidf_path = fast_tfidf_path or FAST_TFIDF_PATH
+        self.xgb_trees_path = xgb_trees_path or XGB_TREES_PATH
+        self.lgbm_trees_path = lgbm_trees_path or LGBM_TREES_PATH
+        self.bundle_path = bundle_path or MODEL_BUNDLE_PATH
+        # Objek yang sudah dimuat (key: nama method + argumen)
+        self.loaded = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_directory(cls, path, version=None, checksums=None):
+        """
+        ModelSet dari direktori berisi artefak dengan nama file yang sama seperti di models/.
+        - checksums: dict nama file -> sha256 (mis. entri manifest registry)
+        """
+        def in_directory(default_path):
+            return os.path.join(path, os.path.basename(default_path))
+        checksums = {os.path.join(path, name): sha256 for name, sha256 in (checksums or {}).items()}
+        return cls(version, in_directory(XGB_MODEL_PATH), in_directory(LGBM_MODEL_PATH),
+                   in_directory(TFIDF_VECTORIZER_PATH), in_directory(FAST_TFIDF_PATH),
+                   in_directory(XGB_TREES_PATH), in_directory(LGBM_TREES_PATH),
+                   in_directory(MODEL_BUNDLE_PATH), checksums)
+
+    def __repr__(self):
+        return f"ModelSet({self.version!r})"
+
+    @_cached
+    def xgb_model(self):
+        import xgboost as xgb
+        model = xgb.Booster()
+        model.load_model(self.xgb_model_path)
+        if INFERENCE_THREADS:
+            model.set_param({"nthread": INFERENCE_THREADS})
+        _limit_threads()
+        return model
+
+    @_cached
+    def lgbm_model(self):
+        import joblib
+        model = joblib.load(self.lgbm_model_path)
+        _limit_threads()
+        return model
+
+    @_cached
+    def tfidf_vectorizer(self):
+        import joblib
+        return joblib.load(self.tfidf_vectorizer_path)
+
+    @_cached
+    def bundle(self):
+        """
+        Return: isi bundle (lihat utils.bundle.read_bundle) atau None bila
+                tidak ada. ValueError bila bundle dibuat dari model / vectorizer
+                lain; file sumber yang tidak ada (deploy hanya bundle) tidak dicek.
+        """
+        if not os.path.exists(self.bundle_path):
+            return None
+        from utils.bundle import read_bundle
+        sources = {"tfidf": self.tfidf_vectorizer_path, "XGBoost": self.xgb_model_path,
+                   "LightGBM": self.lgbm_model_path}
+        return read_bundle(self.bundle_path, {name: self._sha256(path)
+                                              for name, path in sources.items()
+                                              if os.path.exists(path)})
+
+    def _sha256(self, path):
+        # Checksum manifest (sudah diverifikasi saat versi dimuat) bila ada
+        from utils.model_registry import file_sha256
+        return self.checksums.get(path) or file_sha256(path)
+
+    @_cached
+    def fast_tfidf(self):
+        """Versi inferensi TF-IDF (hasil identik, tanpa overhead sklearn per request)"""
+        from utils.fast_tfidf import FastTfidf
+        bundle = self.bundle()
+        if bundle is not None:
+            return FastTfidf.from_arrays(*bundle["tfidf"])
+        if os.path.exists(self.fast_tfidf_path):
+            return FastTfidf.load(self.fast_tfidf_path)
+        return FastTfidf.from_sklearn(self.tfidf_vectorizer())
+
+    @_cached
+    def trees(self, model_option):
+        """TreeEnsemble untuk backend "trees"."""
+        from utils.tree_engine import TreeEnsemble
+        bundle = self.bundle()
+        if bundle is not None:
+            return TreeEnsemble.from_arrays(
+                *bundle["XGBoost" if model_option == "XGBoost" else "LightGBM"])
+        if model_option == "XGBoost":
+            return _load_trees(self.xgb_trees_path,
+                               lambda: TreeEnsemble.from_xgboost_json(self.xgb_model_path))
+        return _load_trees(self.lgbm_trees_path,
+                           lambda: TreeEnsemble.from_lightgbm(self.lgbm_model()))
+
+    @_cached
+    def model_version(self, model_option):
+        """
+        Identitas model untuk kunci result_cache: nama model, backend, dan hash
+        isi file model + vectorizer + bundle (berubah bila salah satunya diganti).
+        Return: str
+        """
+        model_path = self.xgb_model_path if model_option == "XGBoost" else self.lgbm_model_path
+        paths = [model_path, self.tfidf_vectorizer_path]
+        if os.path.exists(self.bundle_path):
+            paths.append(self.bundle_path)
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(self._sha256(path).encode())
+        # cleaned_text yang disimpan berbeda bila kata tak terjangkau tidak di-stem
+        skip = ":skip" if SKIP_UNREACHABLE_WORDS else ""
+        return f"{model_option}:{PREDICT_BACKEND}{skip}:{digest.hexdigest()[:16]}"
+
+    @_cached
+    def split_features(self, model_option):
+        """
+        Index kolom TF-IDF yang dipakai split oleh model model_option.
+        Return: np.ndarray int (terurut)
+        """
+        if PREDICT_BACKEND == "trees":
+            return self.trees(model_option).used_features
+        if model_option == "XGBoost":
+            xgb_model = self.xgb_model()
+            position = {name: i for i, name in enumerate(xgb_model.feature_names or [])}
+            return np.unique([position[name] if position else int(name[1:])
+                              for name in xgb_model.get_score(importance_type="weight")])
+        lgbm_model = self.lgbm_model()
+        return np.flatnonzero(lgbm_model.feature_importance(importance_type="split"))
+
+    def pruned_tfidf(self, model_options):
+        """
+        Kolom lain tidak pernah dilihat pohon: cukup isi kolom yang dipakai split
+        oleh model di model_options (norm tetap dari seluruh vocabulary, jadi
+        skor tidak berubah).
+        - model_options: iterable nama model (urutan tidak berpengaruh)
+        """
+        return self._pruned_tfidf(tuple(sorted(set(model_options))))
+
+    @_cached
+    def _pruned_tfidf(self, model_options):
+        features = np.unique(np.concatenate([self.split_features(model_option)
+                                             for model_option in model_options]))
+        return self.fast_tfidf().prune(features)
+
+    @_cached
+    def vectorizer_sha256(self):
+        from utils.model_registry import file_sha256
+        return (self.checksums.get(self.tfidf_vectorizer_path)
+                or file_sha256(self.tfidf_vectorizer_path))
+
+    def shared_tfidf(self, other, model_options):
+        """
+        Seperti pruned_tfidf, tetapi kolom split model_options milik ModelSet
+        other ikut diisi, jadi satu vektor dipakai kedua versi (shadow scoring).
+        Tidak di-cache di ModelSet (supaya kandidat lama tidak tertahan di
+        loaded); cache-nya ada di state shadow, lihat _shared_tfidf.
+        - model_options: tuple nama model terurut
+        Return: FastTfidf, atau None bila vectorizer kedua versi berbeda
+        """
+        if other.vectorizer_sha256() != self.vectorizer_sha256():
+            return None
+        features = np.unique(np.concatenate([models.split_features(model_option)
+                                             for models in (self, other)
+                                             for model_option in model_options]))
+        return self.fast_tfidf().prune(features)
+
+    @_cached
+    def word_filter(self):
+        """VocabularyFilter dari seluruh vocabulary TF-IDF (norm memakai semua kolom)."""
+        from utils.vocab_filter import VocabularyFilter
+        return VocabularyFilter.from_terms(self.fast_tfidf().term_list())
+
+    def preload(self, model_options=MODEL_OPTIONS):
+        """Muat semua yang dibutuhkan model_options sekarang."""
+        if SKIP_UNREACHABLE_WORDS:
+            self.word_filter()
+        self.pruned_tfidf(model_options)
+        for model_option in model_options:
+            self.pruned_tfidf((model_option,))
+            if PREDICT_BACKEND == "trees":
+                self.trees(model_option)
+            elif model_option == "XGBoost":
+                self.xgb_model()
+            else:
+                self.lgbm_model()
+
+    def preload_like(self, other):
+        """Muat objek yang sama dengan yang sudah dimuat ModelSet other."""
+        for name, *args in list(other.loaded):
+            getattr(self, name)(*args)
+
+    def warm_up(self):
+        """
+        Satu prediksi kecil per model yang sudah dimuat, supaya alokasi
+        pertama booster tidak jatuh ke request pertama setelah versi dipasang.
+        """
+        vectorized = self.fast_tfidf().transform([""])
+        for model_option in MODEL_OPTIONS:
+            loaded = (("trees", model_option) if PREDICT_BACKEND == "trees" else
+                      ("xgb_model",) if model_option == "XGBoost" else ("lgbm_model",))
+            if loaded in self.loaded:
+                _predict_scores(vectorized, model_option, self)
+
+_active_models = None
+# Waktu (time.monotonic) pengecekan CURRENT berikutnya & thread pemuat versi baru
+_refresh_at = 0.0
+_refresh_thread = None
+# Versi yang gagal diverifikasi/dimuat (tidak dicoba lagi sampai CURRENT berubah)
+_failed_version = None
+
+def get_registry():
+    """Return: ModelRegistry di MODEL_DIR"""
+    from utils.model_registry import ModelRegistry
+    return ModelRegistry(MODEL_DIR)
+
+def version_dir(version):
+    """Return: direktori artefak versi model"""
+    return get_registry().version_dir(version)
+
+def read_current():
+    """Return: nama versi yang ditunjuk <MODEL_DIR>/CURRENT, atau None bila tidak ada."""
+    return get_registry().current()
+
+def load_version(version):
+    """
+    ModelSet (belum dimuat) untuk version, setelah checksum & pasangan
+    vectorizer-nya dicocokkan dengan manifest registry.
+    - version: nama versi (None = artefak di XGB_MODEL_PATH dst.)
+    Return: ModelSet (KeyError/ValueError bila tidak terdaftar/tidak cocok)
+    """
+    if version is None:
+        return ModelSet()
+    registry = get_registry()
+    entry = registry.verify(version)
+    return ModelSet.from_directory(registry.version_dir(version), version, entry["files"])
+
+def active_models():
+    """
+    ModelSet untuk request baru. Paling sering tiap MODEL_REFRESH_SECONDS,
+    CURRENT dibaca; bila menunjuk versi lain, versi itu dimuat di thread latar.
+    """
+    global _active_models
+    models = _active_models
+    if models is None:
+        with _load_lock:
+            if _active_models is None:
+                _active_models = load_version(read_current())
+                _schedule_refresh(force=True)
+            models = _active_models
+    if MODEL_REFRESH_SECONDS and time.monotonic() >= _refresh_at:
+        _schedule_refresh()
+    return models
+
+def _schedule_refresh(force=False):
+    global _refresh_at
+    with _load_lock:
+        if not force and time.monotonic() < _refresh_at:
+            return
+        _refresh_at = time.monotonic() + MODEL_REFRESH_SECONDS
+        if force or read_current() in (_active_models.version, _failed_version):
+            return
+        _start_refresh_thread()
+
+def _start_refresh_thread():
+    # Paling banyak satu thread pemuat versi (dipanggil dengan _load_lock)
+    global _refresh_thread
+    if _refresh_thread is None or not _refresh_thread.is_alive():
+        _refresh_thread = threading.Thread(target=_refresh_in_background,
+                                           name="model-refresh", daemon=True)
+        _refresh_thread.start()
+    return _refresh_thread
+
+def _refresh_in_background():
+    # Versi yang rusak (checksum, pickle, booster, ...) tidak boleh menghentikan
+    # layanan: versi lama tetap dipakai dan versi itu tidak dicoba lagi
+    global _failed_version
+    version = read_current()
+    try:
+        refresh_models()
+    except Exception as e:
+        _failed_version = version
+        print(f"[WARN] Versi model {version} tidak dipasang: {type(e).__name__}: {e}",
+              file=sys.stderr)
+
+def activate(models, preload=True):
+    """
+    Pasang models sebagai ModelSet aktif. Request yang sedang berjalan
+    selesai dengan ModelSet lama; objek yang sudah dimuat versi lama dimuat
+    & dipanaskan dulu di models (preload) supaya request berikutnya tidak menunggu.
+    Return: ModelSet aktif sebelumnya (atau None)
+    """
+    global _active_models
+    previous = _active_models
+    if preload and previous is not None:
+        models.preload_like(previous)
+        models.warm_up()
+    with _load_lock:
+        _active_models = models
+    return previous
+
+def refresh_models(preload=True, background=False):
+    """
+    Aktifkan versi yang ditunjuk CURRENT bila berbeda dengan versi aktif
+    (dipanggil otomatis dari active_models, atau langsung, mis. setelah
+    model_update.py / python -m utils.model_registry activate).
+    - background: muat & pasang di thread latar, langsung kembali
+    Return: True bila versi aktif berganti (background: thread pemuat)
+    """
+    if background:
+        with _load_lock:
+            return _start_refresh_thread()
+    version = read_current()
+    if _active_models is not None and _active_models.version == version:
+        return False
+    activate(load_version(version), preload=preload)
+    return True
+
+# Akses ModelSet aktif (nama lama, tetap dipakai benchmark & test)
+def get_xgb_model():
+    return active_models().xgb_model()
+
+def get_lgbm_model():
+    return active_models().lgbm_model()
+
+def get_tfidf_vectorizer():
+    return active_models().tfidf_vectorizer()
+
+def get_fast_tfidf():
+    return active_models().fast_tfidf()
+
+def get_trees(model_option):
+    return active_models().trees(model_option)
+
+def model_version(model_option):
+    return active_models().model_version(model_option)
+
+def split_features(model_option):
+    return active_models().split_features(model_option)
+
+def get_pruned_tfidf(model_options):
+    return active_models().pruned_tfidf(model_options)
+
+def get_word_filter():
+    return active_models().word_filter()
+
+def _result_key(normalized, model_option, models=None):
+    # Teks hasil normalize_text (digest-nya untuk artikel panjang) menentukan
+    # cleaned_text & skor sepenuhnya
+    if not result_cache.enabled:
+        return None
+    return content_key((models or active_models()).model_version(model_option), normalized)
+
+def _limit_threads():
+    # threadpoolctl hanya melihat library yang sudah dimuat: dipanggil lagi
+    # setiap kali model (dan OpenMP-nya) dimuat
+    global _thread_limit
+    if _thread_limit is not None:
+        _thread_limit.restore_original_limits()
+    _thread_limit = threads.limit_threads(INFERENCE_THREADS)
+
+def configure_threads(inference_threads=None, cpus=None):
+    """
+    Atur thread inferensi proses ini (mis. di initializer worker service).
+    - inference_threads: jumlah thread (None = INFERENCE_THREADS, 0 = default library)
+    - cpus: list index CPU untuk CPU affinity (None = tidak diubah)
+    """
+    global INFERENCE_THREADS
+    if cpus:
+        threads.pin_cpus(cpus)
+    if inference_threads is not None:
+        INFERENCE_THREADS = inference_threads
+    with _load_lock:
+        _limit_threads()
+        models = active_models()
+        if ("xgb_model",) in models.loaded:
+            # nthread 0 = semua CPU (default xgboost)
+            models.xgb_model().set_param({"nthread": INFERENCE_THREADS})
+
+def _use_word_filter(models=None):
+    # Pasang filter vocabulary ModelSet sebelum preprocessing (SKIP_UNREACHABLE_WORDS)
+    if not SKIP_UNREACHABLE_WORDS:
+        return
+    word_filter = (models or active_models()).word_filter()
+    if preprocessing.word_filter is not word_filter:
+        with _load_lock:
+            if preprocessing.word_filter is not word_filter:
+                preprocessing.set_word_filter(word_filter)
+
+def preload(model_options=MODEL_OPTIONS):
+    """Muat semua yang dibutuhkan model_options sekarang (mis. di worker service)."""
+    load_sastrawi()
+    models = active_models()
+    _use_word_filter(models)
+    models.preload(model_options)
+
+# Nama lama (predictor.xgb_model, predictor.pruned_tfidf, ...) tetap bisa
+# diakses; nilainya dimuat saat pertama diakses
+_LAZY_ATTRIBUTES = {
+    "xgb_model": get_xgb_model,
+    "lgbm_model": get_lgbm_model,
+    "tfidf_vectorizer": get_tfidf_vectorizer,
+    "fast_tfidf": get_fast_tfidf,
+    "model_features": lambda: np.union1d(*map(split_features, MODEL_OPTIONS)),
+    "pruned_tfidf": lambda: get_pruned_tfidf(MODEL_OPTIONS),
+    "xgb_trees": lambda: get_trees("XGBoost"),
+    "lgbm_trees": lambda: get_trees("LightGBM"),
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 threshold = 0.5
 
+# Jumlah artikel per chunk pada classify_many
+BATCH_CHUNK_SIZE = 1024
+
+def combine_input(judul, isi):
+    """
+    Gabungkan judul dan isi seperti pada classify_text.
+    Return: combined_text (str)
+    """
+    if judul.strip() and isi.strip():
+        return f"{judul} {isi}"
+    elif judul.strip():
+        return judul
+    else:
+        return isi
+
+def input_warning(judul, isi):
+    """
+    Pesan peringatan bila hanya judul atau hanya isi yang diinput, dan
+    keterangan untuk artikel yang melebihi MAX_TOKENS kata (kata setelahnya
+    tidak diskor, cleaned_text hanya PREVIEW_WORDS kata pertama).
+    Return: str atau None (ditampilkan oleh UI, mis. lewat st.info)
+    """
+    warnings = []
+    if judul.strip() and not isi.strip():
+        warnings.append("⚠️ Hanya Judul yang diinput. Hasil klasifikasi mungkin kurang akurat.\n\nUntuk memaksimalkan kerja aplikasi, dianjurkan untuk mengisi **Judul** dan **Isi Berita**")
+    elif not judul.strip():
+        warnings.append("⚠️ Hanya Isi yang diinput. Hasil klasifikasi mungkin kurang akurat.\n\nUntuk memaksimalkan kerja aplikasi, dianjurkan untuk mengisi **Judul** dan **Isi Berita**")
+    if exceeds_max_tokens(combine_input(judul, isi)):
+        warnings.append(f"ℹ️ Artikel lebih dari {preprocessing.MAX_TOKENS} kata: kata "
+                        f"setelahnya tidak ikut diklasifikasikan, dan teks yang dibersihkan "
+                        f"hanya menampilkan {preprocessing.PREVIEW_WORDS} kata pertama.")
+    return "\n\n".join(warnings) or None
+
+def _normalize_input(combined_text):
+    """
+    Normalisasi teks gabungan (sekali); artikel panjang (is_long_text)
+    di-scan per chunk lewat LongText.
+    Return: (teks hasil normalize_text atau LongText.digest untuk kunci
+            result_cache, list kata hasil normalisasi atau LongText)
+    """
+    if is_long_text(combined_text):
+        long_text = LongText(combined_text)
+        return long_text.digest, long_text
+    words = normalize_words(combined_text)
+    return " ".join(words), words
+
+def _clean_document(source, tfidf):
+    """
+    Hapus stopword & stemming satu artikel (source dari _normalize_input).
+    Return: (token cleaned_text, dokumen untuk tfidf.transform: list
+            kata hasil stemming). Artikel panjang: dokumen berupa Counter
+            fitur yang dihitung per chunk, cleaned_text lewat LongText.preview
+            (hanya PREVIEW_WORDS kata pertama bila melebihi MAX_TOKENS)
+    """
+    if isinstance(source, LongText):
+        features = tfidf.count_features(source.chunks())
+        return source.preview(), features
+    tokens = clean_words(source)
+    return tokens, tokens
+
+def _cached_result(cached, source):
+    """
+    Entri result_cache (score, token cleaned_text).
+    Return: (score, token cleaned_text, dokumen untuk tfidf.transform, atau None
+            untuk artikel panjang: token di cache bisa hanya preview)
+    """
+    score, tokens = cached
+    if isinstance(tokens, str):
+        # Entri cache disk yang disimpan sebelum cleaned_text berupa token
+        tokens = tokens.split(" ")
+    return score, tokens, None if isinstance(source, LongText) else tokens
+
+def _predict_scores(vectorized, model_option, models=None, stage_metrics=True):
+    """
+    Skor probabilitas HOAX untuk matriks TF-IDF (satu baris per artikel).
+    - models: ModelSet (default: active_models())
+    - stage_metrics: False = durasi tidak dicatat (mis. shadow scoring)
+    """
+    models = models or active_models()
+    started = metrics.start() if stage_metrics else None
+    if PREDICT_BACKEND == "trees":
+        scores = models.trees(model_option).predict(vectorized)
+    elif model_option == "XGBoost":
+        scores = _xgb_inplace_predict(vectorized, models)
+        if scores is None:
+            import xgboost as xgb
+            dmatrix = xgb.DMatrix(vectorized, enable_categorical=False)
+            started = metrics.stop("dmatrix", started, model_option)
+            scores = models.xgb_model().predict(dmatrix, validate_features=False)
+    else:
+        lgbm_model = models.lgbm_model()
+        options = {"num_threads": INFERENCE_THREADS} if INFERENCE_THREADS else {}
+        scores = lgbm_model.predict(vectorized, num_iteration=lgbm_model.best_iteration,
+                                    **options)
+    metrics.stop("predict", started, model_option)
+    return scores
+
+def _xgb_inplace_predict(vectorized, models=None):
+    """
+    Prediksi XGBoost langsung dari matriks CSR (inplace_predict) tanpa
+    membangun DMatrix per pemanggilan. Error XGBoost saat prediksi tetap
+    diteruskan ke pemanggil; jalur cepat tidak dimatikan karenanya.
+    Return: np.ndarray skor, atau None bila dimatikan / xgboost terpasang
+            belum punya inplace_predict (pakai jalur DMatrix)
+    """
+    global _xgb_inplace
+    if not XGB_INPLACE_PREDICT:
+        return None
+    if _xgb_inplace is None:
+        import xgboost as xgb
+        _xgb_inplace = hasattr(xgb.Booster, "inplace_predict")
+    if not _xgb_inplace:
+        return None
+    return (models or active_models()).xgb_model().inplace_predict(
+        vectorized, validate_features=False)
+
+def combine_scores(scores, weights=None):
+    """
+    Rata-rata berbobot skor XGBoost & LightGBM (float atau np.ndarray).
+    - scores: dict nama model -> skor
+    - weights: dict nama model -> bobot (default ENSEMBLE_WEIGHTS)
+    """
+    weights = weights or ENSEMBLE_WEIGHTS
+    total = sum(weights[model_option] for model_option in MODEL_OPTIONS)
+    return sum(weights[model_option] * scores[model_option]
+               for model_option in MODEL_OPTIONS) / total
+
+_predict_pool = None
+
+def _predict_parallel(inputs, models=None):
+    """
+    Jalankan beberapa model bersamaan di thread terpisah (xgboost & lightgbm
+    melepas GIL selama prediksi di library native).
+    - inputs: dict nama model -> matriks TF-IDF
+    - models: ModelSet (default: active_models())
+    Return: dict nama model -> np.ndarray skor
+    """
+    global _predict_pool
+    models = models or active_models()
+    model_options = list(inputs)
+    if len(model_options) == 1:
+        return {model_options[0]: _predict_scores(inputs[model_options[0]], model_options[0],
+                                                  models)}
+    with _load_lock:
+        if _predict_pool is None:
+            _predict_pool = ThreadPoolExecutor(max_workers=len(MODEL_OPTIONS),
+                                               thread_name_prefix="predict")
+    futures = {model_option: _predict_pool.submit(_predict_scores, inputs[model_option],
+                                                  model_option, models)
+               for model_option in model_options[1:]}
+    # Model pertama di thread pemanggil, sisanya bersamaan di pool
+    results = {model_options[0]: _predict_scores(inputs[model_options[0]], model_options[0],
+                                                 models)}
+    results.update((model_option, future.result()) for model_option, future in futures.items())
+    return results
+
+_shadow_models = None
+_shadow_thread = None
+_shadow_pool = None
+_shadow_pending = 0
+_shadow_random = np.random.default_rng()
+# (versi utama, versi kandidat, model_options) -> FastTfidf bersama / None;
+# dikosongkan setiap configure_shadow
+_shadow_tfidf = {}
+
+def configure_shadow(version, rate=None, max_pending=None):
+    """
+    Aktifkan shadow scoring dengan versi registry version (None = matikan).
+    Kandidat dimuat di thread latar; sampai siap, artikel tidak di-shadow.
+    - rate: peluang tiap artikel ikut diskor kandidat (None = SHADOW_RATE)
+    - max_pending: batas pekerjaan shadow yang menunggu (None = SHADOW_MAX_PENDING)
+    Return: thread pemuat kandidat (None bila dimatikan)
+    """
+    global SHADOW_VERSION, SHADOW_RATE, SHADOW_MAX_PENDING, _shadow_models, _shadow_thread
+    global _shadow_tfidf
+    with _load_lock:
+        SHADOW_VERSION = version
+        if rate is not None:
+            SHADOW_RATE = rate
+        if max_pending is not None:
+            SHADOW_MAX_PENDING = max_pending
+        _shadow_models = None
+        _shadow_thread = None
+        _shadow_tfidf = {}
+        if version is None:
+            return None
+        return _start_shadow_load()
+
+def _start_shadow_load():
+    # Dipanggil dengan _load_lock; satu percobaan muat per versi kandidat
+    global _shadow_thread
+    if _shadow_thread is None:
+        _shadow_thread = threading.Thread(target=_load_shadow, args=(SHADOW_VERSION,),
+                                          name="shadow-load", daemon=True)
+        _shadow_thread.start()
+    return _shadow_thread
+
+def _load_shadow(version):
+    global _shadow_models
+    try:
+        models = load_version(version)
+        models.preload()
+        models.warm_up()
+    except (KeyError, ValueError, OSError) as e:
+        print(f"[WARN] Versi shadow {version} tidak dimuat: {e}", file=sys.stderr)
+        return
+    with _load_lock:
+        if SHADOW_VERSION == version:
+            _shadow_models = models
+
+def _shadow_sample(rows=1):
+    """
+    Pilih artikel yang ikut di-shadow (masing-masing dengan peluang SHADOW_RATE).
+    Return: (ModelSet kandidat, np.ndarray index artikel), atau (None, None)
+    """
+    if SHADOW_VERSION is None:
+        return None, None
+    sampled = np.flatnonzero(_shadow_random.random(rows) < SHADOW_RATE)
+    if not len(sampled):
+        return None, None
+    candidate = _shadow_models
+    if candidate is None:
+        with _load_lock:
+            if SHADOW_VERSION is not None:
+                _start_shadow_load()
+        return None, None
+    return candidate, sampled
+
+def _request_tfidf(models, candidate, model_options):
+    # Artikel yang di-shadow: kolom kandidat ikut diisi bila vectorizer-nya sama
+    # Return: (FastTfidf, True bila vektornya bisa dipakai kandidat)
+    if candidate is not None:
+        shared = _shared_tfidf(models, candidate, tuple(sorted(set(model_options))))
+        if shared is not None:
+            return shared, True
+    return models.pruned_tfidf(model_options), False
+
+def _shared_tfidf(models, candidate, model_options):
+    # ModelSet.shared_tfidf sekali per pasangan versi. Kunci memakai nama versi,
+    # bukan ModelSet, dan hanya pasangan dengan versi utama terbaru yang
+    # disimpan; kandidat yang sudah diganti/dimatikan tidak dimasukkan lagi
+    global _shadow_tfidf
+    key = (models.version, candidate.version, model_options)
+    cache = _shadow_tfidf
+    if key in cache:
+        return cache[key]
+    shared = models.shared_tfidf(candidate, model_options)
+    with _load_lock:
+        if candidate is _shadow_models:
+            _shadow_tfidf = {other: tfidf for other, tfidf in _shadow_tfidf.items()
+                             if other[0] == models.version}
+            _shadow_tfidf[key] = shared
+    return shared
+
+def _submit_shadow(candidate, model_option, primary_scores, vectorized=None, texts=None):
+    """
+    Skor ulang artikel dengan kandidat di thread latar; pekerjaan dibuang
+    (dihitung "dropped") bila SHADOW_MAX_PENDING pekerjaan masih menunggu.
+    - primary_scores: skor model utama
+    - vectorized: vektor TF-IDF request (kolom kandidat terisi), atau None
+    - texts: dokumen (list kata hasil stemming atau Counter fitur artikel panjang),
+      divektorisasi di thread latar bila vectorized None
+    Return: Future, atau None bila dibuang
+    """
+    global _shadow_pool, _shadow_pending
+    with _load_lock:
+        if _shadow_pending >= SHADOW_MAX_PENDING:
+            shadow_stats.count(model_option, "dropped", len(primary_scores))
+            return None
+        _shadow_pending += 1
+        if _shadow_pool is None:
+            _shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+    return _shadow_pool.submit(_shadow_score, candidate, model_option,
+                               np.asarray(primary_scores, dtype=np.float64), vectorized, texts)
+
+def _shadow_score(candidate, model_option, primary_scores, vectorized, texts):
+    global _shadow_pending
+    started = time.perf_counter()
+    try:
+        model_options = MODEL_OPTIONS if model_option == ENSEMBLE else (model_option,)
+        if vectorized is None:
+            vectorized = candidate.pruned_tfidf(model_options).transform(texts)
+        scores = {option: _predict_scores(vectorized, option, candidate, stage_metrics=False)
+                  for option in model_options}
+        candidate_scores = (combine_scores(scores) if model_option == ENSEMBLE
+                            else scores[model_option])
+        shadow_stats.add(model_option, primary_scores, candidate_scores, threshold,
+                         time.perf_counter() - started)
+    except Exception:
+        # Thread latar: kegagalan kandidat tidak boleh mengganggu request utama
+        shadow_stats.count(model_option, "errors", len(primary_scores))
+    finally:
+        with _load_lock:
+            _shadow_pending -= 1
+
+def wait_shadow():
+    """Tunggu semua pekerjaan shadow yang sudah dikirim selesai (mis. sebelum membaca shadow_stats)."""
+    if _shadow_pool is not None:
+        _shadow_pool.submit(lambda: None).result()
+
+def classify_ensemble(judul, isi, weights=None):
+    """
+    Klasifikasi dengan kedua model sekaligus: TF-IDF dihitung sekali, lalu
+    XGBoost dan LightGBM dijalankan bersamaan.
+    - weights: bobot rata-rata (default ENSEMBLE_WEIGHTS)
+    Return: hasil ("HOAX"/"VALID"), scores (dict "XGBoost"/"LightGBM"/"Ensemble"
+            -> float), cleaned_text (str)
+    """
+    started = metrics.start()
+    models = active_models()
+    _use_word_filter(models)
+    normalized, source = _normalize_input(combine_input(judul, isi))
+
+    # Skor tiap model memakai entri result_cache yang sama dengan classify_text
+    scores = {}
+    cleaned = document = None
+    keys = {model_option: _result_key(normalized, model_option, models)
+            for model_option in MODEL_OPTIONS}
+    for model_option, key in keys.items():
+        cached = result_cache.get(key) if key else None
+        if cached is not None:
+            scores[model_option], cleaned, document = _cached_result(cached, source)
+
+    candidate, _ = _shadow_sample()
+    vectorized, shared = None, False
+    missing = [model_option for model_option in MODEL_OPTIONS if model_option not in scores]
+    if missing:
+        # Kandidat shadow menskor kedua model: kolom keduanya ikut diisi
+        tfidf, shared = _request_tfidf(models, candidate,
+                                       MODEL_OPTIONS if candidate is not None else missing)
+        if document is None:
+            cleaned, document = _clean_document(source, tfidf)
+        tfidf_started = metrics.start()
+        vectorized = tfidf.transform([document])
+        metrics.stop("tfidf", tfidf_started)
+        predicted = _predict_parallel({model_option: vectorized for model_option in missing},
+                                      models)
+        for model_option, pred_prob in predicted.items():
+            scores[model_option] = float(pred_prob[0])
+            if keys[model_option]:
+                result_cache.set(keys[model_option], (scores[model_option], cleaned))
+
+    scores[ENSEMBLE] = float(combine_scores(scores, weights))
+    hasil = "HOAX" if scores[ENSEMBLE] > threshold else "VALID"
+    metrics.stop("classify", started, ENSEMBLE)
+    if candidate is not None and document is not None:
+        # Dibandingkan dengan bobot default, sama seperti skor kandidat
+        _submit_shadow(candidate, ENSEMBLE, [combine_scores(scores)],
+                       vectorized if shared else None, [document])
+    # Token cleaned_text baru digabung di sini (batas API publik)
+    return hasil, scores, " ".join(cleaned)
+
 def classify_text(judul, isi, model_option):
     """
     Fungsi klasifikasi berita hoax.
     - judul: str
     - isi: str
-    - model_option: "XGBoost" atau "LightGBM"
+    - model_option: "XGBoost", "LightGBM", atau "Ensemble" (skor gabungan,
+      skor per model: lihat classify_ensemble)
     Return: hasil ("HOAX"/"VALID"), score (float), cleaned_text (str)
+
+    Artikel yang melebihi MAX_TOKENS kata hanya diskor sampai MAX_TOKENS kata,
+    dan cleaned_text-nya hanya PREVIEW_WORDS kata pertama (lihat input_warning);
+    clean_text memberi hasil utuh. Di bawah batas, cleaned_text sama dengan clean_text.
     """
-    # Gabungkan input
-    if judul.strip() and isi.strip():
-        combined_text = f"{judul} {isi}"
-    elif judul.strip():
-        combined_text = judul
-        st.info("⚠️ Hanya Judul yang diinput. Hasil klasifikasi mungkin kurang akurat.\n\nUntuk memaksimalkan kerja aplikasi, dianjurkan untuk mengisi **Judul** dan **Isi Berita**")
-    else:
-        combined_text = isi
-        st.info("⚠️ Hanya Isi yang diinput. Hasil klasifikasi mungkin kurang akurat.\n\nUntuk memaksimalkan kerja aplikasi, dianjurkan untuk mengisi **Judul** dan **Isi Berita**")
-
-    # Preprocessing
-    cleaned = clean_text(combined_text)
-    vectorized = tfidf_vectorizer.transform([cleaned])
-
-    # Prediksi
-    if model_option == "XGBoost":
-        dmatrix = xgb.DMatrix(vectorized, enable_categorical=False)
-        pred_prob = xgb_model.predict(dmatrix, validate_features=False)
-        score = pred_prob[0]
+    if model_option == ENSEMBLE:
+        hasil, scores, cleaned = classify_ensemble(judul, isi)
+        return hasil, scores[ENSEMBLE], cleaned
+
+    started = metrics.start()
+    models = active_models()
+    _use_word_filter(models)
+    # Gabungkan input (peringatan input tidak lengkap: lihat input_warning)
+    combined_text = combine_input(judul, isi)
+    normalized, source = _normalize_input(combined_text)
+
+    # Artikel yang sama (beda spasi, tanda baca, URL) cukup dihitung sekali
+    key = _result_key(normalized, model_option, models)
+    cached = result_cache.get(key) if key else None
+    candidate, _ = _shadow_sample()
+    vectorized, shared = None, False
+    if cached is not None:
+        score, cleaned, document = _cached_result(cached, source)
     else:
-        pred_prob = lgbm_model.predict(vectorized, num_iteration=lgbm_model.best_iteration)
-        score = pred_prob[0]
+        # Preprocessing
+        tfidf, shared = _request_tfidf(models, candidate, (model_option,))
+        cleaned, document = _clean_document(source, tfidf)
+        tfidf_started = metrics.start()
+        vectorized = tfidf.transform([document])
+        metrics.stop("tfidf", tfidf_started)
+
+        # Prediksi
+        pred_prob = _predict_scores(vectorized, model_option, models)
+        score = float(pred_prob[0])
+        if key:
+            result_cache.set(key, (score, cleaned))
 
     pred_label = 1 if score > threshold else 0
     hasil = "HOAX" if pred_label == 1 else "VALID"
 
-    return hasil, score, cleaned
+    metrics.stop("classify", started, model_option)
+    if candidate is not None and document is not None:
+        _submit_shadow(candidate, model_option, [score], vectorized if shared else None, [document])
+    return hasil, score, " ".join(cleaned)
+
+def classify_many(records, chunk_size=BATCH_CHUNK_SIZE, workers=1):
+    """
+    Klasifikasi banyak berita sekaligus.
+    - records: iterable berisi tuple (judul, isi, model_option)
+    - chunk_size: jumlah artikel yang divektorisasi & diprediksi per chunk
+    - workers: jumlah proses untuk preprocessing (lihat clean_texts)
+    Return: labels (np.ndarray "HOAX"/"VALID"), scores (np.ndarray float64)
+
+    Hasil per baris identik dengan classify_text. Setiap chunk divektorisasi
+    sebagai satu matriks sparse, lalu tiap model dipanggil sekali per chunk.
+    """
+    scores = [chunk_scores for _, chunk_scores in
+              classify_stream(records, chunk_size=chunk_size, workers=workers)]
+    scores = np.concatenate(scores) if scores else np.empty(0, dtype=np.float64)
+    labels = np.where(scores > threshold, "HOAX", "VALID")
+    return labels, scores
+
+def classify_stream(records, chunk_size=BATCH_CHUNK_SIZE, workers=1):
+    """
+    Seperti classify_many, tetapi hasil dikeluarkan per chunk sehingga
+    input sebesar apa pun diproses dengan memori terbatas.
+    Return: generator (labels, scores) per chunk, sesuai urutan records
+
+    Seluruh stream memakai versi model yang aktif saat dimulai.
+    """
+    models = active_models()
+    _use_word_filter(models)
+    records, texts = tee(records)
+    cleaned = clean_texts((combine_input(judul, isi) for judul, isi, _ in texts),
+                          workers=workers, score=True)
+
+    chunk = []
+    for (_, _, model_option), tokens in zip(records, cleaned):
+        chunk.append((tokens, model_option))
+        if len(chunk) >= chunk_size:
+            yield _chunk_result(chunk, models)
+            chunk = []
+    if chunk:
+        yield _chunk_result(chunk, models)
+
+def _chunk_result(chunk, models):
+    scores = _score_chunk(chunk, models)
+    return np.where(scores > threshold, "HOAX", "VALID"), scores
+
+def classify_batch(records):
+    """
+    Seperti classify_text untuk beberapa berita sekaligus (satu chunk).
+    - records: list tuple (judul, isi, model_option)
+    Return: list tuple (hasil, score, cleaned_text str)
+
+    Artikel yang ada di result_cache tidak diproses ulang.
+    """
+    models = active_models()
+    _use_word_filter(models)
+    inputs = [_normalize_input(combine_input(judul, isi)) for judul, isi, _ in records]
+    keys = [_result_key(normalized, model_option, models)
+            for (normalized, _), (_, _, model_option) in zip(inputs, records)]
+    results = [None] * len(records)
+    for i, ((_, source), key) in enumerate(zip(inputs, keys)):
+        cached = result_cache.get(key) if key else None
+        if cached is not None:
+            results[i] = _cached_result(cached, source)[:2]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        # Hitung fitur artikel panjang dengan analyzer yang sama dengan _score_chunk
+        tfidf = models.fast_tfidf()
+        prepared = [_clean_document(inputs[i][1], tfidf) for i in missing]
+        scores = _score_chunk([(document, records[i][2])
+                               for (_, document), i in zip(prepared, missing)], models)
+        for i, (text, _), score in zip(missing, prepared, scores):
+            results[i] = (float(score), text)
+            if keys[i]:
+                result_cache.set(keys[i], (results[i][0], text))
+
+    return [("HOAX" if score > threshold else "VALID", score, " ".join(text))
+            for score, text in results]
+
+def _score_chunk(chunk, models=None):
+    if not chunk:
+        return np.empty(0, dtype=np.float64)
+    models = models or active_models()
+    options = np.array([model_option for _, model_option in chunk])
+    is_ensemble = options == ENSEMBLE
+    # Baris Ensemble butuh skor kedua model
+    base_options = set(options[~is_ensemble].tolist())
+    if is_ensemble.any():
+        base_options.update(MODEL_OPTIONS)
+    candidate, sampled = _shadow_sample(len(chunk))
+    started = metrics.start()
+    tfidf, shared = _request_tfidf(models, candidate, base_options)
+    vectorized = tfidf.transform([text for text, _ in chunk])
+    metrics.stop("tfidf", started)
+
+    rows = {model_option: np.flatnonzero((options == model_option) | is_ensemble)
+            for model_option in sorted(base_options)}
+    predicted = _predict_parallel({model_option: vectorized[model_rows]
+                                   for model_option, model_rows in rows.items()}, models)
+    scores = np.empty(len(chunk), dtype=np.float64)
+    model_scores = {}
+    for model_option, model_rows in rows.items():
+        model_scores[model_option] = np.empty(len(chunk), dtype=np.float64)
+        model_scores[model_option][model_rows] = predicted[model_option]
+        own_rows = options == model_option
+        scores[own_rows] = model_scores[model_option][own_rows]
+    if is_ensemble.any():
+        scores[is_ensemble] = combine_scores({model_option: model_scores[model_option][is_ensemble]
+                                              for model_option in MODEL_OPTIONS})
+    if candidate is not None:
+        for model_option in set(options[sampled].tolist()):
+            shadow_rows = sampled[options[sampled] == model_option]
+            _submit_shadow(candidate, model_option, scores[shadow_rows],
+                           vectorized[shadow_rows] if shared else None,
+                           [chunk[i][0] for i in shadow_rows])
+    return scores
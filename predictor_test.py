@@ -6,11 +6,27 @@ warnings.filterwarnings("ignore", message="missing ScriptRunContext!")
 import logging
 logging.getLogger('streamlit').setLevel(logging.CRITICAL)
 
+import os
+import sys
+import time
+import shutil
+import subprocess
 import pytest
-from predictor import classify_text
-from utils.preprocessing import clean_text
+import numpy as np
+from predictor import classify_text, classify_many
+import predictor
+from utils import preprocessing
+from utils.preprocessing import clean_text, normalize_text
 import joblib
 import xgboost as xgb
+from utils.fast_tfidf import FastTfidf
+from utils.tree_engine import TreeEnsemble
+from utils.result_cache import ResultCache
+from utils.bundle import export_models, read_bundle
+from utils.model_registry import ModelRegistry, file_sha256
+from utils.shadow import ShadowStats
+from utils import threads
+from test_data import test_data
 
 # Load ulang model & vectorizer seperti di predictor.py
 xgb_model = xgb.Booster()
@@ -85,106 +101,6 @@ def test_clean_text_function():
     assert len(cleaned) > 0
 
 # === TEST BATCH DENGAN DATA ===
-test_data = [
-    # Hoaks
-    ("AFC Melarang Indonesia Menaturalisasi Warga Negara Belanda", """🚨BREAKING NEWS‼️ PSSI/timnas Indonesia dilarang menaturalisasi warga negara Belanda setelah protes keras dari AFC di kantor pusat Kuala lumpur Malaysia pada 31 Maret lalu😱. Keputusan ini telah disepakati oleh anggota AFC khusus nya Bahrain dan Malaysia yg mengajukan protes atas dasar menjaga integritas kompetisi internasional yg mengedepan kan peningkatan kompetisi liga domestik di negara masing-masing🥶. Pihak PSSI belum memberikan pernyataan resmi terkait hal ini,Pasca keputusan telah di buat .tulis (Fabrizio Romano). Bagaimana pendapat kalian geng Jika ini terjadi ⁉️""", 1),
-
-    ("Kerusuhan Mei 1998 Tidak Spesifik Menyerang Etnis Tionghoa", """Kerusuhan Mei 1998 korban utamanya adalah 99% pribumi. Tidak ada korban spesifik etnis Tionghoa yg dapat ditelusuri otentisitas forensiknya. Jika ada pihak terus menerus framing menghubungkan rusuh Mei 98 sbg kekuatan rekayasa yg dikatakan untuk menargetkan (anti) etnis tertentu, ini penghinaan kpd otoritas kepolisian (yg telah anulir asumsi liar SARA tersebut) dan kedaulatan NKRI. Itu sebabnya akun2 yg tebar ginian biasa anonim.""", 1),
-
-    ("Tanah Tanpa Sertifikat Elektronik Bakal Jadi Milik Negara", """…Setelah pengaturan penyaluran GAS ELPIJI ukuran 3 kilogram yang membuat panik emak-emak, kini giliran pengaturan SERTIFIKAT TANAH yang akan membuat rempong kaum bapak-bapak.
-Sesuai informasi yang terlanjur sudah meluas di media sosial itu, SERTIFIKAT TANAH versi kertas seperti berlaku selama ini, akan diganti oleh pemerintah dengan sertifikat versi digital, atau sertifikat tanah elektronik mulai tahun 2026. 
-Bagi yang tidak mengganti SERTIFIKAT TANAH-nya menjadi sertifikat elektronik yang dimulai berlaku Februari 2025 ini, maka surat tanah yang masih kertas (rinci, letter C) akan dimusnahkan pemerintah. Resikonya tanah yang semula milik masyarakat, akan diambilalih kepemilikannya oleh negara…""", 1),
-
-    ("Warga China Tendang Wajah Anak di Pulau Rempang", """Kejadian ini di Tanah Rempang yg tanah nya di Rampas Oleh Oligarki di lindungi Rezim Jokowi. di Rempang..anak SMP Pulang dri Skolah Mempertahankan Rumah nya yg akan di Robohkan paksa Oleh Cina..dia tdk mau pergi lalu di seret ke luar di hajar Oleh Warga Cina yg sdh di buatkan KTP Non Pribumi…!
-Bagaimana Jk itu terjadi pd anak Cucu kt yg akan dtg..itu blm seberapa Cina Menghajarnya Tp bsk klo sdh Menguasai Indonesia akan lebih Kejam lagi. Bagai mana Jk itu terjadi korban nya anak Cucumu Yg tdk tau apa2..
-Wahai Para Pemuja2 Jokowi..para Anthek2 Jokowi para Penjilat2. Hidup mu di akirat sdh Ikut tanggung Jawap Pemimpin yg kau Pilih di Siksa di Neraka..anak Cucumu di Perlakukan Sperti itu Oleh asing Cina Penjajah Ibu Pertiwi?""", 1),
-
-    ("Perdana Menteri Israel Ancam Presiden Prabowo", """Tuan Presiden (Prabowo) situasi di wilayah konflik sebagai “ancaman besar” bagi siapa pun yang berani meninjaunya, termasuk Prabowo. Saya menyarankan untuk tidak terlalu dalam mendukung palestina sebab ini menyangkut keselamatan semua pihak.” “✍🏾 PM Israel 🇮🇱 Benyamin Netanyahu peringatkan negara siapapun, termasuk Indonesia 🇮🇩: “Kepada Mr. Presiden Prabowo JANGAN TERLALU IKUT CAMPUR, PENTINGKAN KESELAMATAN ANDA, NEGARA ANDA, DARI PADA SIBUK BANTU TERORIS” Syaratnya ialah… TERORIS HAMAS BEBASKAN SANDERA.""", 1),
-
-    # Valid
-    ("Menteri RI Pilih Hidup Miskin, Tak Korupsi Meski Garap Proyek Raksasa", """Memiliki jabatan tinggi kerap dikaitkan dengan hidup mewah dan harta yang banyak. Namun, salah satu Menteri di era masa pemerintahan Soekarno dan Soeharto ini memilih jalan hidup berbeda.
-Adalah Sutami, pria yang menjavat sebagai Menteri Pekerjaan Umum dan Perumahan Rakyat (PUPR) sejak 1964 hingga 1978. Keteladanan Sutami diperoleh dari gaya hidupnya yang berbeda dari para menteri lain. Selama 14 tahun menjadi menteri atau 8 periode, dia konsisten menolak pemberian negara dan memilih hidup miskin. Penyebabnya karena masih banyak rakyat hidup sengsara, sehingga tak patut menunjukkan hidup mewah. Staf Ahli Sutami, Hendropranoto, dalam kesaksian berjudul "Sutami Sosok Manusia Pembangunan Indonesia" (1991) menceritakan, salah satu sikap itu tercermin pada kebiasaan berjalan kaki ketika di mengunjungi suatu wilayah, khususnya perdesaan dan pelosok wilayah.
-
-Dia rela berjalan kaki berkilo-kilo karena tak ingin merepotkan orang. Terlebih, jalan kaki juga dipilih karena lebih efisien dan mudah saat meninjau berbagai proyek infrastruktur.
-
-Dengan melakukan ini Sutami bisa mengetahui implementasi dari pengerjaan proyek di bawah naungannya. Selain itu, jika ada permasalahan pun, bisa cepat diselesaikan.
-
-Baginya, pembangunan infrastruktur di pedesaan dan pelosok wilayah lebih bermanfaat bagi rakyat kecil, alih-alih difokuskan untuk kepentingan industri dan pengusaha.
-
-Dalam pewartaan Tempo (22/11/1980), tutur kata dan keseharian Sutami juga kental dengan kerendahan hati. Sebagai intelektual dan profesional di bidangnya, pria kelahiran 19 Oktober 1928 ini dikenal sederhana dan sangat merakyat.
-
-Meski berkecimpung di "lahan basah", Sutami sama sekali tak mengambil uang negara. Bahkan, rumah pribadi saja tak punya. Dia baru memiliki rumah setelah berhenti menjadi menteri pada 29 Maret 1978 karena sakit. Itu pun pembelian rumah dilakukan lewat cicilan per bulan.
-
-Atas dasar ini, dia dijuluki banyak orang sebagai "Menteri Termiskin". Dia pun tak mempermasalahkan julukan itu.
-
-Setelah pensiun, diketahui Sutami hidup jauh dari kemewahan. Rumah yang masih nyicil itu pernah diputus listriknya karena Sutami tak bisa membayar tagihan. Lalu, ketika sakit pun, Sutami enggan ke rumah sakit karena takut tidak bisa membayar tagihan rumah sakit.
-
-Diketahui, Sutami mengidap penyakit liver kronis. Penyakit liver tersebut diketahui karena dia semasa hidup kurang makanan bergizi dan kelelahan akibat sering berpergian jalan kaki. Kabar tragis ini kemudian didengar Presiden Soeharto yang kemudian segera meminta Sutami berobat tanpa perlu membayar. Namun, Sutami akhirnya kalah dari penyakitnya. Pada 13 November 1980, dia meninggal dunia.
-
-Meski sudah tiada, karya-karya Sutami yang jauh dari sensasi semasa menjabat banyak dirasakan masyarakat manfaatnya hingga saat ini. Sederet megaproyek yang terbangun olehnya diantaranya tol Jagorawi, Jembatan Semanggi, Jembatan Ampera dan sebagainya.""",0),
-
-
-
-
-    ("Sri Mulyani 'Senggol' Bahlil Lifting Minyak RI Belum Capai Target", """Menteri Keuangan Sri Mulyani 'menyenggol' Menteri ESDM Bahlil Lahadalia karena lifting minyak Indonesia belum mencapai target 605 barel per hari pada 2025.
-"Lifting minyak kita di 567 ribu barel per hari, di bawah asumsi APBN (2025), yaitu 605 ribu barel per hari," ungkapnya dalam Konferensi Pers APBN KiTA di Kementerian Keuangan, Jakarta Pusat, Selasa (17/6).
-"Kita harapkan nanti dari Menteri ESDM (Bahlil Lahadalia) dan SKK (Satuan Kerja Khusus Pelaksana Kegiatan Usaha Hulu Minyak dan Gas Bumi) akan menyampaikan, moga-moga lifting minyak bisa naik menembus di atas 600 lagi (barel per hari)," sambung Sri Mulyani.
-Angka lifting minyak yang disampaikan Bendahara Negara itu merupakan realisasi per Mei 2025. Jumlahnya memang masih di bawah target yang ditetapkan dalam APBN 2025.
-Capaian lifting minyak pada tahun lalu sebesar 579,7 barel per hari juga tak mencapai target yang dipatok, yakni 635 barel per hari.
-Di lain sisi, ia menyoroti harga minyak dunia yang masih bergejolak. Ini diperparah dengan adanya perang di Timur Tengah antara Israel dengan Iran.
-Ia menyebut asumsi harga minyak di APBN 2025 adalah US$82 per barel. Sedangkan pada end of period (eop) berada di posisi US$62,75 dan mencapai US$70,05 secara year to date (ytd), yakni masih di bawah harga asumsi.
-"Lifting gas (realisasi per Mei 2025) di 987,5 ribu barel setara minyak per hari, di bawah asumsi kita 1.005 ribu barel setara minyak per hari. Ini adalah sesuatu yang juga harus kita lihat," wanti-wanti sang Bendahara Negara.
-"Selain dipengaruhi oleh kondisi di dalam negeri kita, terutama untuk sektor pertambangan minyak, juga dipengaruhi oleh apa yang sekarang sedang berlangsung di Timur Tengah, yaitu perang antara Israel dengan Iran," tandasnya.
-""", 0),
-
-
-
-
-    ("Israel Klaim Bunuh Kepala Staf Perang Angkatan Bersenjata Iran Ali Shadmani", """Militer Israel mengklaim telah membunuh Kepala Staf Angkatan Bersenjata Iran Ali Shadmani, Selasa (17/6/2025). Shadmani baru diangkat menggantikan Gholam Ali Rashid yang juga terbunuh akibat  serangan Israel.
-
-Pasukan Pertahanan Israel (IDF) mengklaim Shadmani terbunuh dalam serangan di Ibu Kota Teheran pada Selasa dini hari. Setelah menerima informasi intelijen akurat dari Direktorat Intelijen IDF pada Selasa, IAF (Angkatan Udara Israel) menyerang pusat komando yang dikelola staf di jantung Kota Teheran dan membunuh Ali Shadmani, kepala staf perang," bunyi pernyataan IDF, seperti dilaporkan kembali Anadolu.
-
-Disebutkan Shadmani sebelumnya sempat memimpin Korps Garda Revolusi Islam (IRGC) dan unit militer Iran. Sejauh ini belum ada pernyataan dari pemerintah maupun militer Iran mengenai klaim Israel tersebut. Namun biasanya Iran segera menginformasikan jika ada pejabatnya yang tewas akibat serangan Israel.
-
-Pemimpin Tertinggi Iran Ayatollah Ali Khamenei sebelumnya menunjuk Shadmani untuk menggantikan Rashid yang tewas akibat serangan udara Israel pada Jumat pekan lalu.""",0),
-
-
-    ("Menkomdigi Wanti-wanti Dominasi Netflix Cs di RI, Bakal Lakukan Ini", """ Menteri Komunikasi dan Digital (Menkomdigi) Meutya Hafid menyebut dominasi layanan over-the-top (OTT) global, seperti Netflix Cs, tak boleh merugikan ekosistem penyiaran nasional yang selama ini berkontribusi terhadap informasi publik.
-Dalam audiensi dengan asosiasi industri media Asia Pasifik, ia meminta agar pelaku OTT turut berperan dalam mendukung konten dan talenta lokal. Menurutnya langkah ini penting untuk menjaga kedaulatan digital di Tanah Air.
-
-Dalam pertemuan dengan Presiden MPA Asia Pasifik, Meutya meminta OTT lebih aktif mendukung produksi lokal dan membiayai ekosistem penyiaran sebagai bagian dari kedaulatan digital Indonesia.
-
-"Kami juga ingin Anda memberdayakan industri penyiaran," kata Meutya saat audiensi dengan Presiden dan Managing Director MPA untuk Asia Pasifik Mila Venugopalan di Kantor Komdigi, Jakarta, dalam keterangan resminya, Kamis (12/6).
-
-Meutya mengatakan industri penyiaran masih memainkan peran penting dalam menjangkau masyarakat di seluruh pelosok Indonesia, terutama di wilayah-wilayah yang belum terjangkau koneksi internet.
-
-Namun begitu, menurutnya industri ini menghadapi tantangan berat, karena beban investasi dan biaya operasional yang tinggi, sementara tren masyarakat bergeser ke konten digital melalui OTT.
-
-"Prinsip dasarnya adalah bahwa harus ada kondisi yang setara antara industri penyiaran dengan platform OTT," ujar dia.
-
-Presiden dan Managing Director MPA untuk Asia Pasifik Mila Venugopalan merespons positif dan menawarkan berbagi praktik terbaik dari berbagai negara, termasuk Australia, di mana penyiar lokal justru mendorong deregulasi dan efisiensi alih-alih memberatkan OTT.
-
-"Termasuk film dan acara televisi yang diproduksi di negara Anda-yang dikonsumsi oleh lebih dari 200 juta pengguna internet di Indonesia, yang merupakan populasi internet terbesar keempat di dunia," ujarnya.
-
-MPA menyatakan komitmen untuk berinvestasi dalam bakat lokal dan cerita Indonesia. Mereka juga menyampaikan apresiasi atas langkah pemerintah dalam memblokir situs-situs pembajakan, sebagai upaya perlindungan konten digital yang berkembang pesat di era internet.
-
-"Kami sangat menghargai kolaborasi yang terus dilakukan oleh Kementerian Komunikasi dan Digital dalam membantu mempromosikan dan melindungi konten digital," ungkapnya.""",0),
-
-
-
-    ("Menteri RI Pilih Hidup Miskin, Tak Korupsi Meski Garap Proyek Raksasa", """Memiliki jabatan tinggi kerap dikaitkan dengan hidup mewah dan harta yang banyak. Namun, salah satu Menteri di era masa pemerintahan Soekarno dan Soeharto ini memilih jalan hidup berbeda.
-Adalah Sutami, pria yang menjavat sebagai Menteri Pekerjaan Umum dan Perumahan Rakyat (PUPR) sejak 1964 hingga 1978. Keteladanan Sutami diperoleh dari gaya hidupnya yang berbeda dari para menteri lain. Selama 14 tahun menjadi menteri atau 8 periode, dia konsisten menolak pemberian negara dan memilih hidup miskin. Penyebabnya karena masih banyak rakyat hidup sengsara, sehingga tak patut menunjukkan hidup mewah. Staf Ahli Sutami, Hendropranoto, dalam kesaksian berjudul "Sutami Sosok Manusia Pembangunan Indonesia" (1991) menceritakan, salah satu sikap itu tercermin pada kebiasaan berjalan kaki ketika di mengunjungi suatu wilayah, khususnya perdesaan dan pelosok wilayah.
-Dia rela berjalan kaki berkilo-kilo karena tak ingin merepotkan orang. Terlebih, jalan kaki juga dipilih karena lebih efisien dan mudah saat meninjau berbagai proyek infrastruktur.
-Dengan melakukan ini Sutami bisa mengetahui implementasi dari pengerjaan proyek di bawah naungannya. Selain itu, jika ada permasalahan pun, bisa cepat diselesaikan.
-Baginya, pembangunan infrastruktur di pedesaan dan pelosok wilayah lebih bermanfaat bagi rakyat kecil, alih-alih difokuskan untuk kepentingan industri dan pengusaha.
-Dalam pewartaan Tempo (22/11/1980), tutur kata dan keseharian Sutami juga kental dengan kerendahan hati. Sebagai intelektual dan profesional di bidangnya, pria kelahiran 19 Oktober 1928 ini dikenal sederhana dan sangat merakyat.
-Meski berkecimpung di "lahan basah", Sutami sama sekali tak mengambil uang negara. Bahkan, rumah pribadi saja tak punya. Dia baru memiliki rumah setelah berhenti menjadi menteri pada 29 Maret 1978 karena sakit. Itu pun pembelian rumah dilakukan lewat cicilan per bulan.
-Atas dasar ini, dia dijuluki banyak orang sebagai "Menteri Termiskin". Dia pun tak mempermasalahkan julukan itu.
-Setelah pensiun, diketahui Sutami hidup jauh dari kemewahan. Rumah yang masih nyicil itu pernah diputus listriknya karena Sutami tak bisa membayar tagihan. Lalu, ketika sakit pun, Sutami enggan ke rumah sakit karena takut tidak bisa membayar tagihan rumah sakit.
-Diketahui, Sutami mengidap penyakit liver kronis. Penyakit liver tersebut diketahui karena dia semasa hidup kurang makanan bergizi dan kelelahan akibat sering berpergian jalan kaki. Kabar tragis ini kemudian didengar Presiden Soeharto yang kemudian segera meminta Sutami berobat tanpa perlu membayar. Namun, Sutami akhirnya kalah dari penyakitnya. Pada 13 November 1980, dia meninggal dunia.
-Meski sudah tiada, karya-karya Sutami yang jauh dari sensasi semasa menjabat banyak dirasakan masyarakat manfaatnya hingga saat ini. Sederet megaproyek yang terbangun olehnya diantaranya tol Jagorawi, Jembatan Semanggi, Jembatan Ampera dan sebagainya.""", 0)
-]
-
 def test_title_only_batch():
     correct = 0
     total = len(test_data)
@@ -226,3 +142,381 @@ def test_combined_input_batch():
             correct += 1
     print(f"[COMBINED INPUT] Correct: {correct}/{total}")
     assert correct >= 2
+
+
+# === TEST classify_many ===
+def test_classify_many_matches_classify_text():
+    records = []
+    for title, body, _ in test_data:
+        records += [(title, body, "XGBoost"), (title, "", "LightGBM"), ("", body, "LightGBM")]
+    labels, scores = classify_many(records, chunk_size=4)
+    print(f"\n[BATCH] {len(records)} records => {list(labels)}")
+    assert len(labels) == len(scores) == len(records)
+    for (judul, isi, model_option), label, score in zip(records, labels, scores):
+        hasil, expected, _ = classify_text(judul, isi, model_option)
+        assert label == hasil
+        assert score == expected
+
+def test_classify_many_with_workers():
+    records = [(title, body, "XGBoost") for title, body, _ in test_data]
+    labels, scores = classify_many(records)
+    pooled_labels, pooled_scores = classify_many(records, chunk_size=3, workers=2)
+    assert list(pooled_labels) == list(labels)
+    assert (pooled_scores == scores).all()
+
+# === TEST FastTfidf ===
+def test_fast_tfidf_matches_sklearn(tmp_path):
+    docs = [clean_text(f"{title} {body}") for title, body, _ in test_data]
+    docs += [clean_text(title) for title, _, _ in test_data] + ["", "a", "berita hoax"]
+    expected = tfidf_vectorizer.transform(docs)
+
+    fast = FastTfidf.from_sklearn(tfidf_vectorizer)
+    path = tmp_path / "tfidf_fast.npz"
+    fast.save(path)
+    for vectorizer in (fast, FastTfidf.load(path)):
+        result = vectorizer.transform(docs)
+        assert result.shape == expected.shape
+        assert (result.indptr == expected.indptr).all()
+        assert (result.indices == expected.indices).all()
+        assert (result.data == expected.data).all()
+
+# === TEST TreeEnsemble ===
+def test_tree_engine_matches_boosters(tmp_path):
+    docs = [clean_text(f"{title} {body}") for title, body, _ in test_data]
+    docs += [clean_text(title) for title, _, _ in test_data] + [""]
+    vec = tfidf_vectorizer.transform(docs)
+    expected = {
+        "xgb": xgb_model.predict(xgb.DMatrix(vec), validate_features=False),
+        "lgbm": lgbm_model.predict(vec, num_iteration=lgbm_model.best_iteration),
+    }
+    engines = {
+        "xgb": TreeEnsemble.from_xgboost_json("models/xgb_model2.json"),
+        "lgbm": TreeEnsemble.from_lightgbm(lgbm_model),
+    }
+    for name, engine in engines.items():
+        engine.save(tmp_path / f"{name}.npz")
+        for trees in (engine, TreeEnsemble.load(tmp_path / f"{name}.npz")):
+            scores = trees.predict(vec)
+            print(f"\n[TreeEnsemble {name}] max diff: {abs(scores - expected[name]).max():.2e}")
+            assert abs(scores - expected[name]).max() < 1e-6
+            # Per baris (termasuk baris kosong) sama dengan batch
+            assert abs(trees.predict(vec[:1])[0] - scores[0]) < 1e-12
+            assert abs(trees.predict(vec[-1:])[0] - scores[-1]) < 1e-12
+
+# === TEST pruning fitur TF-IDF ===
+def test_pruned_tfidf_keeps_scores():
+    docs = [clean_text(f"{title} {body}") for title, body, _ in test_data] + [""]
+    full = predictor.fast_tfidf.transform(docs)
+    pruned = predictor.pruned_tfidf.transform(docs)
+    print(f"\n[PRUNING] {len(predictor.model_features)} kolom dipakai split, "
+          f"nnz {full.nnz} -> {pruned.nnz}")
+    assert pruned.shape == full.shape
+    assert pruned.nnz < full.nnz
+    assert (pruned != full.multiply(pruned != 0)).nnz == 0
+    for model_option in ("XGBoost", "LightGBM"):
+        assert (predictor._predict_scores(pruned, model_option)
+                == predictor._predict_scores(full, model_option)).all()
+
+# === TEST inplace_predict XGBoost ===
+def test_xgb_inplace_predict_matches_dmatrix(monkeypatch):
+    docs = [clean_text(f"{title} {body}") for title, body, _ in test_data] + [""]
+    vec = predictor.pruned_tfidf.transform(docs)
+    expected = xgb_model.predict(xgb.DMatrix(vec), validate_features=False)
+    assert (predictor._xgb_inplace_predict(vec) == expected).all()
+    assert (predictor._xgb_inplace_predict(vec[:1]) == expected[:1]).all()
+    assert (predictor._predict_scores(vec, "XGBoost") == expected).all()
+    assert predictor._xgb_inplace is True
+    # Error XGBoost saat prediksi diteruskan dan tidak mematikan jalur cepat
+    with pytest.raises(xgb.core.XGBoostError):
+        predictor._xgb_inplace_predict(vec[:, :5])
+    assert predictor._xgb_inplace is True
+    # Jalur DMatrix (fallback) memberi skor yang sama
+    monkeypatch.setattr(predictor, "XGB_INPLACE_PREDICT", False)
+    assert predictor._xgb_inplace_predict(vec) is None
+    assert (predictor._predict_scores(vec, "XGBoost") == expected).all()
+
+# === TEST lazy loading ===
+def test_import_predictor_is_lazy():
+    # Import saja tidak memuat model maupun library berat
+    code = ("import sys, predictor; "
+            "sys.exit(any(m in sys.modules for m in "
+            "('xgboost', 'lightgbm', 'sklearn', 'Sastrawi', 'streamlit')))")
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+def test_lazy_load_only_selected_model():
+    # Hanya model yang dipilih yang dimuat
+    code = ("import sys, predictor; predictor.classify_text('Judul', 'Isi', 'LightGBM'); "
+            "sys.exit('xgboost' in sys.modules)")
+    env = dict(os.environ, HOAXCHECK_BACKEND="booster")
+    assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
+
+# === TEST filter kata tak terjangkau ===
+def test_word_filter_keeps_feature_vectors(monkeypatch):
+    from utils import preprocessing
+    from utils.preprocessing import StemCache
+    texts = [f"{title} {body}" for title, body, _ in test_data[:4]] + [
+        "Jokowi wkwk gemetar memperjuangkan kesejahteraan, pelajaran mempertanyakannya"]
+    expected_cleaned = [clean_text(text) for text in texts]
+    expected = predictor.fast_tfidf.transform(expected_cleaned)
+
+    # Kata yang ditolak filter memang tidak punya stem di vocabulary
+    word_filter = predictor.get_word_filter()
+    for word, stem in list(preprocessing.stem_cache._data.items()):
+        assert word_filter(word) or stem not in word_filter.words, word
+
+    monkeypatch.setattr(preprocessing, "word_filter", None)
+    monkeypatch.setattr(preprocessing, "stem_cache", StemCache(None))
+    preprocessing.set_word_filter(word_filter)
+    cleaned = [clean_text(text) for text in texts]
+    assert cleaned != expected_cleaned
+    assert (predictor.fast_tfidf.transform(cleaned) != expected).nnz == 0
+
+# === TEST thread inferensi ===
+def test_inference_threads_limit_boosters():
+    code = ("import sys, json, warnings, predictor; warnings.filterwarnings('ignore'); "
+            "predictor.classify_text('Judul', 'Isi', 'XGBoost'); "
+            "predictor.classify_text('Judul', 'Isi', 'LightGBM'); "
+            "from threadpoolctl import threadpool_info; "
+            "config = json.loads(predictor.get_xgb_model().save_config()); "
+            "sys.exit(config['learner']['generic_param']['nthread'] != '2' or "
+            "any(info['num_threads'] != 2 for info in threadpool_info() "
+            "if info['user_api'] == 'openmp'))")
+    env = dict(os.environ, HOAXCHECK_BACKEND="booster", HOAXCHECK_THREADS="2")
+    assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
+
+def test_worker_cpus_blocks():
+    cpus = [0, 1, 2, 3]
+    assert [threads.worker_cpus(i, 2, cpus) for i in range(3)] == [[0, 1], [2, 3], [0, 1]]
+    assert threads.worker_cpus(5, 1, cpus) == [1]
+    assert threads.worker_cpus(0, 8, cpus) == cpus
+    # 0 thread (default library): bagian rata CPU, bukan satu CPU per worker
+    assert [threads.worker_cpus(i, 0, cpus, workers=2) for i in range(2)] == [[0, 1], [2, 3]]
+    assert threads.worker_cpus(0, 0, cpus) == cpus
+    assert threads.worker_cpus(2, 0, cpus, workers=8) == [2]
+    assert threads.default_threads(3, cpus) == 1 and threads.default_threads(2, cpus) == 2
+
+# === TEST result cache ===
+def test_result_cache_lru_and_ttl(monkeypatch):
+    cache = ResultCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # "b" paling lama tidak dipakai
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    start = time.time()
+    monkeypatch.setattr(time, "time", lambda: start + 11)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 2 and len(cache) == 1
+
+def test_result_cache_shared_on_disk(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    writer = ResultCache(maxsize=10, ttl=None, path=path)
+    writer.set("key", [0.25, "teks bersih"])
+    reader = ResultCache(maxsize=10, ttl=None, path=path)
+    assert reader.get("key") == [0.25, "teks bersih"]
+    assert reader.get("key") == [0.25, "teks bersih"]
+    assert reader.stats()["disk_hits"] == 1 and reader.stats()["hits"] == 1
+    reader.clear()
+    assert ResultCache(maxsize=10, path=path).get("key") is None
+
+def test_classify_text_uses_result_cache():
+    predictor.result_cache.clear()
+    judul, isi, _ = test_data[0]
+    first = classify_text(judul, isi, "XGBoost")
+    # Beda spasi, tanda baca, dan URL: artikel yang sama
+    variant = classify_text(f"  {judul}!!", f"{isi}\n\nhttps://t.co/abc", "XGBoost")
+    assert variant == first
+    assert predictor.result_cache.stats()["hits"] == 1
+    # Model lain tidak memakai hasil XGBoost
+    classify_text(judul, isi, "LightGBM")
+    assert predictor.result_cache.stats()["misses"] == 2
+    assert predictor.classify_batch([(judul, isi, "XGBoost"), ("", "berita baru", "LightGBM")])[0] == first
+
+# === TEST bundle mmap ===
+def test_model_bundle_matches_sources(tmp_path):
+    path = str(tmp_path / "hoaxcheck.bundle")
+    export_models(path)
+    bundle = read_bundle(path)
+    fast = FastTfidf.from_arrays(*bundle["tfidf"])
+    # Array dibaca langsung dari mmap (tanpa salinan, read-only)
+    assert not fast.idf.flags.owndata and not fast.idf.flags.writeable
+
+    docs = [clean_text(f"{title} {body}") for title, body, _ in test_data] + ["", "a"]
+    docs.append(" ".join(tfidf_vectorizer.get_feature_names_out()[::7]))
+    expected = tfidf_vectorizer.transform(docs)
+    vec = fast.transform(docs)
+    assert (vec != expected).nnz == 0
+    assert (fast.prune([0, 5, 100]).transform(docs) != expected.multiply(
+        np.isin(np.arange(expected.shape[1]), [0, 5, 100]))).nnz == 0
+
+    engines = {"XGBoost": TreeEnsemble.from_xgboost_json("models/xgb_model2.json"),
+               "LightGBM": TreeEnsemble.from_lightgbm(lgbm_model)}
+    for name, engine in engines.items():
+        trees = TreeEnsemble.from_arrays(*bundle[name])
+        assert (trees.predict(vec) == engine.predict(vec)).all()
+
+    # Bundle sisa model / vectorizer lain ditolak
+    assert read_bundle(path, {"XGBoost": file_sha256("models/xgb_model2.json")})
+    with pytest.raises(ValueError):
+        read_bundle(path, {"XGBoost": "0" * 64})
+    stale = predictor.ModelSet(bundle_path=path, checksums={predictor.LGBM_MODEL_PATH: "0" * 64})
+    with pytest.raises(ValueError):
+        stale.fast_tfidf()
+
+def test_predictor_loads_bundle_without_pickle(tmp_path):
+    path = str(tmp_path / "hoaxcheck.bundle")
+    export_models(path)
+    judul, isi, _ = test_data[0]
+    code = ("import sys, predictor; "
+            f"_, score, _ = predictor.classify_text({judul!r}, {isi!r}, 'LightGBM'); "
+            "print(score, 'joblib' in sys.modules)")
+    env = dict(os.environ, HOAXCHECK_BUNDLE=path, HOAXCHECK_BACKEND="trees")
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            capture_output=True, text=True, check=True).stdout.split()
+    assert output[1] == "False"
+    _, expected, _ = classify_text(judul, isi, "LightGBM")
+    assert abs(float(output[0]) - expected) < 1e-6
+
+# === TEST Ensemble ===
+def test_ensemble_combines_both_models():
+    predictor.result_cache.clear()
+    for judul, isi, _ in test_data:
+        hasil, scores, cleaned = predictor.classify_ensemble(judul, isi)
+        expected = {model_option: classify_text(judul, isi, model_option)[1]
+                    for model_option in ("XGBoost", "LightGBM")}
+        print(f"\n[ENSEMBLE] {judul[:30]} => {hasil} {scores}")
+        assert scores["XGBoost"] == expected["XGBoost"]
+        assert scores["LightGBM"] == expected["LightGBM"]
+        assert scores["Ensemble"] == (expected["XGBoost"] + expected["LightGBM"]) / 2
+        assert classify_text(judul, isi, "Ensemble") == (hasil, scores["Ensemble"], cleaned)
+
+    # Bobot lain: hanya XGBoost
+    _, scores, _ = predictor.classify_ensemble(judul, isi, weights={"XGBoost": 1, "LightGBM": 0})
+    assert scores["Ensemble"] == scores["XGBoost"]
+
+def test_ensemble_in_batch_matches_classify_text():
+    records = [(judul, isi, option) for judul, isi, _ in test_data
+               for option in ("Ensemble", "XGBoost", "LightGBM")]
+    labels, scores = classify_many(records, chunk_size=5)
+    batch = predictor.classify_batch(records)
+    for (judul, isi, option), label, score, batched in zip(records, labels, scores, batch):
+        hasil, expected, _ = classify_text(judul, isi, option)
+        assert (label, score) == (hasil, expected)
+        assert batched[:2] == (hasil, expected)
+
+# === TEST artikel panjang ===
+def test_long_article_chunks_keep_scores(monkeypatch):
+    predictor.result_cache.clear()
+    records = [(judul, isi, option) for judul, isi, _ in test_data
+               for option in predictor.CLASSIFY_OPTIONS]
+    expected = [classify_text(*record) for record in records]
+    _, expected_scores = classify_many(records)
+
+    # Semua artikel diproses per chunk kecil: vektor TF-IDF, skor, & cleaned_text
+    # sama (di bawah MAX_TOKENS tidak ada preview)
+    predictor.result_cache.clear()
+    monkeypatch.setattr(preprocessing, "LONG_TEXT_CHARS", 0)
+    monkeypatch.setattr(preprocessing, "CHUNK_CHARS", 64)
+    monkeypatch.setattr(preprocessing, "PREVIEW_WORDS", 5)
+    for record, result in zip(records, expected):
+        assert classify_text(*record) == result
+    predictor.result_cache.clear()
+    assert [result[:2] for result in predictor.classify_batch(records)] == \
+        [result[:2] for result in expected]
+    assert (classify_many(records)[1] == expected_scores).all()
+
+    # Kata setelah MAX_TOKENS diabaikan
+    monkeypatch.setattr(preprocessing, "MAX_TOKENS", 40)
+    judul, isi, _ = test_data[0]
+    truncated = " ".join(normalize_text(f"{judul} {isi}").split()[:40])
+    predictor.result_cache.clear()
+    capped = classify_text(judul, isi, "XGBoost")
+    predictor.result_cache.clear()
+    assert capped[1] == classify_text("", truncated, "XGBoost")[1] != expected[0][1]
+    assert classify_many([(judul, isi, "XGBoost")])[1][0] == capped[1]
+    # Hanya artikel yang terpotong diberi preview; clean_text tetap utuh dan
+    # UI diberi tahu cleaned_text hanya preview
+    assert capped[2] == " ".join(clean_text(truncated).split()[:5]) + " ..."
+    assert clean_text(f"{judul} {isi}") == expected[0][2]
+    assert "hanya menampilkan 5 kata pertama" in predictor.input_warning(judul, isi)
+    assert predictor.input_warning("", isi).startswith("⚠️ Hanya Isi")
+    predictor.result_cache.clear()
+
+def test_long_article_under_cap_keeps_cleaned_text():
+    # ~25 ribu karakter: diproses per chunk (LongText), tetapi jauh di bawah
+    # MAX_TOKENS kata, jadi cleaned_text tetap utuh
+    judul, isi, _ = test_data[0]
+    isi = "\n".join([isi] * (25000 // len(isi) + 1))
+    text = f"{judul} {isi}"
+    assert preprocessing.is_long_text(text) and len(text) < 2 * preprocessing.MAX_TOKENS
+    assert not preprocessing.exceeds_max_tokens(text)
+    predictor.result_cache.clear()
+    for option in predictor.CLASSIFY_OPTIONS:
+        hasil, score, cleaned = classify_text(judul, isi, option)
+        assert cleaned == clean_text(text)
+        assert classify_text(judul, isi, option) == (hasil, score, cleaned)
+    assert predictor.classify_batch([(judul, isi, "XGBoost")])[0][2] == clean_text(text)
+    assert predictor.input_warning(judul, isi) is None
+    predictor.result_cache.clear()
+
+# === TEST shadow scoring ===
+def test_shadow_scoring_compares_candidate(tmp_path, monkeypatch):
+    # Kandidat: XGBoost kecil yang dilatih ulang (kolom split berbeda), LightGBM sama
+    docs = [clean_text(f"{title} {body}") for title, body, _ in test_data]
+    labels = np.array([label for _, _, label in test_data], dtype=np.float64)
+    full = predictor.fast_tfidf.transform(docs)
+    candidate_xgb = xgb.train({"objective": "binary:logistic", "max_depth": 2},
+                              xgb.DMatrix(full, label=labels,
+                                          feature_names=xgb_model.feature_names),
+                              num_boost_round=3)
+    registry = ModelRegistry(str(tmp_path))
+    directory = registry.version_dir("kandidat")
+    os.makedirs(directory)
+    for path in ("models/tfidf_vectorizer.pkl", "models/lgbm_model2.pkl"):
+        shutil.copy(path, directory)
+    candidate_xgb.save_model(os.path.join(directory, "xgb_model2.json"))
+    registry.register("kandidat")
+
+    monkeypatch.setattr(predictor, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(predictor, "shadow_stats", ShadowStats())
+    predictor.result_cache.clear()
+    predictor.configure_shadow("kandidat", rate=1.0).join()
+    try:
+        primary = np.array([classify_text(title, body, "XGBoost")[1]
+                            for title, body, _ in test_data])
+        records = [(title, body, "Ensemble" if i % 2 else "XGBoost")
+                   for i, (title, body, _) in enumerate(test_data)]
+        _, batch_scores = classify_many(records)
+        predictor.wait_shadow()
+        # Antrean penuh: sampel dibuang, request utama tetap jalan
+        monkeypatch.setattr(predictor, "SHADOW_MAX_PENDING", 0)
+        classify_text(*test_data[0][:2], "LightGBM")
+        # Vektor bersama di-cache di state shadow, tidak di ModelSet aktif
+        version = predictor.active_models().version
+        assert set(predictor._shadow_tfidf) == {
+            (version, "kandidat", model_options)
+            for model_options in (("XGBoost",), ("LightGBM",), ("LightGBM", "XGBoost"))}
+        assert not any(key[0] == "shared_tfidf" for key in predictor.active_models().loaded)
+    finally:
+        predictor.configure_shadow(None)
+    assert predictor._shadow_tfidf == {}
+
+    candidate = candidate_xgb.predict(xgb.DMatrix(full, feature_names=xgb_model.feature_names))
+    stats = predictor.shadow_stats.snapshot()
+    xgb_rows = [i for i, (_, _, option) in enumerate(records) if option == "XGBoost"]
+    expected_primary = np.concatenate([primary, batch_scores[xgb_rows]])
+    expected_candidate = np.concatenate([candidate, candidate[xgb_rows]])
+    assert stats["XGBoost"]["rows"] == len(expected_primary)
+    assert abs(stats["XGBoost"]["abs_diff_sum"]
+               - abs(expected_candidate - expected_primary).sum()) < 1e-4
+    assert stats["XGBoost"]["agree"] == ((expected_candidate > 0.5)
+                                         == (expected_primary > 0.5)).sum()
+    assert stats["Ensemble"]["rows"] == len(records) - len(xgb_rows)
+    assert stats["LightGBM"]["dropped"] == 1 and stats["LightGBM"]["rows"] == 0
+    summary = predictor.shadow_stats.summary()["XGBoost"]
+    assert sum(summary["drift"].values()) == summary["rows"]
+    assert 0 <= summary["agreement"] <= 1
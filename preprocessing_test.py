@@ -0,0 +1,173 @@
+# preprocessing_test.py
+
+import re
+import json
+import random
+import hashlib
+import pytest
+from collections import Counter
+from utils import preprocessing
+from utils.preprocessing import (
+    LongText, StemCache, clean_normalized, clean_text, clean_texts,
+    clean_tokens, load_stem_table, normalize_text, remove_stopwords, stem_cache,
+    stemmer, stopword_remover,
+)
+from utils.fast_tfidf import FastTfidf
+from utils.stem_table import build_stem_table, read_texts, save_stem_table
+from test_data import test_data
+
+# Pipeline asli clean_text (sebelum optimasi) sebagai pembanding
+def reference_clean_text(text):
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = text.lower()
+    text = re.sub(r'\d+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = stopword_remover.remove(text)
+    text = stemmer.stem(text)
+    return text
+
+samples = [
+    "",
+    "   ",
+    "di yang dan",
+    "INI BERITA!!! 💥💥 HOAX BANGET deh...",
+    "COBA TESTING 123 https://www.youtube.com/!!! 💥💥 #Hoax",
+    "Kunjungi www.contoh.com atau HTTP://CAPS.example sekarang\tjuga\n\nya",
+    "spasi\xa0aneh\u2003dan\x1cpemisah\x85unicode  ",
+    "xhttps://a.b/c?d=1 abc123def #tag@user İstanbul ÉCOLE",
+] + [f"{judul} {isi}" for judul, isi, _ in test_data]
+
+# === TEST PARITY ===
+@pytest.mark.parametrize("text", samples)
+def test_clean_text_matches_reference(text):
+    assert clean_text(text) == reference_clean_text(text)
+
+def reference_normalize_text(text):
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = text.lower()
+    text = re.sub(r'\d+', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+@pytest.mark.parametrize("text", samples)
+def test_normalize_text_matches_reference(text):
+    assert normalize_text(text) == reference_normalize_text(text)
+
+# === TEST STEM CACHE ===
+def test_stem_cache_lru_eviction():
+    calls = []
+    cache = StemCache(lambda word: calls.append(word) or word.upper(), maxsize=2)
+    assert cache.stem("a") == "A"
+    assert cache.stem("b") == "B"
+    assert cache.stem("a") == "A"   # hit, "a" jadi paling baru
+    assert cache.stem("c") == "C"   # "b" dikeluarkan
+    assert cache.stem("b") == "B"   # miss lagi
+    assert calls == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    print(f"\n[StemCache] {stats}")
+    assert stats["hits"] == 1 and stats["misses"] == 4 and stats["size"] == 2
+
+def test_stem_cache_save_load(tmp_path):
+    clean_text(test_data[0][1])
+    path = tmp_path / "stem_cache.json"
+    stem_cache.save(path)
+
+    loaded = StemCache(lambda word: pytest.fail(f"cache miss: {word}"))
+    loaded.load(path)
+    assert len(loaded) == len(stem_cache)
+    for word in list(stem_cache._data):
+        assert loaded.stem(word) == stem_cache.stem(word)
+
+# === TEST STEM TABLE ===
+def test_stem_table_keeps_clean_text(tmp_path, monkeypatch):
+    corpus = tmp_path / "korpus.jsonl"
+    corpus.write_text("\n".join(json.dumps({"judul": judul, "isi": isi})
+                                for judul, isi, _ in test_data[:3]), encoding="utf-8")
+    table = build_stem_table(read_texts(str(corpus)), words=["berita", "pemerintah"],
+                             min_count=1)
+    assert "berita" in table and table["pemerintah"] == "perintah"
+    path = tmp_path / "stem_table.json"
+    save_stem_table(path, table)
+    assert load_stem_table(path) == table
+
+    expected = [clean_text(text) for text in samples]
+    monkeypatch.setattr(preprocessing, "stem_table", table)
+    assert [clean_text(text) for text in samples] == expected
+
+def test_stem_table_consulted_first(monkeypatch):
+    monkeypatch.setattr(preprocessing, "stem_table", {"berita": "BERITA"})
+    assert clean_text("Berita hoax") == "BERITA hoax"
+
+# === TEST PROCESS POOL ===
+def test_clean_texts_pool_keeps_order():
+    texts = [f"{judul} {isi}" for judul, isi, _ in test_data] * 3
+    result = list(clean_texts(texts, workers=2, chunksize=4))
+    assert result == [clean_text(text) for text in texts]
+
+# === TEST PIPELINE TOKEN ===
+@pytest.mark.parametrize("text", samples)
+def test_clean_tokens_match_clean_text(text):
+    tokens = clean_tokens(text)
+    assert " ".join(tokens) == reference_clean_text(text)
+    tfidf = FastTfidf(["berita", "berita hoax", "hoax"], [1.0] * 3, ngram_range=(1, 2))
+    assert tfidf.analyze_tokens(tokens) == tfidf.analyze(clean_text(text))
+
+def test_remove_stopwords_like_sastrawi():
+    words = sorted(preprocessing.stopwords)[:10] + ["berita", "hoaks"]
+    rng = random.Random(1)
+    for _ in range(200):
+        sample = [rng.choice(words) for _ in range(rng.randint(1, 30))]
+        assert " ".join(remove_stopwords(sample)) == stopword_remover.remove(" ".join(sample))
+
+def test_analyze_tokens_non_ascii_words():
+    # Kata di luar a-z (mis. dari stem_table) tetap di-tokenize seperti analyze
+    tfidf = FastTfidf(["ab"], [1.0], ngram_range=(1, 2))
+    words = ["Ab", "x", "", "c_d", "é-f", "gh", "İi"]
+    assert tfidf.analyze_tokens(words) == tfidf.analyze(" ".join(words))
+
+# === TEST ARTIKEL PANJANG ===
+@pytest.mark.parametrize("text", samples)
+def test_long_text_chunks_match_clean_text(text):
+    # Potongan sangat kecil: batas chunk jatuh di setiap kata
+    long_text = LongText(text, max_tokens=0, chunk_chars=3)
+    assert " ".join(word for chunk in long_text.chunks() for word in chunk) == \
+        reference_clean_text(text)
+    assert long_text.digest == hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+def test_long_text_stopwords_like_sastrawi():
+    # Stopword berurutan: StopWordRemover Sastrawi melewati kata setelah
+    # stopword yang dihapus, LongText harus menghasilkan teks yang sama
+    words = sorted(preprocessing.stopwords)[:20] + ["berita", "hoaks", "vaksin", "ke-2", "x"]
+    tfidf = FastTfidf(["berita", "berita hoaks", "hoaks", "vaksin"], [1.0] * 4, ngram_range=(1, 2))
+    rng = random.Random(0)
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 60)))
+        long_text = LongText(text, max_tokens=0, chunk_chars=rng.randint(1, 40))
+        cleaned = clean_normalized(normalize_text(text))
+        assert [word for chunk in long_text.chunks() for word in chunk] == \
+            preprocessing.clean_words(normalize_text(text).split()), text
+        assert tfidf.count_features(long_text.chunks()) == Counter(tfidf.analyze(cleaned))
+
+def test_long_text_token_cap(monkeypatch):
+    text = " ".join(f"{judul} {isi}" for judul, isi, _ in test_data)
+    words = normalize_text(text).split()
+    long_text = LongText(text, max_tokens=50, chunk_chars=64)
+    assert long_text.tokens == 50 and long_text.truncated
+    assert [word for chunk in long_text.chunks() for word in chunk] == \
+        clean_tokens(" ".join(words[:50]))
+    assert long_text.preview()[-1] == "..."
+    # Tanpa kata yang diabaikan, preview() memuat seluruh hasil chunks()
+    long_text = LongText(text, max_tokens=len(words), chunk_chars=64)
+    assert not long_text.truncated
+    assert list(long_text.chunks()) and long_text.preview() == clean_tokens(text)
+    # Batas MAX_TOKENS hanya untuk jalur klasifikasi; clean_text tetap utuh
+    monkeypatch.setattr(preprocessing, "MAX_TOKENS", 50)
+    assert preprocessing.score_tokens(text) == clean_tokens(" ".join(words[:50]))
+    assert clean_text(text) == reference_clean_text(text)
+    assert list(clean_texts([text], workers=1, score=True)) == [clean_tokens(" ".join(words[:50]))]
+    assert preprocessing.exceeds_max_tokens(text)
+    assert not preprocessing.exceeds_max_tokens(" ".join(words[:50]))
+    assert not preprocessing.exceeds_max_tokens("ab " * 50)
+    assert preprocessing.exceeds_max_tokens("ab " * 51)
+    assert preprocessing.is_long_text("ab " * 50) and not preprocessing.is_long_text("ab " * 33)
@@ -0,0 +1,318 @@
+# service.py
+# Layanan HTTP (asyncio) untuk klasifikasi berita tanpa Streamlit.
+# Jalankan: python service.py --port 8000 --workers 4
+#
+# Endpoint:
+# - GET  /health
+# - POST /classify        {"judul": str, "isi": str,
+#                           "model_option": "XGBoost"|"LightGBM"|"Ensemble"}
+# - POST /classify/batch  {"items": [ {...}, ... ]}
+# - GET  /metrics         metrik antrean & ukuran micro-batch
+# - GET  /metrics/prometheus  histogram durasi per tahap (--stage-metrics)
+#                             + metrik antrean, format teks Prometheus
+# - GET  /shadow          statistik shadow scoring (--shadow-version)
+import argparse
+import asyncio
+import json
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from batcher import MicroBatcher
+from utils import metrics, threads
+from utils.shadow import ShadowStats
+
+MODEL_OPTIONS = ("XGBoost", "LightGBM", "Ensemble")
+# Batas ukuran body request (byte)
+MAX_BODY_SIZE = 8 * 1024 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+def _init_worker(inference_threads=None, pin_cpus=False, worker_counter=None,
+                 shadow_version=None, shadow_rate=None, workers=1):
+    # Model dimuat sekali per proses worker, sebelum request pertama
+    import predictor
+    cpus = None
+    if pin_cpus and worker_counter is not None:
+        # Nomor urut worker menentukan blok CPU-nya
+        with worker_counter.get_lock():
+            index = worker_counter.value
+            worker_counter.value += 1
+        cpus = threads.worker_cpus(index, inference_threads, workers=workers)
+    predictor.configure_threads(inference_threads, cpus)
+    predictor.preload()
+    if shadow_version:
+        predictor.configure_shadow(shadow_version, shadow_rate)
+
+def _classify_batch(records, stage_metrics=False):
+    """
+    Return: (list hasil per record, snapshot metrik tahap worker atau None,
+            statistik shadow yang selesai sejak batch sebelumnya)
+    """
+    import predictor
+    if stage_metrics and metrics.hook is None:
+        metrics.enable()
+    results = [(hasil, float(score), cleaned, predictor.input_warning(judul, isi))
+               for (hasil, score, cleaned), (judul, isi, _)
+               in zip(predictor.classify_batch(records), records)]
+    # Metrik dicatat di proses worker; dikirim balik per batch untuk digabung
+    return (results, metrics.registry.drain() if stage_metrics else None,
+            predictor.shadow_stats.drain())
+
+
+class RequestError(Exception):
+    """Request tidak valid; dikirim ke client sebagai HTTP 4xx."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_item(item):
+    """
+    Validasi satu artikel dari body JSON.
+    Return: tuple (judul, isi, model_option)
+    """
+    if not isinstance(item, dict):
+        raise RequestError(400, "setiap item harus berupa object JSON")
+    judul = item.get("judul", "")
+    isi = item.get("isi", "")
+    model_option = item.get("model_option", "XGBoost")
+    if not isinstance(judul, str) or not isinstance(isi, str):
+        raise RequestError(400, "judul dan isi harus berupa string")
+    if not judul.strip() and not isi.strip():
+        raise RequestError(400, "isi minimal judul atau isi berita")
+    if model_option not in MODEL_OPTIONS:
+        raise RequestError(400, f"model_option harus salah satu dari {list(MODEL_OPTIONS)}")
+    return judul, isi, model_option
+
+
+class ScoringService:
+    """
+    Artikel dari request yang datang bersamaan digabung oleh MicroBatcher
+    lalu diproses di worker pool, sehingga event loop tidak pernah
+    menjalankan preprocessing/prediksi sendiri.
+    - executor: concurrent.futures.Executor (default ProcessPoolExecutor)
+    - max_batch_size, max_wait_ms: lihat MicroBatcher
+    - stage_metrics: catat durasi per tahap pipeline di worker (utils.metrics)
+    - inference_threads: thread inferensi per worker (None = CPU / workers,
+      0 = default library, yaitu semua CPU di setiap worker)
+    - pin_cpus: kunci setiap worker ke blok CPU sendiri (CPU affinity)
+    - shadow_version, shadow_rate: versi registry kandidat yang ikut menskor
+      sebagian artikel di worker (lihat predictor.configure_shadow)
+    """
+
+    def __init__(self, executor=None, workers=None, max_batch_size=64, max_wait_ms=5.0,
+                 stage_metrics=False, inference_threads=None, pin_cpus=False,
+                 shadow_version=None, shadow_rate=None):
+        workers = workers or os.cpu_count()
+        if inference_threads is None:
+            inference_threads = threads.default_threads(workers)
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(inference_threads, pin_cpus, multiprocessing.Value("i", 0),
+                      shadow_version, shadow_rate, workers))
+        self.batcher = MicroBatcher(self._process_batch, max_batch_size=max_batch_size,
+                                    max_wait_ms=max_wait_ms, max_concurrency=workers)
+        self.stage_metrics = stage_metrics
+        self.metrics_registry = metrics.Registry()
+        self.shadow_stats = ShadowStats()
+
+    async def start(self):
+        await self.batcher.start()
+
+    async def stop(self):
+        await self.batcher.stop()
+        self.executor.shutdown(wait=False)
+
+    async def classify(self, records):
+        """Return: list tuple (hasil, score, cleaned, warning) sesuai urutan records."""
+        return await self.batcher.submit_many(records)
+
+    async def _process_batch(self, records):
+        loop = asyncio.get_running_loop()
+        results, snapshot, shadow = await loop.run_in_executor(
+            self.executor, _classify_batch, records, self.stage_metrics)
+        if snapshot:
+            self.metrics_registry.merge(snapshot)
+        if shadow:
+            self.shadow_stats.merge(shadow)
+        return results
+
+    def prometheus_metrics(self):
+        """Return: str teks Prometheus (histogram tahap + metrik antrean)."""
+        lines = [self.metrics_registry.render()]
+        for name, value in self.batcher.metrics().items():
+            if isinstance(value, (int, float)):
+                lines.append(f"# TYPE hoaxcheck_batcher_{name} gauge\n"
+                             f"hoaxcheck_batcher_{name} {value}\n")
+        return "".join(lines)
+
+    # === HTTP ===
+    async def handle(self, method, path, body):
+        """Return: (status, payload dict)"""
+        if path in ("/health", "/metrics", "/metrics/prometheus", "/shadow"):
+            if method != "GET":
+                raise RequestError(405, "gunakan GET")
+            if path == "/metrics":
+                return 200, self.batcher.metrics()
+            if path == "/metrics/prometheus":
+                return 200, self.prometheus_metrics()
+            if path == "/shadow":
+                return 200, self.shadow_stats.summary()
+            return 200, {"status": "ok"}
+        if path not in ("/classify", "/classify/batch"):
+            raise RequestError(404, f"path tidak dikenal: {path}")
+        if method != "POST":
+            raise RequestError(405, "gunakan POST")
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise RequestError(400, "body bukan JSON yang valid")
+
+        if path == "/classify":
+            result, = await self.classify([parse_item(payload)])
+            return 200, _result_json(result)
+
+        items = payload.get("items") if isinstance(payload, dict) else None
+        if not isinstance(items, list) or not items:
+            raise RequestError(400, "items harus berupa list yang tidak kosong")
+        results = await self.classify([parse_item(item) for item in items])
+        return 200, {"results": [_result_json(result) for result in results]}
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = _request_line(request_line)
+                except RequestError as exc:
+                    # Request tidak bisa dibaca lebih lanjut: jawab lalu tutup
+                    writer.write(_http_response(exc.status, {"error": str(exc)}, False))
+                    await writer.drain()
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                # Body tidak dibaca bila panjangnya tidak valid / terlalu besar,
+                # jadi koneksi ditutup setelah respons
+                framed = False
+                try:
+                    length = _content_length(headers)
+                    if length > MAX_BODY_SIZE:
+                        raise RequestError(413, "body terlalu besar")
+                    body = await reader.readexactly(length)
+                    framed = True
+                    status, payload = await self.handle(method, path.split("?")[0], body)
+                except RequestError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except Exception as exc:
+                    status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close"
+                              and framed)
+                writer.write(_http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def _request_line(line):
+    # "METHOD PATH HTTP/x.y" (400 bila tidak)
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise RequestError(400, f"request line tidak valid: {line.strip()[:100]!r}")
+    return parts
+
+def _content_length(headers):
+    # Content-Length harus bilangan bulat >= 0 (400 bila tidak)
+    value = headers.get("content-length", "0")
+    try:
+        length = int(value)
+    except ValueError:
+        raise RequestError(400, f"Content-Length tidak valid: {value!r}") from None
+    if length < 0:
+        raise RequestError(400, f"Content-Length tidak valid: {value!r}")
+    return length
+
+def _result_json(result):
+    hasil, score, cleaned, warning = result
+    return {"hasil": hasil, "score": score, "cleaned": cleaned, "warning": warning}
+
+def _http_response(status, payload, keep_alive):
+    # payload str dikirim apa adanya (teks Prometheus), selain itu JSON
+    if isinstance(payload, str):
+        body = payload.encode("utf-8")
+        content_type = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        content_type = "application/json; charset=utf-8"
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(host="127.0.0.1", port=8000, service=None):
+    """Jalankan server sampai dibatalkan."""
+    service = service or ScoringService()
+    await service.start()
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan HTTP klasifikasi berita hoax")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument("--max-batch-size", type=int, default=64,
+                        help="jumlah artikel maksimum per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="waktu tunggu maksimum untuk mengisi micro-batch")
+    parser.add_argument("--stage-metrics", action="store_true",
+                        help="catat durasi per tahap (GET /metrics/prometheus)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="thread inferensi per worker (default: CPU / workers, "
+                             "0 = semua CPU)")
+    parser.add_argument("--pin-cpus", action="store_true",
+                        help="kunci setiap worker ke blok CPU sendiri")
+    parser.add_argument("--shadow-version", default=None,
+                        help="versi registry kandidat untuk shadow scoring (GET /shadow)")
+    parser.add_argument("--shadow-rate", type=float, default=None,
+                        help="fraksi artikel yang ikut diskor kandidat (default 0.05)")
+    args = parser.parse_args()
+
+    service = ScoringService(workers=args.workers, max_batch_size=args.max_batch_size,
+                             max_wait_ms=args.max_wait_ms, stage_metrics=args.stage_metrics,
+                             inference_threads=args.threads, pin_cpus=args.pin_cpus,
+                             shadow_version=args.shadow_version, shadow_rate=args.shadow_rate)
+    print(f"[INFO] HoaxCheck service berjalan di http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# service_test.py
+
+import sys
+import json
+import asyncio
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from service import ScoringService
+from batcher import MicroBatcher
+from utils import metrics
+from predictor import classify_text
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    if b"application/json" not in head:
+        return int(head.split()[1]), body.decode()
+    return int(head.split()[1]), json.loads(body)
+
+async def _with_server(scenario, **options):
+    service = ScoringService(executor=ThreadPoolExecutor(2), **options)
+    await service.start()
+    server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await scenario(port)
+    finally:
+        server.close()
+        await service.stop()
+
+def test_service_classify_endpoints():
+    items = [
+        {"judul": "Judul Lengkap", "isi": "Isi Lengkap Berita", "model_option": "XGBoost"},
+        {"judul": "", "isi": "Isi Saja", "model_option": "LightGBM"},
+        {"judul": "Judul Saja"},
+    ]
+
+    async def scenario(port):
+        # Request bersamaan digabung ke batch yang sama
+        singles = await asyncio.gather(*[_request(port, "POST", "/classify", item) for item in items])
+        batch = await _request(port, "POST", "/classify/batch", {"items": items})
+        metrics = await _request(port, "GET", "/metrics")
+        errors = await asyncio.gather(
+            _request(port, "POST", "/classify", {"judul": " ", "isi": ""}),
+            _request(port, "POST", "/classify", {"judul": "a", "model_option": "SVM"}),
+            _request(port, "GET", "/classify"),
+            _request(port, "GET", "/tidak-ada"),
+        )
+        return singles, batch, metrics, errors
+
+    singles, batch, metrics, errors = asyncio.run(_with_server(scenario))
+    assert metrics[0] == 200 and metrics[1]["items"] == 2 * len(items)
+    assert batch[0] == 200
+    for item, (status, result), batched in zip(items, singles, batch[1]["results"]):
+        hasil, score, cleaned = classify_text(item["judul"], item.get("isi", ""), item.get("model_option", "XGBoost"))
+        print(f"\n[SERVICE] {item} => {result}")
+        assert status == 200
+        assert result == batched
+        assert (result["hasil"], result["cleaned"]) == (hasil, cleaned)
+        assert abs(result["score"] - float(score)) < 1e-12
+    assert singles[1][1]["warning"].startswith("⚠️ Hanya Isi")
+    assert [status for status, _ in errors] == [400, 400, 405, 404]
+
+def test_service_rejects_invalid_content_length():
+    async def raw_request(port, length):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /classify HTTP/1.1\r\nHost: test\r\n"
+                     f"Content-Length: {length}\r\n\r\n{{}}".encode())
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body), b"Connection: close" in head
+
+    async def scenario(port):
+        return await asyncio.gather(raw_request(port, "dua"), raw_request(port, "-1"))
+
+    for status, payload, closed in asyncio.run(_with_server(scenario)):
+        assert status == 400 and "Content-Length" in payload["error"] and closed
+
+def test_service_rejects_invalid_request_line():
+    async def raw_request(port, line):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(line + b"\r\nHost: test\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body), b"Connection: close" in head
+
+    async def scenario(port):
+        return await asyncio.gather(raw_request(port, b"sampah"),
+                                    raw_request(port, b"GET /health HTTP/1.1 lebih"),
+                                    raw_request(port, b"GET /health bukan-http"))
+
+    for status, payload, closed in asyncio.run(_with_server(scenario)):
+        assert status == 400 and "request line" in payload["error"] and closed
+
+def test_service_prometheus_stage_metrics():
+    async def scenario(port):
+        await _request(port, "POST", "/classify/batch", {"items": [
+            {"judul": "Judul", "isi": "Isi berita", "model_option": "XGBoost"},
+            {"judul": "Judul lain", "isi": "Isi berita lain", "model_option": "LightGBM"},
+        ]})
+        return await _request(port, "GET", "/metrics/prometheus")
+
+    try:
+        status, text = asyncio.run(_with_server(scenario, stage_metrics=True))
+    finally:
+        metrics.disable()
+    assert status == 200
+    assert "# TYPE hoaxcheck_stage_seconds histogram" in text
+    for stage in ("normalize", "stopword", "stemming", "tfidf"):
+        assert f'hoaxcheck_stage_seconds_count{{stage="{stage}"}} ' in text
+    assert 'hoaxcheck_stage_seconds_count{model="LightGBM",stage="predict"} 1' in text
+    assert "hoaxcheck_tokens_count 2" in text
+    assert "hoaxcheck_batcher_items 2" in text
+
+def test_service_does_not_import_streamlit():
+    code = "import sys, service, predictor; sys.exit('streamlit' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+def test_micro_batcher_groups_and_fans_out():
+    seen = []
+
+    async def process(items):
+        seen.append(list(items))
+        await asyncio.sleep(0)
+        return [item * 10 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=50)
+        await batcher.start()
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(10)])
+        # Item tunggal dikirim setelah waktu tunggu habis
+        single = await batcher.submit(99)
+        metrics = batcher.metrics()
+        await batcher.stop()
+        return results, single, metrics
+
+    results, single, metrics = asyncio.run(scenario())
+    print(f"\n[MicroBatcher] batches={seen} metrics={metrics}")
+    assert results == [i * 10 for i in range(10)] and single == 990
+    assert [len(batch) for batch in seen] == [4, 4, 2, 1]
+    assert metrics["batches"] == 4 and metrics["items"] == 11
+    assert metrics["max_batch_size_seen"] == 4 and metrics["queue_depth"] == 0
+    assert metrics["batch_size_histogram"] == {1: 1, 2: 1, 4: 2}
+
+def test_micro_batcher_propagates_errors():
+    async def process(items):
+        raise RuntimeError("model error")
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_wait_ms=1)
+        await batcher.start()
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(scenario()))
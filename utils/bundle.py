@@ -0,0 +1,107 @@
+import json
+import mmap
+import numpy as np
+
+# Format bundle (satu file, tanpa pickle):
+#   MAGIC (8 byte) | panjang header (uint64 little-endian) | header JSON |
+#   array-array mentah, masing-masing mulai di offset kelipatan ALIGNMENT
+# Header: {"sections": {nama: {"meta": {...}, "arrays": {nama_array:
+#          {"dtype": str, "shape": list, "offset": int}}}},
+#          "sources": {nama section: sha256 file sumber}}
+# sources dicocokkan saat dibaca (read_bundle), jadi bundle sisa versi model
+# lama tidak ikut terpakai setelah model / vectorizer diganti.
+MAGIC = b"HOAXBNDL"
+ALIGNMENT = 64
+
+
+def write_bundle(path, sections, sources=None):
+    """
+    Tulis beberapa section ke satu file bundle.
+    - sections: dict nama -> (meta dict JSON, dict nama_array -> np.ndarray)
+    - sources: dict nama section -> sha256 file sumbernya
+    """
+    header = {"sections": {}, "sources": sources or {}}
+    blobs = []
+    offset = 0
+    for name, (meta, arrays) in sections.items():
+        entries = {}
+        for array_name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            entries[array_name] = {"dtype": array.dtype.str, "shape": list(array.shape),
+                                   "offset": offset}
+            blobs.append((offset, array))
+            offset += array.nbytes
+        header["sections"][name] = {"meta": meta, "arrays": entries}
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    # Data dimulai di offset yang juga sejajar ALIGNMENT
+    data_start = -(-(len(MAGIC) + 8 + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(data_start - len(MAGIC) - 8).tobytes())
+        f.write(header_bytes.ljust(data_start - len(MAGIC) - 8, b" "))
+        for blob_offset, array in blobs:
+            f.seek(data_start + blob_offset)
+            f.write(array.tobytes())
+
+
+def read_bundle(path, sources=None):
+    """
+    Buka bundle lewat mmap (read-only). Array tidak disalin ke heap proses:
+    proses yang membuka file yang sama berbagi halaman lewat page cache OS.
+    - sources: dict nama section -> sha256 file sumber yang diharapkan;
+      ValueError bila bundle dibuat dari file lain
+    Return: dict nama -> (meta dict, dict nama_array -> np.ndarray read-only)
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"bukan file bundle: {path}")
+    header_size = int(np.frombuffer(buffer, dtype="<u8", count=1, offset=len(MAGIC))[0])
+    data_start = len(MAGIC) + 8 + header_size
+    header = json.loads(bytes(buffer[len(MAGIC) + 8:data_start]))
+    recorded = header.get("sources", {})
+    stale = [name for name, sha256 in (sources or {}).items() if recorded.get(name) != sha256]
+    if stale:
+        raise ValueError(f"bundle {path} tidak dibuat dari file {', '.join(stale)} yang sekarang "
+                         f"(buat ulang: python -m utils.bundle)")
+
+    sections = {}
+    for name, section in header["sections"].items():
+        arrays = {}
+        for array_name, entry in section["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype=np.int64))
+            arrays[array_name] = np.frombuffer(
+                buffer, dtype=dtype, count=count,
+                offset=data_start + entry["offset"]).reshape(entry["shape"])
+        sections[name] = (section["meta"], arrays)
+    return sections
+
+
+def export_models(path, tfidf_path="models/tfidf_vectorizer.pkl",
+                  xgb_path="models/xgb_model2.json", lgbm_path="models/lgbm_model2.pkl"):
+    """
+    Gabungkan vectorizer TF-IDF & kedua model pohon ke satu bundle, dengan
+    sha256 file sumbernya di header.
+    """
+    import joblib
+    from utils.fast_tfidf import FastTfidf
+    from utils.model_registry import file_sha256
+    from utils.tree_engine import TreeEnsemble
+
+    write_bundle(path, {
+        "tfidf": FastTfidf.from_sklearn(joblib.load(tfidf_path)).to_arrays(),
+        "XGBoost": TreeEnsemble.from_xgboost_json(xgb_path).to_arrays(),
+        "LightGBM": TreeEnsemble.from_lightgbm(joblib.load(lgbm_path)).to_arrays(),
+    }, sources={"tfidf": file_sha256(tfidf_path), "XGBoost": file_sha256(xgb_path),
+                "LightGBM": file_sha256(lgbm_path)})
+
+
+if __name__ == "__main__":
+    # Langkah offline: python -m utils.bundle [models/hoaxcheck.bundle]
+    import sys
+    dst = sys.argv[1] if len(sys.argv) > 1 else "models/hoaxcheck.bundle"
+    export_models(dst)
+    print(f"[INFO] Bundle model disimpan ke {dst}")
@@ -0,0 +1,273 @@
+import re
+import json
+import numpy as np
+import scipy.sparse as sp
+from collections import Counter
+
+# token_pattern bawaan sklearn: kata a-z dari clean_tokens langsung jadi token
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+class FastTfidf:
+    """
+    Vectorizer TF-IDF khusus inferensi.
+    Menyimpan vocabulary (dict term -> kolom), array idf, dan setting norm,
+    lalu langsung membangun baris CSR tanpa validasi & analyzer generik sklearn.
+    Hasil transform sama persis dengan TfidfVectorizer.transform.
+
+    - terms: list str, atau np.ndarray bytes ("S", UTF-8) yang terurut
+      (mis. dari bundle mmap); yang kedua dicari lewat searchsorted tanpa
+      membangun dict di setiap proses
+    """
+
+    def __init__(self, terms, idf, ngram_range=(1, 1),
+                 token_pattern=DEFAULT_TOKEN_PATTERN, lowercase=True, norm="l2",
+                 keep=None):
+        if norm not in ("l2", None):
+            raise ValueError(f"norm tidak didukung: {norm!r}")
+        if isinstance(terms, np.ndarray) and terms.dtype.kind == "S":
+            self.terms = terms
+            self.vocabulary = None
+        else:
+            self.terms = list(terms)
+            self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.norm = norm
+        self._tokenize = re.compile(token_pattern).findall
+        # Kolom yang dimaterialisasi (None = semua), lihat prune()
+        self.keep = None if keep is None else np.asarray(keep, dtype=bool)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer):
+        """Bangun dari TfidfVectorizer sklearn yang sudah di-fit."""
+        unsupported = {
+            "analyzer": "word", "preprocessor": None, "tokenizer": None,
+            "stop_words": None, "strip_accents": None, "binary": False,
+            "use_idf": True, "sublinear_tf": False,
+        }
+        for name, expected in unsupported.items():
+            if getattr(vectorizer, name) != expected:
+                raise ValueError(f"setting vectorizer tidak didukung: {name}={getattr(vectorizer, name)!r}")
+        return cls(vectorizer.get_feature_names_out(), vectorizer.idf_,
+                   ngram_range=vectorizer.ngram_range,
+                   token_pattern=vectorizer.token_pattern,
+                   lowercase=vectorizer.lowercase, norm=vectorizer.norm)
+
+    def prune(self, columns):
+        """
+        Vectorizer yang hanya mengisi kolom tertentu (mis. fitur yang dipakai
+        split model). Lebar & nilai kolom yang tersisa tetap sama, karena
+        norm tetap dihitung dari seluruh vocabulary.
+        """
+        keep = np.zeros(self.n_features, dtype=bool)
+        keep[np.asarray(columns, dtype=np.int64)] = True
+        return FastTfidf(self.terms, self.idf, ngram_range=self.ngram_range,
+                         token_pattern=self.token_pattern, lowercase=self.lowercase,
+                         norm=self.norm, keep=keep)
+
+    @property
+    def n_features(self):
+        return len(self.terms)
+
+    def save(self, path):
+        """Simpan ke file .npz (tanpa pickle)."""
+        meta = {
+            "ngram_range": self.ngram_range,
+            "token_pattern": self.token_pattern,
+            "lowercase": self.lowercase,
+            "norm": self.norm,
+        }
+        arrays = {} if self.keep is None else {"keep": self.keep}
+        np.savez(path, terms=np.array(self.term_list(), dtype=str), idf=self.idf,
+                 meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            keep = data["keep"] if "keep" in data else None
+            return cls(data["terms"].tolist(), data["idf"], keep=keep, **meta)
+
+    def term_list(self):
+        """Return: list str term sesuai urutan kolom."""
+        if self.vocabulary is None:
+            return [term.decode("utf-8") for term in self.terms.tolist()]
+        return self.terms
+
+    def to_arrays(self):
+        """
+        Bentuk untuk utils.bundle: vocabulary sebagai array bytes terurut.
+        Return: (meta dict, dict array)
+        """
+        if self.vocabulary is None:
+            terms = self.terms
+        else:
+            terms = np.array([term.encode("utf-8") for term in self.terms])
+        if len(terms) > 1 and not (terms[:-1] < terms[1:]).all():
+            raise ValueError("urutan kolom vocabulary harus sama dengan urutan term")
+        meta = {
+            "ngram_range": self.ngram_range,
+            "token_pattern": self.token_pattern,
+            "lowercase": self.lowercase,
+            "norm": self.norm,
+        }
+        arrays = {"terms": terms, "idf": self.idf}
+        if self.keep is not None:
+            arrays["keep"] = self.keep
+        return meta, arrays
+
+    @classmethod
+    def from_arrays(cls, meta, arrays):
+        """Kebalikan to_arrays; array dipakai apa adanya (tanpa salinan)."""
+        return cls(arrays["terms"], arrays["idf"], keep=arrays.get("keep"), **meta)
+
+    def _search_terms(self, features):
+        # Kolom tiap feature di vocabulary bytes terurut (-1 = tidak ada)
+        encoded = [feature.encode("utf-8") for feature in features]
+        # np.array memotong bytes yang lebih panjang dari lebar dtype,
+        # jadi feature yang lebih panjang dari term terpanjang ditolak di sini
+        values = np.array(encoded, dtype=self.terms.dtype)
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        positions = np.searchsorted(self.terms, values).clip(max=len(self.terms) - 1)
+        found = (self.terms[positions] == values) & (lengths <= self.terms.dtype.itemsize)
+        return np.where(found, positions, -1)
+
+    def _batch_vocabulary(self, row_counts):
+        # Dict kecil term -> kolom, hanya untuk feature yang muncul di batch ini
+        if len(row_counts) == 1:
+            features = list(row_counts[0])
+        else:
+            features = list(set().union(*row_counts))
+        columns = self._search_terms(features).tolist()
+        return {feature: column for feature, column in zip(features, columns) if column >= 0}
+
+    def analyze(self, doc):
+        """Token + n-gram persis seperti analyzer 'word' sklearn."""
+        if self.lowercase:
+            doc = doc.lower()
+        return self._ngrams(self._tokenize(doc))
+
+    def analyze_tokens(self, words):
+        """Seperti analyze(" ".join(words)) tanpa membangun string (words: hasil clean_tokens)."""
+        return self._ngrams(self._word_tokens(words))
+
+    def _word_tokens(self, words):
+        # Token tidak pernah melewati spasi, jadi setiap kata bisa di-tokenize
+        # sendiri; kata yang seluruhnya huruf ASCII (hampir semua hasil
+        # stemming) adalah satu token utuh bila panjangnya >= 2
+        if self.token_pattern != DEFAULT_TOKEN_PATTERN:
+            doc = " ".join(words)
+            return self._tokenize(doc.lower() if self.lowercase else doc)
+        tokens = []
+        for word in words:
+            if self.lowercase:
+                word = word.lower()
+            if word.isascii() and word.isalpha():
+                if len(word) > 1:
+                    tokens.append(word)
+            elif word:
+                tokens.extend(self._tokenize(word))
+        return tokens
+
+    def _ngrams(self, tokens):
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        features = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            features.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return features
+
+    def count_features(self, chunks):
+        """
+        Hitung fitur satu dokumen yang diberikan per potongan (mis.
+        LongText.chunks()), tanpa menggabungkannya jadi satu string.
+        N-gram yang melewati batas potongan ikut dihitung.
+        - chunks: iterable list kata
+        Return: Counter fitur, sama dengan Counter(analyze_tokens(seluruh kata))
+        """
+        min_n, max_n = self.ngram_range
+        counts = Counter()
+        carry = []
+        for chunk in chunks:
+            new_tokens = self._word_tokens(chunk)
+            if not new_tokens:
+                continue
+            tokens = carry + new_tokens
+            if min_n == 1:
+                counts.update(new_tokens)
+            for n in range(max(min_n, 2), max_n + 1):
+                # Hanya n-gram yang memuat token baru (sisanya sudah dihitung)
+                first = max(len(carry) - n + 1, 0)
+                counts.update(" ".join(tokens[i:i + n]) for i in range(first, len(tokens) - n + 1))
+            carry = tokens[-(max_n - 1):] if max_n > 1 else []
+        return counts
+
+    def transform(self, docs):
+        """
+        - docs: list dokumen, masing-masing str (teks hasil clean_text), list
+          kata (hasil clean_tokens), atau Counter hasil count_features
+        Return: scipy.sparse.csr_matrix (n_docs, n_features) float64
+        """
+        return self._build([self._count(doc) for doc in docs])
+
+    def _count(self, doc):
+        if isinstance(doc, Counter):
+            return doc
+        if isinstance(doc, str):
+            return Counter(self.analyze(doc))
+        return Counter(self.analyze_tokens(doc))
+
+    def _build(self, row_counts):
+        vocabulary = self.vocabulary
+        if vocabulary is None:
+            vocabulary = self._batch_vocabulary(row_counts)
+        indptr = [0]
+        indices = []
+        counts = []
+        for feature_counts in row_counts:
+            row = {}
+            for feature, count in feature_counts.items():
+                idx = vocabulary.get(feature)
+                if idx is not None:
+                    row[idx] = count
+            columns = sorted(row)
+            indices.extend(columns)
+            counts.extend(row[c] for c in columns)
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int32)
+        data = np.asarray(counts, dtype=np.float64) * self.idf[indices]
+        if self.norm == "l2":
+            _l2_normalize_rows(data, indptr)
+        if self.keep is not None:
+            kept = self.keep[indices]
+            indptr = np.concatenate([[0], np.cumsum(kept)])[indptr].astype(np.int32)
+            data, indices = data[kept], indices[kept]
+        return sp.csr_matrix((data, indices, indptr),
+                             shape=(len(indptr) - 1, self.n_features))
+
+
+def _l2_normalize_rows(data, indptr):
+    # Jumlah kuadrat dihitung berurutan (cumsum) seperti loop Cython sklearn,
+    # supaya hasilnya identik sampai bit terakhir.
+    for start, end in zip(indptr[:-1], indptr[1:]):
+        if start == end:
+            continue
+        row = data[start:end]
+        total = np.cumsum(row * row)[-1]
+        if total != 0.0:
+            row /= np.sqrt(total)
+
+
+if __name__ == "__main__":
+    # Ekspor: python -m utils.fast_tfidf models/tfidf_vectorizer.pkl models/tfidf_fast.npz
+    import sys
+    import joblib
+    src, dst = sys.argv[1:3]
+    FastTfidf.from_sklearn(joblib.load(src)).save(dst)
+    print(f"[INFO] FastTfidf disimpan ke {dst}")
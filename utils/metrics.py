@@ -0,0 +1,165 @@
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+# Nama metrik yang dicatat pipeline
+STAGE_SECONDS = "hoaxcheck_stage_seconds"
+INPUT_CHARS = "hoaxcheck_input_chars"
+TOKENS = "hoaxcheck_tokens"
+
+TIME_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000,
+                50000, 100000)
+
+METRICS = {
+    STAGE_SECONDS: (TIME_BUCKETS, "Durasi per tahap pipeline klasifikasi (detik)"),
+    INPUT_CHARS: (SIZE_BUCKETS, "Panjang teks input clean_text (karakter)"),
+    TOKENS: (SIZE_BUCKETS, "Jumlah token setelah hapus stopword"),
+}
+
+# Hook metrik: callable(name, value, labels dict atau None), None = nonaktif.
+# Di hot path hanya ada satu pengecekan `hook is None` bila nonaktif.
+hook = None
+
+
+def set_hook(new_hook):
+    """Pasang hook metrik (mis. Registry.observe atau adapter statsd); None = matikan."""
+    global hook
+    hook = new_hook
+
+
+def start():
+    """Return: waktu mulai (perf_counter) atau None bila metrik nonaktif."""
+    if hook is None:
+        return None
+    return perf_counter()
+
+
+def stop(stage, started, model=None):
+    """
+    Catat durasi tahap sejak started (hasil start()).
+    Return: waktu sekarang untuk tahap berikutnya (atau None bila nonaktif)
+    """
+    if started is None or hook is None:
+        return None
+    now = perf_counter()
+    labels = {"stage": stage} if model is None else {"stage": stage, "model": model}
+    hook(STAGE_SECONDS, now - started, labels)
+    return now
+
+
+def observe(name, value, labels=None):
+    """Catat satu nilai (mis. panjang input) bila metrik aktif."""
+    if hook is not None:
+        hook(name, value, labels)
+
+
+class Histogram:
+    """Histogram bucket tetap (batas atas inklusif, seperti Prometheus)."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+
+class Registry:
+    """
+    Kumpulan histogram per (nama metrik, label). Method observe bisa
+    langsung dipakai sebagai hook: set_hook(registry.observe).
+    """
+
+    def __init__(self, metrics=METRICS):
+        self.metrics = dict(metrics)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, labels=None):
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                buckets = self.metrics.get(name, (TIME_BUCKETS, ""))[0]
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def snapshot(self):
+        """Return: dict (nama, label) -> (buckets, counts, sum), bisa di-pickle."""
+        with self._lock:
+            return {key: (h.buckets, list(h.counts), h.sum)
+                    for key, h in self._histograms.items()}
+
+    def drain(self):
+        """Seperti snapshot, lalu kosongkan registry (mis. di akhir batch worker)."""
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+        return {key: (h.buckets, h.counts, h.sum) for key, h in histograms.items()}
+
+    def merge(self, snapshot):
+        """Tambahkan hasil snapshot/drain registry lain (mis. dari proses worker)."""
+        with self._lock:
+            for key, (buckets, counts, total) in snapshot.items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(buckets)
+                histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                histogram.sum += total
+
+    def render(self):
+        """Return: str format teks Prometheus (exposition format 0.0.4)."""
+        snapshot = self.snapshot()
+        lines = []
+        for name in sorted({name for name, _ in snapshot}):
+            help_text = self.metrics.get(name, (None, ""))[1]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), (buckets, counts, total) in sorted(snapshot.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {total!r}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"'
+                          for (name, _), value in zip(labels, escaped)) + "}"
+
+
+# Registry default untuk proses ini
+registry = Registry()
+
+
+def enable(target=None):
+    """Aktifkan pencatatan ke registry (default: registry global). Return: registry."""
+    target = target or registry
+    set_hook(target.observe)
+    return target
+
+
+def disable():
+    set_hook(None)
+
+
+# HOAXCHECK_METRICS=1 mengaktifkan pencatatan sejak import
+if os.environ.get("HOAXCHECK_METRICS", "") not in ("", "0"):
+    enable()
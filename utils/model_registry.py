@@ -0,0 +1,227 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+
+# Registry model lokal di satu direktori (default models/):
+#   versions/<versi>/   artefak satu versi (nama file seperti di models/)
+#   manifest.json       daftar versi: checksum tiap file & pasangan vectorizer
+#   CURRENT             nama versi aktif (diganti atomik lewat os.replace)
+# Predictor memuat versi yang ditunjuk CURRENT, memverifikasi checksum &
+# pasangan vectorizer-nya, lalu memasangnya tanpa restart (lihat
+# predictor.refresh_models).
+#   python -m utils.model_registry list
+#   python -m utils.model_registry import models --version v2
+#   python -m utils.model_registry activate v2
+
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+MODEL_FILES = {"XGBoost": "xgb_model2.json", "LightGBM": "lgbm_model2.pkl"}
+VECTORIZER_FILE = "tfidf_vectorizer.pkl"
+# Turunan vectorizer / model (opsional, ikut dicatat checksum-nya bila ada)
+DERIVED_FILES = ("tfidf_fast.npz", "xgb_model2_trees.npz", "lgbm_model2_trees.npz",
+                 "hoaxcheck.bundle")
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, content):
+    # Tulis ke file sementara lalu ganti, pembaca tidak pernah melihat isi setengah jadi
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def feature_counts(directory):
+    """
+    Jumlah fitur vectorizer & setiap model di directory (untuk cek pasangan).
+    Return: dict "vectorizer"/nama model -> int
+    """
+    import joblib
+    import xgboost as xgb
+    xgb_model = xgb.Booster()
+    xgb_model.load_model(os.path.join(directory, MODEL_FILES["XGBoost"]))
+    return {
+        "vectorizer": len(joblib.load(os.path.join(directory, VECTORIZER_FILE)).vocabulary_),
+        "XGBoost": xgb_model.num_features(),
+        "LightGBM": joblib.load(os.path.join(directory, MODEL_FILES["LightGBM"])).num_feature(),
+    }
+
+
+class ModelRegistry:
+    """
+    Registry versi model di direktori root.
+    - root: direktori registry (berisi versions/, manifest.json, CURRENT)
+    """
+
+    def __init__(self, root="models"):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_FILE)
+        self.current_path = os.path.join(root, CURRENT_FILE)
+
+    def version_dir(self, version):
+        """Return: direktori artefak version"""
+        return os.path.join(self.root, "versions", version)
+
+    def manifest(self):
+        """Return: isi manifest.json ({"versions": {}} bila belum ada)."""
+        if not os.path.exists(self.manifest_path):
+            return {"versions": {}}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def entry(self, version):
+        """Return: entri manifest version (KeyError bila tidak terdaftar)."""
+        versions = self.manifest()["versions"]
+        if version not in versions:
+            raise KeyError(f"versi {version!r} tidak terdaftar di {self.manifest_path}")
+        return versions[version]
+
+    def current(self):
+        """Return: nama versi aktif (isi CURRENT), atau None bila belum ada."""
+        try:
+            with open(self.current_path, encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def register(self, version, vectorizer_sha256=None, check_features=True, **info):
+        """
+        Catat versi yang artefaknya sudah ada di version_dir(version).
+        - vectorizer_sha256: checksum vectorizer yang dipakai saat model dilatih
+          (None = vectorizer di direktori versi); harus sama dengan vectorizer
+          di direktori versi
+        - check_features: cocokkan jumlah fitur model dengan vocabulary vectorizer
+        - info: keterangan tambahan (mis. base_version, rows)
+        Return: entri manifest
+        """
+        directory = self.version_dir(version)
+        names = [VECTORIZER_FILE, *MODEL_FILES.values()]
+        missing = [name for name in names if not os.path.exists(os.path.join(directory, name))]
+        if missing:
+            raise FileNotFoundError(f"versi {version}: file tidak ada: {', '.join(missing)}")
+        names += [name for name in DERIVED_FILES if os.path.exists(os.path.join(directory, name))]
+        files = {name: file_sha256(os.path.join(directory, name)) for name in names}
+
+        vectorizer = {"file": VECTORIZER_FILE, "sha256": files[VECTORIZER_FILE]}
+        if vectorizer_sha256 and vectorizer_sha256 != vectorizer["sha256"]:
+            raise ValueError(f"versi {version}: model dilatih dengan vectorizer lain "
+                             f"({vectorizer_sha256[:16]} != {vectorizer['sha256'][:16]})")
+        if check_features:
+            counts = feature_counts(directory)
+            vectorizer["n_features"] = counts["vectorizer"]
+            wrong = [model_option for model_option in MODEL_FILES
+                     if counts[model_option] != counts["vectorizer"]]
+            if wrong:
+                raise ValueError(f"versi {version}: jumlah fitur {', '.join(wrong)} tidak "
+                                 f"sama dengan vocabulary vectorizer ({counts})")
+
+        entry = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "files": files,
+            "vectorizer": vectorizer,
+            "models": {model_option: {"file": name, "vectorizer": vectorizer["sha256"]}
+                       for model_option, name in MODEL_FILES.items()},
+            **info,
+        }
+        manifest = self.manifest()
+        manifest["versions"][version] = entry
+        _write_atomic(self.manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1))
+        return entry
+
+    def import_directory(self, source, version, vectorizer_path=None, **info):
+        """
+        Salin artefak dari direktori lama (mis. models/) sebagai versi baru.
+        - vectorizer_path: vectorizer pasangan model (default source/tfidf_vectorizer.pkl)
+        Return: entri manifest
+        """
+        directory = self.version_dir(version)
+        if os.path.exists(directory):
+            raise FileExistsError(f"versi {version} sudah ada: {directory}")
+        tmp_directory = os.path.join(os.path.dirname(directory), f".{version}.tmp")
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        os.makedirs(tmp_directory)
+        shutil.copy2(vectorizer_path or os.path.join(source, VECTORIZER_FILE),
+                     os.path.join(tmp_directory, VECTORIZER_FILE))
+        for name in (*MODEL_FILES.values(), *DERIVED_FILES):
+            if os.path.exists(os.path.join(source, name)):
+                shutil.copy2(os.path.join(source, name), os.path.join(tmp_directory, name))
+        os.rename(tmp_directory, directory)
+        return self.register(version, imported_from=os.path.abspath(source), **info)
+
+    def verify(self, version):
+        """
+        Cocokkan checksum file versi dengan manifest dan pastikan setiap model
+        berpasangan dengan vectorizer versi itu.
+        Return: entri manifest (ValueError bila tidak cocok)
+        """
+        entry = self.entry(version)
+        directory = self.version_dir(version)
+        for name, sha256 in entry["files"].items():
+            path = os.path.join(directory, name)
+            if not os.path.exists(path):
+                raise ValueError(f"versi {version}: file {name} hilang")
+            if file_sha256(path) != sha256:
+                raise ValueError(f"versi {version}: checksum {name} tidak cocok dengan manifest")
+        for model_option, model in entry["models"].items():
+            if model["vectorizer"] != entry["vectorizer"]["sha256"]:
+                raise ValueError(f"versi {version}: {model_option} tidak berpasangan "
+                                 f"dengan vectorizer versi ini")
+        return entry
+
+    def activate(self, version):
+        """Arahkan CURRENT ke version (harus terdaftar & lolos verify)."""
+        self.verify(version)
+        _write_atomic(self.current_path, version + "\n")
+
+
+def _print_versions(registry):
+    current = registry.current()
+    for version, entry in sorted(registry.manifest()["versions"].items()):
+        marker = "*" if version == current else " "
+        print(f"{marker} {version:<20} {entry['created']}  vectorizer "
+              f"{entry['vectorizer']['sha256'][:12]}  base {entry.get('base_version') or '-'}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Registry versi model HoaxCheck")
+    parser.add_argument("--root", default=os.environ.get("HOAXCHECK_MODEL_DIR", "models"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="daftar versi (* = aktif)")
+    command = commands.add_parser("import", help="salin artefak direktori lama sebagai versi baru")
+    command.add_argument("source")
+    command.add_argument("--version", required=True)
+    command.add_argument("--vectorizer", default=None, help="vectorizer pasangan model")
+    command = commands.add_parser("register", help="catat versi yang sudah ada di versions/")
+    command.add_argument("version")
+    command = commands.add_parser("verify", help="cek checksum & pasangan vectorizer")
+    command.add_argument("version")
+    command = commands.add_parser("activate", help="arahkan CURRENT ke versi")
+    command.add_argument("version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    try:
+        if args.command == "import":
+            registry.import_directory(args.source, args.version, args.vectorizer)
+        elif args.command == "register":
+            registry.register(args.version)
+        elif args.command == "verify":
+            registry.verify(args.version)
+            print(f"[INFO] Versi {args.version} cocok dengan manifest")
+        elif args.command == "activate":
+            registry.activate(args.version)
+            print(f"[INFO] Versi aktif: {args.version}")
+    except (KeyError, ValueError, OSError) as e:
+        sys.exit(f"[ERROR] {e.args[0] if e.args else e}")
+    _print_versions(registry)
@@ -1,32 +1,496 @@
+import os
 import re
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+import json
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from utils import metrics
 
-# Inisialisasi factory Sastrawi sekali saja
-stopword_factory = StopWordRemoverFactory()
-stopword_remover = stopword_factory.create_stop_word_remover()
+# Ukuran maksimum cache stem (jumlah kata), bisa diatur lewat environment
+STEM_CACHE_SIZE = int(os.environ.get("HOAXCHECK_STEM_CACHE_SIZE", 50000))
+# File cache stem yang dimuat saat import (opsional)
+STEM_CACHE_PATH = os.environ.get("HOAXCHECK_STEM_CACHE")
+# Tabel stem hasil langkah offline (python -m utils.stem_table): bentuk kata
+# -> stem Sastrawi untuk kata yang umum di korpus, dicek sebelum stem_cache.
+# Bila file tidak ada, semua kata di-stem lewat Sastrawi seperti biasa.
+STEM_TABLE_PATH = os.environ.get("HOAXCHECK_STEM_TABLE", "models/stem_table.json")
 
-stemmer_factory = StemmerFactory()
-stemmer = stemmer_factory.create_stemmer()
+# Artikel yang lebih panjang dari ini (karakter) diproses per chunk dengan
+# memori terbatas, lihat LongText
+LONG_TEXT_CHARS = int(os.environ.get("HOAXCHECK_LONG_TEXT_CHARS", 20000))
+# Batas jumlah kata (setelah normalisasi) per artikel; kata setelahnya
+# diabaikan (0 = tanpa batas)
+MAX_TOKENS = int(os.environ.get("HOAXCHECK_MAX_TOKENS", 20000))
+# Ukuran potongan teks input per chunk (karakter, dipotong di whitespace)
+CHUNK_CHARS = 16384
+# Jumlah kata cleaned_text yang ditampilkan untuk artikel yang melebihi
+# MAX_TOKENS kata (hasil klasifikasi predictor hanya memuat preview ini;
+# clean_text tetap utuh)
+PREVIEW_WORDS = 300
+
+# Isi tabel stem (read-only setelah load_sastrawi, tanpa lock)
+stem_table = {}
+
+# Filter kata sebelum stemming (lihat set_word_filter), None = semua kata di-stem
+word_filter = None
+
+
+class StemCache:
+    """
+    Cache LRU untuk hasil stemming per kata.
+    - stem_word: fungsi stemming satu kata
+    - maxsize: jumlah kata maksimum (None = tanpa batas)
+    """
+
+    def __init__(self, stem_word, maxsize=STEM_CACHE_SIZE):
+        self.stem_word = stem_word
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def stem(self, word):
+        with self._lock:
+            if word in self._data:
+                self._data.move_to_end(word)
+                self.hits += 1
+                return self._data[word]
+            self.misses += 1
+
+        stem = self.stem_word(word)
+        with self._lock:
+            self._data[word] = stem
+            self._evict()
+        return stem
+
+    def _evict(self):
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return: dict berisi hits, misses, size, maxsize, hit_rate."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, path):
+        """Simpan isi cache (urutan LRU) ke file JSON."""
+        with self._lock:
+            items = list(self._data.items())
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False)
+
+    def load(self, path):
+        """Muat isi cache dari file JSON hasil save()."""
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f)
+        with self._lock:
+            for word, stem in items:
+                self._data[word] = stem
+                self._data.move_to_end(word)
+            self._evict()
+
+
+def load_stem_table(path):
+    """Return: dict bentuk kata -> stem dari file hasil utils.stem_table."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["stems"]
+
+
+# Objek Sastrawi (stopword_remover, stemmer, stem_cache, ...) dibuat saat
+# pertama dibutuhkan, bukan saat import, lihat load_sastrawi()
+_sastrawi_lock = threading.Lock()
+_sastrawi_loaded = False
+
+def load_sastrawi():
+    """Inisialisasi factory Sastrawi sekali saja (thread-safe)."""
+    global stopword_factory, stopword_remover, stopwords, stemmer_factory, stemmer
+    global stem_cache, stem_table, _sastrawi_loaded
+    with _sastrawi_lock:
+        if _sastrawi_loaded:
+            return
+        from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+        stopword_factory = StopWordRemoverFactory()
+        stopword_remover = stopword_factory.create_stop_word_remover()
+        # Dictionary Sastrawi berupa list; set untuk LongText
+        stopwords = frozenset(stopword_remover.get_dictionary().words)
+
+        stemmer_factory = StemmerFactory()
+        stemmer = stemmer_factory.create_stemmer()
+
+        # Stemmer Sastrawi tanpa cache bawaannya (cache bawaan tidak terbatas)
+        stem_cache = StemCache(_stem_word_function())
+        if STEM_CACHE_PATH and os.path.exists(STEM_CACHE_PATH):
+            stem_cache.load(STEM_CACHE_PATH)
+        if STEM_TABLE_PATH and os.path.exists(STEM_TABLE_PATH):
+            stem_table = load_stem_table(STEM_TABLE_PATH)
+        _sastrawi_loaded = True
+
+def _stem_word_function():
+    # Fungsi stemming satu kata untuk StemCache, dengan word_filter bila ada
+    stem_word = stemmer.delegatedStemmer.stem_word
+    if word_filter is None:
+        return stem_word
+    keep = word_filter
+    return lambda word: stem_word(word) if keep(word) else word
+
+def set_word_filter(new_filter):
+    """
+    Pasang filter kata sebelum stemming: kata dengan new_filter(word) False
+    tidak di-stem (dibiarkan apa adanya), mis. utils.vocab_filter untuk kata
+    yang stem-nya pasti bukan fitur TF-IDF. None = semua kata di-stem.
+    stem_cache dikosongkan karena isinya bergantung pada filter.
+    """
+    global word_filter
+    load_sastrawi()
+    word_filter = new_filter
+    stem_cache.stem_word = _stem_word_function()
+    stem_cache.clear()
+
+def __getattr__(name):
+    # Akses atribut Sastrawi sebelum clean_text pertama kali dipanggil
+    if name in ("stopword_factory", "stopword_remover", "stopwords",
+                "stemmer_factory", "stemmer", "stem_cache"):
+        load_sastrawi()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Satu pola untuk seluruh normalisasi: URL (dicocokkan pada teks asli,
+# sebelum huruf kapital diubah) atau deretan karakter selain huruf & spasi.
+# Angka ikut terhapus di sini, jadi tidak perlu langkah hapus angka terpisah.
+_NORMALIZE_RE = re.compile(r'(?:http|www)\S+|[^a-zA-Z\s]+')
+
+def normalize_text(text: str) -> str:
+    """
+    Hapus URL dan karakter selain huruf, lowercase, lalu rapikan
+    whitespace menjadi satu spasi.
+    """
+    return ' '.join(normalize_words(text))
+
+def normalize_words(text: str) -> list:
+    """
+    Seperti normalize_text, tetapi tanpa menggabungkan hasilnya.
+    Return: list kata (huruf kecil a-z)
+    """
+    started = metrics.start()
+    # str.split() dan \s pada regex memakai definisi whitespace yang sama
+    words = _NORMALIZE_RE.sub('', text).lower().split()
+    if started is not None:
+        metrics.stop("normalize", started)
+        metrics.observe(metrics.INPUT_CHARS, len(text))
+    return words
 
 def clean_text(text: str) -> str:
     """
     Membersihkan teks dari URL, karakter tidak penting,
     lowercase, hapus angka, hapus stopword, dan stemming.
     """
-    # Hapus URL
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-    # Hapus karakter selain huruf dan spasi
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    # Case folding
-    text = text.lower()
-    # Hapus angka 
-    text = re.sub(r'\d+', '', text)
-    # Hapus whitespace berlebih 
-    text = re.sub(r'\s+', ' ', text).strip()
-    # Stopword removal
-    text = stopword_remover.remove(text)
-    # Stemming
-    text = stemmer.stem(text)
-
-    return text
+    return ' '.join(clean_tokens(text))
+
+def clean_tokens(text: str) -> list:
+    """
+    Seperti clean_text, tetapi tanpa menggabungkan hasilnya: teks
+    dinormalisasi sekali, lalu hapus stopword & stemming dikerjakan pada
+    list kata yang sama.
+    Return: list kata hasil stemming (bisa langsung ke FastTfidf.transform)
+    """
+    # Hapus URL, karakter selain huruf, angka, whitespace berlebih + case folding
+    return clean_words(normalize_words(text))
+
+def score_tokens(text: str) -> list:
+    """
+    Dokumen untuk jalur klasifikasi: sama dengan clean_tokens, kecuali
+    artikel panjang (is_long_text) diproses per chunk lewat LongText dan
+    dibatasi MAX_TOKENS kata (sama dengan classify_text).
+    Return: list kata hasil stemming
+    """
+    if is_long_text(text):
+        return [word for chunk in LongText(text).chunks() for word in chunk]
+    return clean_tokens(text)
+
+def clean_normalized(text: str) -> str:
+    """
+    Sisa langkah clean_text (hapus stopword & stemming) untuk teks yang
+    sudah melalui normalize_text.
+    """
+    return ' '.join(clean_words(text.split()))
+
+def clean_words(words: list) -> list:
+    """
+    Hapus stopword & stemming untuk list kata hasil normalize_words.
+    Return: list kata hasil stemming
+    """
+    if not _sastrawi_loaded:
+        load_sastrawi()
+    started = metrics.start()
+    words = remove_stopwords(words)
+    started = metrics.stop("stopword", started)
+    stems = stem_words(words)
+    if started is not None:
+        metrics.stop("stemming", started)
+        metrics.observe(metrics.TOKENS, len(stems))
+    return stems
+
+# StopWordRemover Sastrawi menghapus elemen list yang sedang di-iterasi:
+# setiap stopword yang dikunjungi menghapus kemunculan pertama kata itu, dan
+# kata sesudahnya terlewati (tidak dicek). Hasilnya: n kemunculan pertama
+# tiap stopword dihapus, n = jumlah kunjungan. _count_removals menghitung n,
+# _drop_removed menghapusnya, keduanya linear (list.remove Sastrawi kuadratik).
+
+def _count_removals(words, removed, skip=False):
+    # removed: dict stopword -> n (ditambah); skip: kata pertama terlewati
+    # (lanjutan chunk sebelumnya). Return: skip untuk chunk berikutnya
+    for word in words:
+        if skip:
+            skip = False
+        elif word in stopwords:
+            removed[word] = removed.get(word, 0) + 1
+            skip = True
+    return skip
+
+def _drop_removed(words, remaining):
+    # remaining: dict stopword -> jumlah kemunculan yang masih harus dihapus (dikurangi)
+    kept = []
+    for word in words:
+        if remaining.get(word):
+            remaining[word] -= 1
+        else:
+            kept.append(word)
+    return kept
+
+def remove_stopwords(words: list) -> list:
+    """
+    Hapus stopword dari list kata; hasilnya sama dengan
+    stopword_remover.remove(' '.join(words)) tanpa split/join string.
+    Return: list kata baru
+    """
+    if not _sastrawi_loaded:
+        load_sastrawi()
+    removed = {}
+    _count_removals(words, removed)
+    return _drop_removed(words, removed) if removed else list(words)
+
+def stem_words(words: list) -> list:
+    """
+    Stemming per kata lewat stem_table, lalu stem_cache untuk kata yang
+    tidak ada di tabel (setara stemmer.stem untuk teks yang sudah bersih:
+    huruf kecil a-z dipisah satu spasi).
+    Return: list stem
+    """
+    if not _sastrawi_loaded:
+        load_sastrawi()
+    lookup = stem_table.get
+    stem = stem_cache.stem
+    return [lookup(word) or stem(word) for word in words]
+
+_SPACE_RE = re.compile(r'\s')
+
+def exceeds_max_tokens(text: str) -> bool:
+    """
+    True bila text melebihi MAX_TOKENS kata setelah normalisasi, yaitu kata
+    setelahnya diabaikan saat klasifikasi (dihitung per chunk, tanpa stemming).
+    """
+    # Setiap kata paling sedikit satu huruf + satu spasi
+    if not MAX_TOKENS or len(text) < 2 * MAX_TOKENS + 1:
+        return False
+    count = 0
+    for words in _normalized_pieces(text, CHUNK_CHARS):
+        count += len(words)
+        if count > MAX_TOKENS:
+            return True
+    return False
+
+def _normalized_pieces(text, chunk_chars):
+    # normalize_text per potongan text; potongan berakhir di whitespace,
+    # dan URL / deretan karakter yang dihapus tidak pernah memuat
+    # whitespace, jadi hasilnya sama dengan normalize_text seluruh text
+    pos = 0
+    while pos < len(text):
+        match = _SPACE_RE.search(text, pos + chunk_chars)
+        end = match.end() if match else len(text)
+        yield _NORMALIZE_RE.sub('', text[pos:end]).lower().split()
+        pos = end
+
+def is_long_text(text: str) -> bool:
+    """
+    True bila text diproses lewat LongText: lebih panjang dari
+    LONG_TEXT_CHARS, atau cukup panjang untuk melebihi MAX_TOKENS kata
+    (setiap kata paling sedikit satu huruf + satu spasi).
+    """
+    limit = LONG_TEXT_CHARS
+    if MAX_TOKENS:
+        limit = min(limit, 2 * MAX_TOKENS - 1)
+    return len(text) > limit
+
+
+class LongText:
+    """
+    Preprocessing artikel panjang per chunk dengan memori terbatas: hasil
+    normalize_text, hapus stopword, dan stemming tidak pernah dibangun
+    sebagai satu string utuh.
+    - text: teks input (gabungan judul & isi)
+    - max_tokens: batas jumlah kata setelah normalisasi (None = MAX_TOKENS,
+      0 = tanpa batas); kata setelahnya diabaikan
+    - chunk_chars: ukuran potongan text per chunk (None = CHUNK_CHARS)
+
+    Teks dibaca dua kali: scan pertama (saat dibuat) menghitung jumlah kata,
+    digest, dan stopword yang dihapus; chunks() lalu menghapus stopword dan
+    men-stem per chunk. Hasil chunks() disambung sama persis dengan
+    clean_tokens(text) tanpa batas token, untuk teks di bawah batas.
+    """
+
+    def __init__(self, text, max_tokens=None, chunk_chars=None):
+        if not _sastrawi_loaded:
+            load_sastrawi()
+        self.text = text
+        self.max_tokens = MAX_TOKENS if max_tokens is None else max_tokens
+        self.chunk_chars = chunk_chars or CHUNK_CHARS
+        # Jumlah kata setelah normalisasi (paling banyak max_tokens)
+        self.tokens = 0
+        # True bila ada kata setelah max_tokens yang diabaikan
+        self.truncated = False
+        # Jumlah kata hasil chunks() & kata untuk preview() (semuanya, atau
+        # PREVIEW_WORDS kata pertama bila truncated)
+        self.kept_tokens = 0
+        self.preview_words = []
+        self._removed = {}
+        self._scan()
+
+    def normalized_chunks(self):
+        """Generator list kata hasil normalize_text per chunk (sampai max_tokens kata)."""
+        count = 0
+        for words in _normalized_pieces(self.text, self.chunk_chars):
+            truncated = self.max_tokens and count + len(words) > self.max_tokens
+            if truncated:
+                words = words[:self.max_tokens - count]
+                self.truncated = True
+            count += len(words)
+            if words:
+                yield words
+            if truncated:
+                return
+
+    def _scan(self):
+        # Jumlah stopword yang dihapus dihitung di sini, dihapus di chunks()
+        started = metrics.start()
+        digest = hashlib.sha256()
+        skip = False
+        for words in self.normalized_chunks():
+            digest.update(((' ' if self.tokens else '') + ' '.join(words)).encode("utf-8"))
+            self.tokens += len(words)
+            skip = _count_removals(words, self._removed, skip)
+        # sha256 teks hasil normalisasi, pengganti teks itu di kunci
+        # result_cache (hex memuat angka, jadi tidak pernah sama dengan teks
+        # hasil normalize_text)
+        self.digest = digest.hexdigest()
+        if started is not None:
+            metrics.stop("normalize", started)
+            metrics.observe(metrics.INPUT_CHARS, len(self.text))
+
+    def chunks(self):
+        """
+        Hapus stopword & stemming per chunk.
+        Return: generator list kata hasil stemming (tidak kosong)
+        """
+        started = metrics.start()
+        remaining = dict(self._removed)
+        preview = self.preview_words = []
+        # Tanpa kata yang diabaikan, jumlah kata sudah dibatasi max_tokens
+        limit = PREVIEW_WORDS if self.truncated else None
+        kept = 0
+        for words in self.normalized_chunks():
+            stems = stem_words(_drop_removed(words, remaining))
+            if stems:
+                kept += len(stems)
+                if limit is None:
+                    preview.extend(stems)
+                elif len(preview) < limit:
+                    preview.extend(stems[:limit - len(preview)])
+                yield stems
+        self.kept_tokens = kept
+        if started is not None:
+            metrics.stop("stemming", started)
+            metrics.observe(metrics.TOKENS, kept)
+
+    def preview(self):
+        """
+        cleaned_text untuk ditampilkan (dipanggil setelah chunks() selesai):
+        seluruh hasil chunks(), atau PREVIEW_WORDS kata pertamanya diakhiri
+        "..." bila ada kata setelah max_tokens yang diabaikan (truncated).
+        Return: list kata
+        """
+        tokens = list(self.preview_words)
+        if self.truncated:
+            tokens.append("...")
+        return tokens
+
+def _init_worker(cache_path, new_word_filter=None):
+    """Initializer proses worker: cache stem baru per proses."""
+    global stem_cache, word_filter
+    load_sastrawi()
+    word_filter = new_word_filter
+    stem_cache = StemCache(_stem_word_function())
+    if cache_path and os.path.exists(cache_path):
+        stem_cache.load(cache_path)
+
+def _clean_function(tokens=False, score=False):
+    if score:
+        return score_tokens
+    return clean_tokens if tokens else clean_text
+
+def _clean_chunk(texts, tokens=False, score=False):
+    clean = _clean_function(tokens, score)
+    return [clean(text) for text in texts]
+
+def clean_texts(texts, workers=None, chunksize=256, tokens=False, score=False):
+    """
+    Jalankan clean_text untuk banyak teks dengan process pool.
+    - texts: iterable str
+    - workers: jumlah proses (None = os.cpu_count(), 1 = tanpa pool)
+    - chunksize: jumlah teks per tugas worker
+    - tokens: True = hasil clean_tokens (list kata) alih-alih str
+    - score: True = hasil score_tokens (list kata, artikel panjang dibatasi
+      MAX_TOKENS seperti jalur klasifikasi)
+    Return: generator str (atau list kata) sesuai urutan input
+
+    Stemming Sastrawi murni Python (terikat GIL), jadi paralelisme lewat
+    proses. Jumlah chunk yang sedang diproses dibatasi 2x jumlah worker
+    sehingga input besar tetap di-stream.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(_clean_function(tokens, score), texts)
+        return
+
+    texts = iter(texts)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(STEM_CACHE_PATH, word_filter)) as executor:
+        pending = deque()
+        while True:
+            chunk = list(islice(texts, chunksize))
+            if chunk:
+                pending.append(executor.submit(_clean_chunk, chunk, tokens, score))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                yield from pending.popleft().result()
+            elif not chunk:
+                return
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_key(*parts):
+    """
+    Kunci cache dari beberapa string (mis. identitas model + teks).
+    Return: str hex sha256
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Cache hasil klasifikasi dengan batas ukuran (LRU) dan umur (TTL).
+    - maxsize: jumlah entri maksimum di memori (0 = cache nonaktif)
+    - ttl: umur entri dalam detik (None = tidak kedaluwarsa)
+    - path: file SQLite opsional, dipakai bersama oleh beberapa proses
+      (entri di disk juga dibatasi maxsize, yang terlama dibuang)
+    Nilai harus bisa diserialisasi JSON bila path dipakai.
+    """
+
+    # Pembersihan entri disk (kedaluwarsa & kelebihan) tiap sekian set()
+    _PRUNE_EVERY = 256
+
+    def __init__(self, maxsize=10000, ttl=None, path=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self._writes = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key, default=None):
+        if not self.enabled:
+            return default
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            if self.path:
+                row = self._connect().execute(
+                    "SELECT value, expires FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None and (row[1] is None or row[1] > now):
+                    value = json.loads(row[0])
+                    self._store(key, value, row[1])
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._store(key, value, expires)
+            if self.path:
+                db = self._connect()
+                with db:
+                    db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                               (key, json.dumps(value), expires, time.time()))
+                self._writes += 1
+                if self._writes % self._PRUNE_EVERY == 0:
+                    self._prune_disk()
+
+    def _store(self, key, value, expires):
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _connect(self):
+        # Koneksi SQLite tidak boleh dipakai lintas fork: buka ulang per proses
+        if self._db is None or self._db_pid != os.getpid():
+            self._db_pid = os.getpid()
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            with self._db:
+                self._db.execute("CREATE TABLE IF NOT EXISTS results ("
+                                 "key TEXT PRIMARY KEY, value TEXT, expires REAL, created REAL)")
+        return self._db
+
+    def _prune_disk(self):
+        db = self._connect()
+        with db:
+            db.execute("DELETE FROM results WHERE expires IS NOT NULL AND expires <= ?",
+                       (time.time(),))
+            db.execute("DELETE FROM results WHERE key IN (SELECT key FROM results "
+                       "ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return: dict berisi hits, disk_hits, misses, size, maxsize, hit_rate."""
+        total = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+        }
+
+    def clear(self):
+        """Kosongkan cache di memori dan di disk, reset statistik."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            if self.path:
+                db = self._connect()
+                with db:
+                    db.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,116 @@
+import threading
+
+# Statistik shadow scoring: skor model utama dibandingkan dengan skor versi
+# kandidat untuk artikel yang sama (lihat predictor.configure_shadow).
+# Hanya angka agregat yang disimpan, jadi ukurannya tetap berapa pun jumlah
+# request, dan bisa digabung dari beberapa proses worker (drain/merge).
+
+# Batas atas |skor kandidat - skor utama| per bucket histogram drift
+DRIFT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5)
+
+_COUNTERS = ("rows", "agree", "hoax_primary", "hoax_candidate", "dropped", "errors",
+             "diff_sum", "abs_diff_sum", "seconds")
+
+
+def _empty():
+    stats = dict.fromkeys(_COUNTERS, 0)
+    stats["max_abs_diff"] = 0.0
+    stats["drift_counts"] = [0] * (len(DRIFT_BUCKETS) + 1)
+    return stats
+
+
+class ShadowStats:
+    """Agregat perbandingan skor utama vs kandidat per model option (thread-safe)."""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model_option):
+        stats = self._stats.get(model_option)
+        if stats is None:
+            stats = self._stats[model_option] = _empty()
+        return stats
+
+    def add(self, model_option, primary_scores, candidate_scores, threshold=0.5, seconds=0.0):
+        """
+        Catat skor beberapa artikel.
+        - primary_scores, candidate_scores: np.ndarray skor HOAX per artikel
+        - seconds: durasi shadow scoring (di thread latar)
+        """
+        diff = candidate_scores - primary_scores
+        abs_diff = abs(diff)
+        primary_hoax = primary_scores > threshold
+        candidate_hoax = candidate_scores > threshold
+        drift = [int(((abs_diff > low) & (abs_diff <= high)).sum())
+                 for low, high in zip((-1.0,) + DRIFT_BUCKETS, DRIFT_BUCKETS + (float("inf"),))]
+        with self._lock:
+            stats = self._model(model_option)
+            stats["rows"] += len(diff)
+            stats["agree"] += int((primary_hoax == candidate_hoax).sum())
+            stats["hoax_primary"] += int(primary_hoax.sum())
+            stats["hoax_candidate"] += int(candidate_hoax.sum())
+            stats["diff_sum"] += float(diff.sum())
+            stats["abs_diff_sum"] += float(abs_diff.sum())
+            stats["max_abs_diff"] = max(stats["max_abs_diff"], float(abs_diff.max(initial=0.0)))
+            stats["seconds"] += seconds
+            stats["drift_counts"] = [a + b for a, b in zip(stats["drift_counts"], drift)]
+
+    def count(self, model_option, name, rows=1):
+        """Tambah counter "dropped" (antrean penuh) atau "errors"."""
+        with self._lock:
+            self._model(model_option)[name] += rows
+
+    def snapshot(self):
+        """Return: dict model option -> counter mentah, bisa di-pickle."""
+        with self._lock:
+            return {model_option: dict(stats, drift_counts=list(stats["drift_counts"]))
+                    for model_option, stats in self._stats.items()}
+
+    def drain(self):
+        """Seperti snapshot, lalu kosongkan (mis. di akhir batch worker)."""
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return stats
+
+    def merge(self, snapshot):
+        """Tambahkan hasil snapshot/drain dari proses lain."""
+        with self._lock:
+            for model_option, other in snapshot.items():
+                stats = self._model(model_option)
+                for name in _COUNTERS:
+                    stats[name] += other[name]
+                stats["max_abs_diff"] = max(stats["max_abs_diff"], other["max_abs_diff"])
+                stats["drift_counts"] = [a + b for a, b in
+                                         zip(stats["drift_counts"], other["drift_counts"])]
+
+    def summary(self):
+        """
+        Return: dict model option -> ringkasan (rows, agreement, mean_diff,
+                mean_abs_diff, max_abs_diff, hoax_rate primary/candidate,
+                drift histogram, dropped, errors, mean_seconds per artikel)
+        """
+        summary = {}
+        for model_option, stats in self.snapshot().items():
+            rows = stats["rows"]
+            per_row = (lambda value: value / rows) if rows else (lambda value: None)
+            summary[model_option] = {
+                "rows": rows,
+                "agreement": per_row(stats["agree"]),
+                "mean_diff": per_row(stats["diff_sum"]),
+                "mean_abs_diff": per_row(stats["abs_diff_sum"]),
+                "max_abs_diff": stats["max_abs_diff"],
+                "hoax_rate_primary": per_row(stats["hoax_primary"]),
+                "hoax_rate_candidate": per_row(stats["hoax_candidate"]),
+                "drift": {("+Inf" if high == float("inf") else str(high)): count
+                          for high, count in zip(DRIFT_BUCKETS + (float("inf"),),
+                                                 stats["drift_counts"])},
+                "dropped": stats["dropped"],
+                "errors": stats["errors"],
+                "mean_seconds": per_row(stats["seconds"]),
+            }
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._stats = {}
@@ -0,0 +1,107 @@
+import os
+import csv
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from utils import preprocessing
+from utils.preprocessing import load_sastrawi, normalize_text
+
+# Langkah offline: tabel bentuk kata -> stem untuk kata yang umum di korpus
+# (plus seluruh term vocabulary TF-IDF), disimpan di samping model. Stem di
+# tabel dihitung dengan fungsi Sastrawi yang sama dengan stem_cache, jadi
+# clean_text (dan vektor TF-IDF) identik dengan atau tanpa tabel.
+#   python -m utils.stem_table korpus.jsonl [korpus2.csv ...] [--output models/stem_table.json]
+
+
+def read_texts(path):
+    """
+    Teks dari file korpus: JSONL/CSV dengan kolom judul & isi, selain itu
+    satu teks per baris.
+    Return: generator str
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield f"{record.get('judul') or ''} {record.get('isi') or ''}"
+        elif path.lower().endswith(".csv"):
+            for record in csv.DictReader(f):
+                yield f"{record.get('judul') or ''} {record.get('isi') or ''}"
+        else:
+            yield from f
+
+
+def count_words(texts):
+    """
+    Hitung bentuk kata yang sampai ke tahap stemming (setelah normalize_text
+    dan hapus stopword).
+    Return: Counter kata -> frekuensi
+    """
+    load_sastrawi()
+    counts = Counter()
+    for text in texts:
+        counts.update(preprocessing.stopword_remover.remove(normalize_text(text)).split())
+    return counts
+
+
+def _stem_words(words):
+    load_sastrawi()
+    # Stemmer Sastrawi langsung (tanpa word_filter stem_cache)
+    stem_word = preprocessing.stemmer.delegatedStemmer.stem_word
+    return [stem_word(word) for word in words]
+
+
+def build_stem_table(texts=(), words=(), min_count=2, max_size=None, workers=1):
+    """
+    - texts: iterable teks korpus
+    - words: kata tambahan yang selalu masuk tabel (mis. term vocabulary TF-IDF)
+    - min_count: frekuensi minimum kata korpus
+    - max_size: jumlah kata korpus maksimum (yang paling sering; None = semua)
+    - workers: jumlah proses stemming (kata yang tidak ada di kamus Sastrawi
+      bisa memakan puluhan ms per kata)
+    Return: dict bentuk kata -> stem
+    """
+    counts = count_words(texts)
+    common = [word for word, count in counts.most_common(max_size) if count >= min_count]
+    words = sorted(set(common).union(words))
+    if workers == 1:
+        return dict(zip(words, _stem_words(words)))
+    chunks = [words[i:i + 256] for i in range(0, len(words), 256)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        stems = [stem for chunk in executor.map(_stem_words, chunks) for stem in chunk]
+    return dict(zip(words, stems))
+
+
+def save_stem_table(path, table):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"stems": table}, f, ensure_ascii=False)
+
+
+def vocabulary_terms(tfidf_path="models/tfidf_vectorizer.pkl"):
+    """Return: list term unigram vocabulary TF-IDF (bentuk kata yang sudah stem)."""
+    import joblib
+    vocabulary = joblib.load(tfidf_path).vocabulary_
+    return [term for term in vocabulary if " " not in term]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Bangun tabel stem dari korpus & vocabulary TF-IDF")
+    parser.add_argument("inputs", nargs="*", help="file korpus (.jsonl/.csv/teks per baris)")
+    parser.add_argument("--output", default="models/stem_table.json")
+    parser.add_argument("--tfidf", default="models/tfidf_vectorizer.pkl",
+                        help="vectorizer yang term-nya ikut dimasukkan ('' = tidak)")
+    parser.add_argument("--min-count", type=int, default=2)
+    parser.add_argument("--max-size", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="jumlah proses stemming (0 = jumlah CPU)")
+    args = parser.parse_args()
+
+    texts = (text for path in args.inputs for text in read_texts(path))
+    words = vocabulary_terms(args.tfidf) if args.tfidf else ()
+    table = build_stem_table(texts, words, min_count=args.min_count, max_size=args.max_size,
+                             workers=args.workers or os.cpu_count())
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    save_stem_table(args.output, table)
+    print(f"[INFO] {len(table)} kata disimpan ke {args.output}")
@@ -0,0 +1,58 @@
+import os
+
+# Pengaturan thread inferensi & CPU affinity per proses. Tanpa pengaturan,
+# setiap proses worker membuat pool OpenMP seukuran seluruh mesin sehingga
+# beberapa worker saling berebut CPU (oversubscription).
+
+
+def available_cpus():
+    """Return: list index CPU yang boleh dipakai proses ini (terurut)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def default_threads(workers, cpus=None):
+    """Return: jumlah thread per worker agar workers x threads <= jumlah CPU."""
+    cpus = available_cpus() if cpus is None else cpus
+    return max(1, len(cpus) // max(1, workers))
+
+
+def worker_cpus(index, threads, cpus=None, workers=1):
+    """
+    CPU untuk worker ke-index: blok threads CPU berurutan, berputar bila
+    workers x threads melebihi jumlah CPU.
+    - threads: 0 = default library (semua CPU); dengan affinity berarti
+      bagian rata CPU untuk workers worker (default_threads)
+    Return: list index CPU
+    """
+    cpus = available_cpus() if cpus is None else cpus
+    if not threads:
+        threads = default_threads(workers, cpus)
+    threads = min(max(1, threads), len(cpus))
+    start = index * threads % len(cpus)
+    return [cpus[(start + i) % len(cpus)] for i in range(threads)]
+
+
+def pin_cpus(cpus):
+    """
+    Batasi proses ini ke cpus (sched_setaffinity, hanya Linux).
+    Return: True bila affinity diubah
+    """
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return False
+    os.sched_setaffinity(0, cpus)
+    return True
+
+
+def limit_threads(threads):
+    """
+    Batasi pool OpenMP/BLAS yang sudah dimuat (xgboost, lightgbm, numpy)
+    lewat threadpoolctl. Hanya berlaku untuk library yang sudah diimport,
+    jadi panggil lagi setelah memuat model.
+    Return: objek threadpool_limits, atau None bila threads kosong/0
+    """
+    if not threads:
+        return None
+    from threadpoolctl import threadpool_limits
+    return threadpool_limits(limits=threads)
@@ -0,0 +1,332 @@
+import json
+import math
+import numpy as np
+
+# Ambang nol LightGBM (kZeroThreshold)
+_LGBM_ZERO_THRESHOLD = 1e-35
+
+
+class TreeEnsemble:
+    """
+    Ensemble pohon (XGBoost / LightGBM) yang sudah diratakan ke array NumPy.
+    Setiap node punya feature, threshold, anak kiri/kanan, arah default,
+    dan nilai leaf. Prediksi hanya mengevaluasi split pada fitur yang
+    ada di baris sparse; split lain sudah dihitung sekali saat load.
+
+    - kind: "xgboost" (x < threshold, float32, entri sparse kosong = missing)
+            atau "lightgbm" (x <= threshold, float64, entri kosong = 0)
+    """
+
+    _arrays = ("feature", "threshold", "left", "right", "default_left",
+               "missing_zero", "value", "roots")
+    # Tabel turunan dari _prepare(), ikut disimpan di bundle supaya tidak
+    # dihitung ulang (dan disalin) di setiap proses
+    _derived_arrays = ("used_features", "column_map", "threshold_cmp", "leaf_value",
+                       "_eliminate_ptr", "_eliminate_slots", "_eliminate_local",
+                       "_right_if_absent", "_base_eliminations", "_base_leaf_value",
+                       "_split_tree", "_split_order", "_column_ptr", "_splits")
+
+    def __init__(self, kind, feature, threshold, left, right, default_left,
+                 missing_zero, value, roots, base_margin=0.0, sigmoid=1.0,
+                 n_features=None):
+        self.kind = kind
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.missing_zero = np.asarray(missing_zero, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.base_margin = float(base_margin)
+        self.sigmoid = float(sigmoid)
+        self.n_features = int(n_features if n_features is not None else self.feature.max() + 1)
+        self._prepare()
+
+    def _prepare(self):
+        is_split = self.feature >= 0
+        # Hanya kolom yang dipakai split yang perlu dilihat
+        self.used_features = np.unique(self.feature[is_split])
+        self.column_map = np.full(self.n_features, -1, dtype=np.int32)
+        self.column_map[self.used_features] = np.arange(len(self.used_features), dtype=np.int32)
+        if self.kind == "xgboost":
+            self.threshold_cmp = self.threshold.astype(np.float32)
+        else:
+            self.threshold_cmp = self.threshold
+        self._build_leaf_tables()
+
+    def _build_leaf_tables(self):
+        # Evaluasi gaya QuickScorer: leaf tiap pohon diurutkan kiri -> kanan.
+        # Split yang bernilai "false" (ke kanan) mengeliminasi semua leaf di
+        # subtree kirinya; leaf keluar = leaf paling kiri yang tidak tereliminasi.
+        leaf_slots = [self._leaf_order(root) for root in self.roots]
+        self.leaf_width = max(len(leaves) for leaves in leaf_slots)
+        slot_of = {}
+        self.leaf_value = np.zeros((self.n_trees, self.leaf_width), dtype=np.float64)
+        for t, leaves in enumerate(leaf_slots):
+            for j, leaf in enumerate(leaves):
+                slot_of[leaf] = t * self.leaf_width + j
+                self.leaf_value[t, j] = self.value[leaf]
+
+        splits = np.flatnonzero(self.feature >= 0)
+        eliminates = [[slot_of[leaf] for leaf in self._leaf_order(self.left[node])]
+                      for node in splits]
+        self._eliminate_ptr = np.cumsum([0] + [len(slots) for slots in eliminates])
+        self._eliminate_slots = np.array([slot for slots in eliminates for slot in slots],
+                                         dtype=np.int64)
+        self._eliminate_local = self._eliminate_slots % self.leaf_width
+
+        # Arah split bila fitur tidak ada di baris sparse
+        # (XGBoost: missing, LightGBM: bernilai 0)
+        if self.kind == "xgboost":
+            left_if_absent = self.default_left[splits]
+        else:
+            zero_missing = self.missing_zero[splits]
+            left_if_absent = np.where(zero_missing, self.default_left[splits],
+                                      0.0 <= self.threshold_cmp[splits])
+        self._right_if_absent = (~left_if_absent).astype(np.float64)
+        offsets, counts = _expand(self._eliminate_ptr, np.arange(len(splits)))
+        base = np.bincount(self._eliminate_slots[offsets],
+                           weights=np.repeat(self._right_if_absent, counts),
+                           minlength=self.n_trees * self.leaf_width)
+        # Slot kosong (pohon dengan leaf lebih sedikit) tidak boleh terpilih
+        for t, leaves in enumerate(leaf_slots):
+            base[t * self.leaf_width + len(leaves):(t + 1) * self.leaf_width] = 1.0
+        self._base_eliminations = base
+        self._base_leaf_value = self.leaf_value[
+            np.arange(self.n_trees), (base.reshape(self.n_trees, -1) == 0).argmax(axis=1)]
+        self._split_tree = np.searchsorted(self.roots, splits, side="right") - 1
+
+        # Split dikelompokkan per kolom (urutan used_features)
+        split_columns = self.column_map[self.feature[splits]]
+        order = np.argsort(split_columns, kind="stable")
+        self._split_order = order.astype(np.int32)
+        self._column_ptr = np.searchsorted(split_columns[order],
+                                           np.arange(len(self.used_features) + 1))
+        self._splits = splits
+
+    def _leaf_order(self, node):
+        leaves, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            if self.feature[node] < 0:
+                leaves.append(node)
+            else:
+                stack.append(self.right[node])
+                stack.append(self.left[node])
+        return leaves
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    # === Loader ===
+    @classmethod
+    def from_xgboost_json(cls, path):
+        """Ratakan model XGBoost (format JSON, objective binary:logistic)."""
+        with open(path) as f:
+            learner = json.load(f)["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"objective XGBoost tidak didukung: {objective}")
+        base_score = float(learner["learner_model_param"]["base_score"])
+
+        nodes = _NodeTable()
+        for tree in learner["gradient_booster"]["model"]["trees"]:
+            if any(tree["split_type"]):
+                raise ValueError("split kategorikal XGBoost tidak didukung")
+            offset = nodes.size
+            nodes.roots.append(offset)
+            for i, (left, right) in enumerate(zip(tree["left_children"], tree["right_children"])):
+                if left == -1:
+                    nodes.add_leaf(tree["split_conditions"][i])
+                else:
+                    nodes.add_split(tree["split_indices"][i], tree["split_conditions"][i],
+                                    offset + left, offset + right,
+                                    bool(tree["default_left"][i]), False)
+        return nodes.build("xgboost", base_margin=math.log(base_score / (1.0 - base_score)),
+                           n_features=int(learner["learner_model_param"]["num_feature"]))
+
+    @classmethod
+    def from_lightgbm(cls, booster):
+        """Ratakan lightgbm.Booster (objective binary), sampai best_iteration."""
+        return cls.from_lightgbm_dump(booster.dump_model())
+
+    @classmethod
+    def from_lightgbm_dump(cls, model):
+        objective = model["objective"].split()
+        if objective[0] != "binary" or model["num_tree_per_iteration"] != 1:
+            raise ValueError(f"objective LightGBM tidak didukung: {model['objective']}")
+        sigmoid = 1.0
+        for param in objective[1:]:
+            if param.startswith("sigmoid:"):
+                sigmoid = float(param.split(":")[1])
+
+        nodes = _NodeTable()
+        for tree in model["tree_info"]:
+            nodes.roots.append(nodes.size)
+            nodes.add_lightgbm_node(tree["tree_structure"])
+        return nodes.build("lightgbm", sigmoid=sigmoid,
+                           n_features=model["max_feature_idx"] + 1)
+
+    # === Simpan / muat (.npz tanpa pickle) ===
+    def save(self, path):
+        meta = {"kind": self.kind, "base_margin": self.base_margin,
+                "sigmoid": self.sigmoid, "n_features": self.n_features}
+        np.savez(path, meta=np.array(json.dumps(meta)),
+                 **{name: getattr(self, name) for name in self._arrays})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(meta.pop("kind"), **{name: data[name] for name in cls._arrays}, **meta)
+
+    # === Bundle mmap (lihat utils.bundle) ===
+    def to_arrays(self):
+        """Return: (meta dict, dict array) termasuk tabel turunan."""
+        meta = {"kind": self.kind, "base_margin": self.base_margin,
+                "sigmoid": self.sigmoid, "n_features": self.n_features,
+                "leaf_width": self.leaf_width}
+        return meta, {name: getattr(self, name)
+                      for name in self._arrays + self._derived_arrays}
+
+    @classmethod
+    def from_arrays(cls, meta, arrays):
+        """Kebalikan to_arrays; array dipakai apa adanya, _prepare() dilewati."""
+        self = cls.__new__(cls)
+        for name, value in meta.items():
+            setattr(self, name, value)
+        for name in cls._arrays + cls._derived_arrays:
+            setattr(self, name, arrays[name])
+        return self
+
+    # === Prediksi ===
+    def predict_margin(self, X, chunk_rows=1024):
+        """
+        - X: scipy.sparse.csr_matrix (n_rows, n_features), mis. hasil TF-IDF
+        Return: np.ndarray float64 raw score (sebelum sigmoid)
+        """
+        n_rows = X.shape[0]
+        if n_rows <= chunk_rows:
+            return self._margin_chunk(X)
+        margin = np.empty(n_rows, dtype=np.float64)
+        for start in range(0, n_rows, chunk_rows):
+            stop = min(start + chunk_rows, n_rows)
+            margin[start:stop] = self._margin_chunk(X[start:stop])
+        return margin
+
+    def predict(self, X, chunk_rows=1024):
+        """Return: np.ndarray float64 probabilitas kelas positif (HOAX)."""
+        margin = self.predict_margin(X, chunk_rows)
+        return 1.0 / (1.0 + np.exp(-self.sigmoid * margin))
+
+    def _margin_chunk(self, X):
+        n_rows = X.shape[0]
+        columns = self.column_map[X.indices]
+        used = columns >= 0
+        rows = np.repeat(np.arange(n_rows), np.diff(X.indptr))[used]
+
+        # Perluas tiap nilai fitur ke semua split yang memakai fitur tsb
+        offsets, counts = _expand(self._column_ptr, columns[used])
+        split_idx = self._split_order[offsets]
+        node = self._splits[split_idx]
+        x = np.repeat(X.data[used], counts)
+        rows = np.repeat(rows, counts)
+
+        if self.kind == "xgboost":
+            go_left = x.astype(np.float32) < self.threshold_cmp[node]
+        else:
+            go_left = x <= self.threshold_cmp[node]
+            is_missing = self.missing_zero[node] & (np.abs(x) <= _LGBM_ZERO_THRESHOLD)
+            go_left = np.where(is_missing, self.default_left[node], go_left)
+
+        # Hanya pasangan (baris, pohon) yang punya split berubah arah dibanding
+        # kondisi "semua fitur kosong" yang perlu dicari ulang leaf keluarnya
+        delta = (~go_left).astype(np.float64) - self._right_if_absent[split_idx]
+        changed = delta != 0
+        split_idx = split_idx[changed]
+        width = self.leaf_width
+        pairs, pair_idx = np.unique(rows[changed] * self.n_trees + self._split_tree[split_idx],
+                                    return_inverse=True)
+        trees = pairs % self.n_trees
+
+        offsets, counts = _expand(self._eliminate_ptr, split_idx)
+        targets = np.repeat(pair_idx * width, counts) + self._eliminate_local[offsets]
+        eliminated = np.bincount(targets, weights=np.repeat(delta[changed], counts),
+                                 minlength=len(pairs) * width).reshape(len(pairs), width)
+        eliminated = eliminated + self._base_eliminations.reshape(self.n_trees, width)[trees]
+        exit_slot = (eliminated == 0).argmax(axis=1)
+
+        margin = np.full(n_rows, self._base_leaf_value.sum() + self.base_margin)
+        margin += np.bincount(pairs // self.n_trees, minlength=n_rows,
+                              weights=self.leaf_value[trees, exit_slot] - self._base_leaf_value[trees])
+        return margin
+
+
+def _expand(ptr, groups):
+    """
+    Index semua anggota grup (format CSR: ptr) secara berurutan.
+    Return: offsets (index ke array anggota), counts (jumlah anggota per grup)
+    """
+    starts = ptr[groups]
+    counts = ptr[groups + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return offsets, counts
+
+
+class _NodeTable:
+    """Penampung node saat meratakan model."""
+
+    def __init__(self):
+        self.feature, self.threshold, self.left, self.right = [], [], [], []
+        self.default_left, self.missing_zero, self.value = [], [], []
+        self.roots = []
+
+    @property
+    def size(self):
+        return len(self.feature)
+
+    def _append(self, feature, threshold, left, right, default_left, missing_zero, value):
+        self.feature.append(feature)
+        self.threshold.append(threshold)
+        self.left.append(left)
+        self.right.append(right)
+        self.default_left.append(default_left)
+        self.missing_zero.append(missing_zero)
+        self.value.append(value)
+
+    def add_leaf(self, value):
+        self._append(-1, 0.0, -1, -1, False, False, value)
+
+    def add_split(self, feature, threshold, left, right, default_left, missing_zero):
+        self._append(feature, threshold, left, right, default_left, missing_zero, 0.0)
+
+    def add_lightgbm_node(self, node):
+        """Tambah node LightGBM (rekursif, pre-order). Return: index node."""
+        index = self.size
+        if "leaf_value" in node:
+            self.add_leaf(node["leaf_value"])
+            return index
+        if node["decision_type"] != "<=" or node["missing_type"] == "NaN":
+            raise ValueError(f"split LightGBM tidak didukung: {node['decision_type']} "
+                             f"(missing_type={node['missing_type']})")
+        self.add_split(node["split_feature"], node["threshold"], -1, -1,
+                       node["default_left"], node["missing_type"] == "Zero")
+        self.left[index] = self.add_lightgbm_node(node["left_child"])
+        self.right[index] = self.add_lightgbm_node(node["right_child"])
+        return index
+
+    def build(self, kind, **meta):
+        return TreeEnsemble(kind, self.feature, self.threshold, self.left, self.right,
+                            self.default_left, self.missing_zero, self.value,
+                            self.roots, **meta)
+
+
+if __name__ == "__main__":
+    # Langkah offline: python -m utils.tree_engine
+    # Menghasilkan models/xgb_model2_trees.npz dan models/lgbm_model2_trees.npz
+    import joblib
+    TreeEnsemble.from_xgboost_json("models/xgb_model2.json").save("models/xgb_model2_trees.npz")
+    TreeEnsemble.from_lightgbm(joblib.load("models/lgbm_model2.pkl")).save("models/lgbm_model2_trees.npz")
+    print("[INFO] Tree table disimpan di models/")
@@ -0,0 +1,99 @@
+from itertools import product
+
+# Filter kata sebelum stemming: kata yang stem-nya pasti tidak ada di
+# vocabulary TF-IDF tidak perlu di-stem (vektor fitur tetap sama).
+#
+# Stemmer Sastrawi (ECS) selalu mengembalikan kata asli atau kata dasar di
+# kamusnya. Bentuk kata yang bisa menghasilkan kata dasar r:
+#   awalan + [r dengan sisipan er/el/em/in, huruf depan bisa diganti] + akhiran
+# - awalan (boleh kosong) selalu diawali salah satu PREFIX_STARTS
+# - aturan awalan hanya bisa mengganti/menambah huruf depan (RECODED_PREFIXES,
+#   mis. "menulis" -> "t" + "ulis", "penyapu" -> "s" + "apu")
+# - sisipan dibuang dari posisi kedua ("gemetar" -> "getar"), paling banyak
+#   sekali per putaran pembuangan awalan (3 putaran)
+# - akhiran adalah salah satu SUFFIX_CHAINS
+
+# Huruf depan yang bisa ditambahkan aturan disambiguasi awalan Sastrawi
+RECODED_PREFIXES = ("", "k", "m", "n", "p", "r", "s", "t", "ng", "ny", "pe")
+
+# Dua huruf pertama semua awalan yang bisa dibuang (di-, ke-, se-, ber-,
+# me-, pe-, ter-, ku-, kau-)
+PREFIX_STARTS = frozenset(("di", "ke", "se", "be", "me", "pe", "te", "ku", "ka"))
+
+INFIXES = frozenset(("er", "el", "em", "in"))
+INFIX_ROUNDS = 3
+CONSONANTS = frozenset("bcdfghjklmnpqrstvwxyz")
+VOWELS = frozenset("aiueo")
+
+# Rangkaian akhiran yang bisa dibuang, urutan di kata: turunan + milik + partikel
+SUFFIX_CHAINS = tuple(sorted({
+    derivational + possessive + particle
+    for derivational, possessive, particle in product(
+        ("", "i", "is", "isme", "isasi", "kan", "an"),
+        ("", "ku", "mu", "nya"),
+        ("", "lah", "kah", "tah", "pun"))
+}, key=len))
+
+
+class VocabularyFilter:
+    """
+    Callable word -> bool: False bila stem Sastrawi dari word pasti tidak
+    muncul di term vocabulary mana pun (unigram maupun bagian bigram).
+    Bisa di-pickle (mis. dikirim ke proses worker).
+    - vocabulary_words: iterable kata yang muncul di term vocabulary
+    - dictionary: iterable kata dasar kamus Sastrawi
+    """
+
+    def __init__(self, vocabulary_words, dictionary):
+        self.words = frozenset(vocabulary_words)
+        self.roots = self.words.intersection(dictionary)
+        # Potongan kata asli yang bisa menjadi kata dasar di vocabulary
+        self.cores = frozenset(root[len(prefix):] for root in self.roots
+                               for prefix in RECODED_PREFIXES if root.startswith(prefix))
+
+    @classmethod
+    def from_terms(cls, terms, dictionary=None):
+        """
+        - terms: term vocabulary TF-IDF (unigram/bigram, dipisah spasi)
+        - dictionary: kata dasar (default: kamus stemmer Sastrawi)
+        """
+        if dictionary is None:
+            from utils import preprocessing
+            preprocessing.load_sastrawi()
+            dictionary = preprocessing.stemmer.delegatedStemmer.dictionary.words
+        return cls({word for term in terms for word in term.split(" ")}, dictionary)
+
+    def __call__(self, word):
+        if word in self.words:
+            return True
+        # Tanpa awalan, potongan harus dimulai dari huruf pertama
+        last_start = len(word) if word[:2] in PREFIX_STARTS else 0
+        for suffix in SUFFIX_CHAINS:
+            if len(suffix) > len(word):
+                break
+            if not word.endswith(suffix):
+                continue
+            body = word[:len(word) - len(suffix)] if suffix else word
+            for start in range(min(last_start, len(body)) + 1):
+                core = body[start:]
+                if core in self.cores or self._has_infixed_root(core):
+                    return True
+        return False
+
+    def _has_infixed_root(self, core):
+        # Kata dasar setelah sisipan di posisi kedua dibuang (sampai
+        # INFIX_ROUNDS kali), dengan huruf depan hasil pengganti awalan
+        if not (core[1:3] in INFIXES or core[:2] in INFIXES
+                or ("e" + core[:1]) in INFIXES):
+            # Sisipan tidak mungkin ada di posisi kedua prefix + core
+            return False
+        for prefix in RECODED_PREFIXES:
+            form = prefix + core
+            for _ in range(INFIX_ROUNDS):
+                if not (len(form) > 3 and form[1:3] in INFIXES
+                        and form[0] in CONSONANTS and form[3] in VOWELS):
+                    break
+                form = form[0] + form[3:]
+                if form in self.roots:
+                    return True
+        return False